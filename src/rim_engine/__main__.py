@@ -1,21 +1,259 @@
 from __future__ import annotations
 
 import argparse
+import json
+import logging
+import sys
 from pathlib import Path
 
-from .config import RIMConfig
-from .panel import run_end_to_end
+from pandas.tseries.frequencies import to_offset
 
+from .config import REGIME_MODES, RIMConfig
+from .digest import verify_runs
+from .evaluation import evaluate_timeseries, write_eval_report
+from .events import TransitionSpec, append_events_jsonl, detect_transitions
+from .fetch import FetchSource, fetch_inputs, load_cached_inputs
+from .io import ENGINES
+from .panel import config_input_keys, load_dataset, run_end_to_end, run_from_cache
+from .regimes import row_edges
+from .scheduler import load_job_specs, run_schedule
+from .snapshots import SNAPSHOT_FORMATS, snapshot_rows, write_snapshots
+from .util.errors import (
+    EmptyResultError,
+    InvalidArgumentsError,
+    MissingInputsError,
+    RimEngineError,
+)
+from .util.logging import setup_logging
 
-def main() -> None:
-    p = argparse.ArgumentParser(description="Run RIM Engine 4-factor pipeline on local CSV data.")
-    p.add_argument("--data-dir", type=str, default="data")
-    p.add_argument("--out-dir", type=str, default="outputs")
-    args = p.parse_args()
+log = logging.getLogger("rim_engine.cli")
+
+COMMANDS = ("run", "fetch", "schedule", "panels", "verify")
+
+
+def _add_regime_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--regime-mode",
+        choices=REGIME_MODES,
+        default=RIMConfig.regime_mode,
+        help="adaptive: regime edges are trailing quantiles of RIM_0_100 (recorded per row).",
+    )
+    p.add_argument(
+        "--regime-horizon-days",
+        type=int,
+        default=RIMConfig.regime_horizon_h // 24,
+        help="Trailing horizon of the adaptive regime edges.",
+    )
+
+
+def _config(args: argparse.Namespace) -> RIMConfig:
+    cfg = RIMConfig(regime_mode=args.regime_mode, regime_horizon_h=args.regime_horizon_days * 24)
+    try:
+        cfg.validate()
+    except ValueError as e:
+        raise InvalidArgumentsError(str(e)) from e
+    return cfg
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="rim-engine", description="Run RIM Engine 4-factor pipeline on local CSV data."
+    )
+    sub = p.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Score inputs and write the timeseries and risk panel.")
+    run.add_argument("--data-dir", type=str, default="data")
+    run.add_argument("--out-dir", type=str, default="outputs")
+    run.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Read inputs from the ingestion cache filled by `fetch` instead of --data-dir CSVs.",
+    )
+    run.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="pandas",
+        help=(
+            "CSV ingestion backend; 'arrow' needs pyarrow (pip install 'rim-engine-de-lu[arrow]')."
+        ),
+    )
+    run.add_argument(
+        "--evaluate",
+        action="store_true",
+        help="Also write eval_report.json/.md from the in-memory timeseries.",
+    )
+    run.add_argument(
+        "--events",
+        action="store_true",
+        help="Append regime transition events to regime_events.jsonl.",
+    )
+    run.add_argument("--hysteresis", type=float, default=TransitionSpec.hysteresis)
+    run.add_argument("--min-dwell", type=int, default=TransitionSpec.min_dwell)
+    _add_regime_args(run)
+
+    fetch = sub.add_parser("fetch", help="Incrementally fetch inputs into the ingestion cache.")
+    fetch.add_argument("--base-url", type=str, required=True)
+    fetch.add_argument("--cache-dir", type=str, default="data/processed")
+    fetch.add_argument("--max-connections", type=int, default=4)
+
+    panels = sub.add_parser(
+        "panels", help="Write historical risk panel snapshots, one per period, in one pass."
+    )
+    panels.add_argument("--data-dir", type=str, default="data")
+    panels.add_argument("--out-dir", type=str, default="outputs")
+    panels.add_argument("--cache-dir", type=str, default=None)
+    panels.add_argument("--engine", choices=ENGINES, default="pandas")
+    panels.add_argument(
+        "--every", type=str, default="1d", help="Snapshot cadence, e.g. 1d, 6h, MS."
+    )
+    panels.add_argument(
+        "--format",
+        choices=SNAPSHOT_FORMATS,
+        default="files",
+        help="files: <period>/risk_panel.json/.md; jsonl or tar: a single bundle.",
+    )
+    _add_regime_args(panels)
+
+    sched = sub.add_parser("schedule", help="Run all jobs of a job-spec file over one shared DAG.")
+    sched.add_argument("spec", type=str, help='JSON file: {"jobs": [...]}')
+    sched.add_argument("--workers", type=int, default=0, help="Process pool size (0: in-process).")
+    sched.add_argument("--memory-budget-mb", type=float, default=None)
+    sched.add_argument("--report", type=str, default=None, help="Also write the report as JSON.")
+
+    verify = sub.add_parser(
+        "verify", help="Compare the digest manifests of two runs; exit 1 if they diverge."
+    )
+    verify.add_argument("run_a", type=str, help="Run output dir (or digest_manifest.json).")
+    verify.add_argument("run_b", type=str)
+    verify.add_argument("--max-days", type=int, default=20, help="Differing days to list.")
+    return p
+
+
+def _cmd_fetch(args: argparse.Namespace) -> int:
     cfg = RIMConfig()
-    ts, panel = run_end_to_end(Path(args.data_dir), Path(args.out_dir), cfg)
+    source = FetchSource(base_url=args.base_url, max_connections=args.max_connections)
+    for key, r in fetch_inputs(source, Path(args.cache_dir), freq=cfg.freq).items():
+        print(
+            f"{key}: from={r.requested_from} rows_written={r.rows_written} "
+            f"not_modified={r.not_modified} bytes={r.bytes_downloaded}"
+        )
+    return 0
+
+
+def _cmd_panels(args: argparse.Namespace) -> int:
+    cfg = _config(args)
+    # Accept the lowercase day alias ("1d") pandas is deprecating
+    every = args.every[:-1] + "D" if args.every.endswith("d") else args.every
+    try:
+        to_offset(every)
+    except ValueError as e:
+        raise InvalidArgumentsError(f"Invalid --every {args.every!r}: {e}") from e
+
+    if args.cache_dir:
+        keys = config_input_keys(cfg)
+        inputs, reports = load_cached_inputs(Path(args.cache_dir), keys=keys, freq=cfg.freq)
+    else:
+        inputs, reports = load_dataset(Path(args.data_dir), cfg, engine=args.engine)
+    rows = snapshot_rows(inputs, cfg, every=every)
+    path = write_snapshots(rows, cfg, reports, Path(args.out_dir), every, args.format)
+    print({"snapshots": len(rows), "written": str(path)})
+    return 0
+
+
+def _cmd_schedule(args: argparse.Namespace) -> int:
+    jobs = load_job_specs(Path(args.spec))
+    budget = None if args.memory_budget_mb is None else int(args.memory_budget_mb * 2**20)
+    report = run_schedule(jobs, workers=args.workers, memory_budget_bytes=budget)
+    for j in report.jobs.values():
+        print(
+            f"{j.name}: wall_s={j.wall_s:.2f} compute_s={j.compute_s:.2f} nodes={j.nodes} "
+            f"cache_hits={j.cache_hits} RIM_0_100={j.latest.get('RIM_0_100', float('nan')):.2f}"
+        )
+    print(
+        f"total: wall_s={report.wall_s:.2f} nodes={report.nodes_total}/{report.nodes_requested} "
+        f"peak_mb={report.peak_bytes / 2**20:.1f}"
+    )
+    if args.report:
+        Path(args.report).write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+    return 0
+
+
+def _cmd_verify(args: argparse.Namespace) -> int:
+    report = verify_runs(Path(args.run_a), Path(args.run_b), max_days=args.max_days)
+    print(json.dumps(report, indent=2))
+    return 0 if report["identical"] else 1
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    cfg = _config(args)
+    data_dir, out_dir = Path(args.data_dir), Path(args.out_dir)
+    if args.cache_dir:
+        ts, panel = run_from_cache(Path(args.cache_dir), out_dir, cfg)
+    else:
+        ts, panel = run_end_to_end(data_dir, out_dir, cfg, engine=args.engine)
     print(panel["latest"])
 
+    if args.evaluate:
+        # In-process: the timeseries goes straight to evaluation, no CSV round-trip
+        report = evaluate_timeseries(ts)
+        write_eval_report(report, out_dir)
+        print({"rows": report["rows"], "regime_share": report["regime_share"]})
+
+    if args.events:
+        try:
+            spec = TransitionSpec(hysteresis=args.hysteresis, min_dwell=args.min_dwell)
+            events = detect_transitions(ts, row_edges(ts, cfg), spec)
+        except ValueError as e:
+            raise InvalidArgumentsError(str(e)) from e
+        n = append_events_jsonl(events, out_dir / "regime_events.jsonl")
+        print({"events_total": len(events), "events_appended": n})
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    setup_logging()
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # `rim-engine --data-dir ...` (no subcommand) keeps working as `run`
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["run", *argv]
+    args = _build_parser().parse_args(argv)
+
+    try:
+        commands = {
+            "run": _cmd_run,
+            "fetch": _cmd_fetch,
+            "schedule": _cmd_schedule,
+            "panels": _cmd_panels,
+            "verify": _cmd_verify,
+        }
+        return commands[args.command](args)
+
+    except InvalidArgumentsError as e:
+        log.error("INVALID_ARGUMENT | %s", e)
+        return 2
+
+    except MissingInputsError as e:
+        log.error("MISSING_INPUTS | %s", e)
+        return 3
+
+    except EmptyResultError as e:
+        log.error("EMPTY_RESULT | %s", e)
+        return 3
+
+    except FileNotFoundError as e:
+        log.error("MISSING_INPUTS | %s", e)
+        return 3
+
+    except RimEngineError as e:
+        log.exception("RIM_ENGINE_ERROR | %s", e)
+        return 4
+
+    except Exception as e:
+        log.exception("INTERNAL_ERROR | %s", e)
+        return 4
+
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
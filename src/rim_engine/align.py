@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# Sorted-index alignment
+# ======================================================
+#
+# Ingested series are resampled, so their indexes are sorted and unique. Rather than an outer
+# join over the union of all timestamps (e.g. 2023 RES next to 2025 prices), the core inputs
+# are merge-joined on their int64 UTC keys and every other input is left-joined onto that
+# working index. Nothing outside the working index is materialized.
+
+
+@dataclass(frozen=True)
+class OverlapStats:
+    rows: int  # rows of the series
+    rows_in_window: int  # of which fall on the working index
+    window_rows: int
+    first_in_window: str | None
+    last_in_window: str | None
+
+    @property
+    def coverage(self) -> float:
+        """Share of the working index the series covers."""
+        return self.rows_in_window / self.window_rows if self.window_rows else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "coverage": self.coverage}
+
+
+def index_keys(index: pd.DatetimeIndex) -> np.ndarray:
+    """int64 ns keys (UTC for tz-aware indexes); the index must be sorted and unique."""
+    keys = pd.DatetimeIndex(index).as_unit("ns").asi8
+    if len(keys) > 1 and not (np.diff(keys) > 0).all():
+        raise ValueError("Alignment requires a sorted index without duplicate timestamps.")
+    return keys
+
+
+def lookup(keys: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Position of each target key in the sorted `keys`, -1 where absent."""
+    pos = np.searchsorted(keys, target)
+    pos[pos == len(keys)] = 0
+    found = keys[pos] == target if len(keys) else np.zeros(len(target), dtype=bool)
+    return np.where(found, pos, -1)
+
+
+def merge_join(*keys: np.ndarray) -> np.ndarray:
+    """Intersection of sorted unique key arrays (smallest first, so each probe is cheap)."""
+    ordered = sorted(keys, key=len)
+    out = ordered[0]
+    for k in ordered[1:]:
+        out = out[lookup(k, out) >= 0]
+    return out
+
+
+def align_inputs(
+    frames: dict[str, pd.DataFrame], core: tuple[str, ...]
+) -> tuple[pd.DataFrame, dict[str, OverlapStats]]:
+    """
+    Combines single-series frames on one index: the timestamps present in every `core` frame
+    (all timestamps if no core frame is given), with the other series left-joined (NaN where
+    they have no row). Returns the combined frame and each series' overlap with its index.
+    """
+    if not frames:
+        return pd.DataFrame(), {}
+    keys = {k: index_keys(f.index) for k, f in frames.items()}
+    core = tuple(k for k in core if k in frames)
+
+    if core:
+        window = merge_join(*(keys[k] for k in core))
+        first = frames[core[0]].index
+        index = first[lookup(keys[core[0]], window)]
+    else:
+        window = np.unique(np.concatenate(list(keys.values())))
+        first = next(iter(frames.values())).index
+        index = pd.DatetimeIndex(window.view("M8[ns]"), name=first.name).as_unit(first.unit)
+        if first.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(first.tz)
+
+    data: dict[str, np.ndarray] = {}
+    stats: dict[str, OverlapStats] = {}
+    for k, f in frames.items():
+        pos = lookup(keys[k], window)
+        hit = pos >= 0
+        for c in f.columns:
+            values = f[c].to_numpy(dtype=float)
+            data[c] = (
+                np.where(hit, values[pos], np.nan) if len(values) else np.full(len(pos), np.nan)
+            )
+        at = np.flatnonzero(hit)
+        stats[k] = OverlapStats(
+            rows=len(f),
+            rows_in_window=len(at),
+            window_rows=len(window),
+            first_in_window=str(index[at[0]]) if len(at) else None,
+            last_in_window=str(index[at[-1]]) if len(at) else None,
+        )
+    return pd.DataFrame(data, index=index), stats
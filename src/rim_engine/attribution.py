@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .registry import FACTORS
+
+# ======================================================
+# Factor attribution
+# ======================================================
+#
+# Each factor score is z_to_0_25 of a linear combination of driver z-scores:
+#   factor_z = driver_z @ LOADINGS
+# so attribution for the whole history is a handful of matrix operations.
+
+# Index space of `dominant_factor`: every registered factor, core factors first
+FACTOR_CODES = tuple(FACTORS)
+
+
+def _registry_loadings() -> dict[str, dict[str, float]]:
+    out: dict[str, dict[str, float]] = {}
+    for f in FACTORS.values():
+        for d, loading in f.loadings:
+            out.setdefault(d, {})[f.code] = loading
+    return out
+
+
+# driver -> {factor: loading}; mirrors registry.FACTORS
+FACTOR_LOADINGS = _registry_loadings()
+
+
+def _score_0_25(z: np.ndarray, scale: float = 2.0) -> np.ndarray:
+    # NumPy twin of processing.z_to_0_25
+    return 12.5 * (np.tanh(np.clip(z, -6, 6) / scale) + 1.0)
+
+
+def attribute(
+    factors: pd.DataFrame,
+    driver_z: pd.DataFrame,
+    weights: dict[str, float],
+    loadings: dict[str, dict[str, float]] = FACTOR_LOADINGS,
+) -> pd.DataFrame:
+    """
+    Per-row explanation of RIM_0_100.
+
+    Columns:
+      - `<F>_contrib` (float32): weight × 4 × factor score, summing to RIM_0_100
+      - `dominant_factor` (int8): index into FACTOR_CODES of the largest contribution
+      - `mc_<driver>` (float32): RIM points lost if that driver's z-score were neutral (0),
+        holding all other drivers fixed
+    """
+    codes = [f for f in FACTOR_CODES if f"{f}_0_25" in factors.columns]
+    drivers = [d for d in loadings if d in driver_z.columns]
+
+    scores = factors[[f"{f}_0_25" for f in codes]].to_numpy(dtype=float)  # (n, F)
+    w4 = 4.0 * np.array([weights[f.lower()] for f in codes])  # (F,)
+    A = np.array([[loadings[d].get(f, 0.0) for f in codes] for d in drivers])  # (D, F)
+    Z = driver_z[drivers].reindex(factors.index).to_numpy(dtype=float)  # (n, D)
+
+    contrib = scores * w4
+
+    # Factor z with each driver removed in turn: (n, D, F)
+    fz = Z @ A
+    fz_without = fz[:, None, :] - Z[:, :, None] * A[None, :, :]
+    marginal = ((scores[:, None, :] - _score_0_25(fz_without)) * w4).sum(axis=2)
+
+    out = pd.DataFrame(
+        contrib.astype(np.float32), index=factors.index, columns=[f"{f}_contrib" for f in codes]
+    )
+    code_index = np.array([FACTOR_CODES.index(f) for f in codes], dtype=np.int8)
+    out["dominant_factor"] = code_index[contrib.argmax(axis=1)]
+    for j, d in enumerate(drivers):
+        out[f"mc_{d}"] = marginal[:, j].astype(np.float32)
+    return out
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# Columnar, appendable on-disk store
+# ======================================================
+#
+# Layout of a store directory:
+#   meta.json        column names, dtypes, free-form metadata
+#   ts.i8            int64 UTC nanoseconds, strictly increasing
+#   <column>.col     one raw little-endian array per column
+#
+# Every column is a flat binary file, so appends are plain file appends and
+# reads are memory maps. Rows are addressed by position; the time column is
+# sorted, so range queries are two searchsorted calls.
+
+_TS_FILE = "ts.i8"
+_META_FILE = "meta.json"
+
+
+def _safe_name(col: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in col)
+
+
+class ColumnStore:
+    """
+    Append-only columnar time series store backed by one binary file per column.
+
+    The index is always UTC; naive timestamps are rejected to avoid silent shifts.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._meta: dict | None = None
+
+    # ---------------- metadata ----------------
+
+    @property
+    def meta(self) -> dict:
+        if self._meta is None:
+            p = self.root / _META_FILE
+            self._meta = json.loads(p.read_text(encoding="utf-8")) if p.exists() else {}
+        return self._meta
+
+    def exists(self) -> bool:
+        return (self.root / _META_FILE).exists()
+
+    def columns(self) -> list[str]:
+        return list(self.meta.get("columns", {}))
+
+    def user_meta(self) -> dict:
+        return dict(self.meta.get("user", {}))
+
+    def set_user_meta(self, **kwargs) -> None:
+        meta = self.meta
+        meta.setdefault("user", {}).update(kwargs)
+        self._write_meta(meta)
+
+    def _write_meta(self, meta: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / (_META_FILE + ".tmp")
+        tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(tmp, self.root / _META_FILE)
+        self._meta = meta
+
+    def _col_path(self, col: str) -> Path:
+        return self.root / f"{_safe_name(col)}.col"
+
+    # ---------------- reads ----------------
+
+    def __len__(self) -> int:
+        p = self.root / _TS_FILE
+        return p.stat().st_size // 8 if p.exists() else 0
+
+    def ts_i8(self) -> np.ndarray:
+        n = len(self)
+        if n == 0:
+            return np.empty(0, dtype="int64")
+        return np.memmap(self.root / _TS_FILE, dtype="<i8", mode="r", shape=(n,))
+
+    def last_ts(self) -> pd.Timestamp | None:
+        ts = self.ts_i8()
+        return pd.Timestamp(int(ts[-1]), tz="UTC") if len(ts) else None
+
+    def read(
+        self,
+        start: pd.Timestamp | str | None = None,
+        end: pd.Timestamp | str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Reads rows with start <= ts <= end (both inclusive, UTC)."""
+        ts = self.ts_i8()
+        lo = 0 if start is None else int(np.searchsorted(ts, _to_i8(start), side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, _to_i8(end), side="right"))
+
+        cols = columns or self.columns()
+        dtypes = self.meta.get("columns", {})
+        data = {}
+        for c in cols:
+            if c not in dtypes:
+                raise KeyError(f"Unknown column {c!r} in store {self.root}. Have: {list(dtypes)}")
+            arr = np.memmap(self._col_path(c), dtype=dtypes[c], mode="r", shape=(len(ts),))
+            data[c] = np.array(arr[lo:hi])
+
+        idx = pd.DatetimeIndex(np.asarray(ts[lo:hi]).astype("datetime64[ns]")).tz_localize("UTC")
+        return pd.DataFrame(data, index=idx)
+
+    # ---------------- writes ----------------
+
+    def truncate_from(self, ts: pd.Timestamp | str) -> int:
+        """Drops all rows with timestamp >= ts. Returns the number of rows kept."""
+        cur = self.ts_i8()
+        keep = int(np.searchsorted(cur, _to_i8(ts), side="left"))
+        if keep == len(cur):
+            return keep
+        del cur
+        dtypes = self.meta.get("columns", {})
+        os.truncate(self.root / _TS_FILE, keep * 8)
+        for c, dt in dtypes.items():
+            os.truncate(self._col_path(c), keep * np.dtype(dt).itemsize)
+        return keep
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Appends rows strictly after the last stored timestamp. Returns rows written.
+
+        Columns are fixed by the first append; later frames must carry the same columns.
+        """
+        if df.empty:
+            return 0
+        idx = pd.DatetimeIndex(df.index)
+        if idx.tz is None:
+            raise ValueError("ColumnStore.append requires a tz-aware (UTC) index.")
+        ts_new = idx.tz_convert("UTC").as_unit("ns").asi8
+        if np.any(np.diff(ts_new) <= 0):
+            raise ValueError("ColumnStore.append requires a strictly increasing index.")
+
+        meta = self.meta
+        if "columns" not in meta:
+            meta = {"columns": {c: np.dtype(df[c].dtype).newbyteorder("<").str for c in df.columns}}
+            meta["user"] = self.meta.get("user", {})
+            self._write_meta(meta)
+            for c in df.columns:
+                self._col_path(c).touch()
+            (self.root / _TS_FILE).touch()
+        elif list(meta["columns"]) != list(df.columns):
+            raise ValueError(
+                f"Column mismatch for store {self.root}: "
+                f"stored={list(meta['columns'])}, got={list(df.columns)}"
+            )
+
+        # Drop trailing bytes from an interrupted append so columns stay row-aligned.
+        n = len(self)
+        for c, dt in meta["columns"].items():
+            size = n * np.dtype(dt).itemsize
+            if self._col_path(c).stat().st_size != size:
+                os.truncate(self._col_path(c), size)
+
+        last = self.last_ts()
+        if last is not None:
+            mask = ts_new > last.value
+            ts_new = ts_new[mask]
+            df = df.loc[mask]
+        if len(ts_new) == 0:
+            return 0
+
+        for c, dt in meta["columns"].items():
+            with open(self._col_path(c), "ab") as fh:
+                fh.write(np.ascontiguousarray(df[c].to_numpy(dtype=dt)).tobytes())
+        # Time column last: a crash mid-append leaves trailing column bytes that
+        # are ignored, because the row count is derived from ts.i8.
+        with open(self.root / _TS_FILE, "ab") as fh:
+            fh.write(ts_new.astype("<i8").tobytes())
+        return len(ts_new)
+
+    def reset(self) -> None:
+        """Deletes all data files and metadata."""
+        if not self.root.exists():
+            return
+        for p in self.root.iterdir():
+            if p.is_file():
+                p.unlink()
+        self._meta = None
+
+
+def _to_i8(ts: pd.Timestamp | str) -> int:
+    t = pd.Timestamp(ts)
+    t = t.tz_localize("UTC") if t.tz is None else t.tz_convert("UTC")
+    return int(t.as_unit("ns").value)
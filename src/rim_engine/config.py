@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
+REGIME_MODES = ("fixed", "adaptive")
+
 
 @dataclass(frozen=True)
 class RIMConfig:
@@ -14,20 +16,67 @@ class RIMConfig:
     w_ld: float = 0.25
     w_res: float = 0.25
     w_imb: float = 0.20
+    # Optional factors (registry.FACTORS), scored only when weighted
+    w_rl: float = 0.0
+    w_nlr: float = 0.0
+    w_xb: float = 0.0
 
     zscore_window_h: int = 24
     vol_window_h: int = 24
     vol_long_window_h: int = 72
 
     regime_edges: tuple[float, float, float] = (25.0, 50.0, 75.0)
+    # "adaptive": edges are trailing quantiles of RIM_0_100 over regime_horizon_h, updated once
+    # per regime_shard_h shard; regime_edges apply until regime_min_history_h hours are scored
+    regime_mode: str = "fixed"
+    regime_quantiles: tuple[float, float, float] = (0.50, 0.80, 0.95)
+    regime_horizon_h: int = 90 * 24
+    regime_shard_h: int = 24
+    regime_min_history_h: int = 7 * 24
+    # Minimum distance between adaptive edges in RIM points; above 2x the default transition
+    # hysteresis (events.TransitionSpec) so calm markets keep four distinct, detectable regimes
+    regime_min_gap: float = 6.0
 
     def weights(self) -> dict[str, float]:
-        return {"pd": self.w_pd, "ld": self.w_ld, "res": self.w_res, "imb": self.w_imb}
+        w = {"pd": self.w_pd, "ld": self.w_ld, "res": self.w_res, "imb": self.w_imb}
+        # Unweighted optional factors are left out (and so do not change config_hash)
+        w.update(
+            {k: v for k, v in (("rl", self.w_rl), ("nlr", self.w_nlr), ("xb", self.w_xb)) if v}
+        )
+        return w
+
+    def periods(self, hours: int) -> int:
+        """Converts a window expressed in hours into a number of rows at `freq`."""
+        import pandas as pd
+
+        t0 = pd.Timestamp(0)
+        step = (t0 + pd.tseries.frequencies.to_offset(self.freq)) - t0
+        n = pd.Timedelta(hours=hours) / step
+        if n < 1 or n != int(n):
+            raise ValueError(f"Window of {hours}h is not a whole number of {self.freq!r} steps")
+        return int(n)
 
     def validate(self) -> None:
         s = sum(self.weights().values())
         if abs(s - 1.0) > 1e-6:
             raise ValueError(f"Factor weights must sum to 1.0. Got {s:.6f}")
+        self.periods(self.zscore_window_h)
+        if self.regime_mode not in REGIME_MODES:
+            raise ValueError(f"regime_mode must be one of {REGIME_MODES}. Got {self.regime_mode!r}")
+        if self.regime_mode == "adaptive":
+            q = self.regime_quantiles
+            if len(q) != 3 or not 0 < q[0] < q[1] < q[2] < 1:
+                raise ValueError(f"regime_quantiles must be 3 increasing values in (0, 1). Got {q}")
+            if not 0 <= self.regime_min_gap <= 100 / 3:
+                raise ValueError(f"regime_min_gap must be in [0, 33.3]. Got {self.regime_min_gap}")
+            self.periods(self.regime_shard_h)
+            if self.regime_horizon_h < self.regime_shard_h or (
+                self.regime_horizon_h % self.regime_shard_h
+            ):
+                raise ValueError(
+                    f"regime_horizon_h ({self.regime_horizon_h}) must be a whole number of "
+                    f"regime_shard_h ({self.regime_shard_h}) shards"
+                )
 
     def config_hash(self) -> str:
         import hashlib
@@ -45,6 +94,15 @@ class RIMConfig:
             },
             "regime_edges": self.regime_edges,
         }
+        if self.regime_mode != "fixed":
+            payload["regime_adaptive"] = {
+                "mode": self.regime_mode,
+                "quantiles": self.regime_quantiles,
+                "horizon_h": self.regime_horizon_h,
+                "shard_h": self.regime_shard_h,
+                "min_history_h": self.regime_min_history_h,
+                "min_gap": self.regime_min_gap,
+            }
         s = json.dumps(payload, sort_keys=True).encode("utf-8")
         return hashlib.sha256(s).hexdigest()[:12]
 
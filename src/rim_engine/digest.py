@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+from .config import RIMConfig
+
+# ======================================================
+# Run digests (determinism receipts)
+# ======================================================
+#
+# Canonical factor matrix: one little-endian record per output row, int64 UTC ns followed by
+# float64 DIGEST_COLUMNS (all NaNs mapped to one bit pattern), written raw to rim_matrix.bin.
+#
+# The manifest hashes it as a calendar Merkle tree keyed by UTC day and month:
+#   day    sha256(matrix bytes of that day's rows)
+#   month  sha256(day key + day digest, for each day of the month)
+#   root   sha256(month key + month digest, for each month)
+# Keys are calendar labels, not positions, so runs over different windows still line up and
+# verification only descends into months/days whose digests differ.
+
+DIGEST_COLUMNS = ("PD_0_25", "LD_0_25", "RES_0_25", "IMB_0_25", "RIM_0_100")
+MATRIX_DTYPE = np.dtype([("ts", "<i8")] + [(c, "<f8") for c in DIGEST_COLUMNS])
+MATRIX_FILE = "rim_matrix.bin"
+MANIFEST_FILE = "digest_manifest.json"
+MANIFEST_SCHEMA = 1
+
+_NS_PER_DAY = 86_400 * 10**9
+
+
+def canonical_matrix(ts: pd.DataFrame) -> np.ndarray:
+    idx = pd.DatetimeIndex(ts.index)
+    if idx.tz is None:
+        raise ValueError("Digest requires a tz-aware (UTC) index.")
+    out = np.zeros(len(ts), dtype=MATRIX_DTYPE)
+    out["ts"] = idx.tz_convert("UTC").as_unit("ns").asi8
+    for c in DIGEST_COLUMNS:
+        v = ts[c].to_numpy(dtype="<f8")
+        out[c] = np.where(np.isnan(v), np.nan, v)
+    return out
+
+
+def _sha(*parts: bytes) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p)
+    return h.hexdigest()
+
+
+def _hash_file(h, path: Path) -> None:
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+
+
+def file_fingerprint(path: Path) -> dict:
+    """
+    Size and sha256 of an input file, or of a ColumnStore directory (the ingestion cache):
+    its timestamp and column files in name order, so fetched data that differ never match.
+    """
+    path = Path(path)
+    h = hashlib.sha256()
+    if not path.is_dir():
+        _hash_file(h, path)
+        return {"file": path.name, "bytes": path.stat().st_size, "sha256": h.hexdigest()}
+    files = sorted(p for p in path.iterdir() if p.suffix in (".i8", ".col"))
+    for p in files:
+        h.update(p.name.encode("utf-8") + b"\0")
+        _hash_file(h, p)
+    return {
+        "store": path.name,
+        "bytes": sum(p.stat().st_size for p in files),
+        "sha256": h.hexdigest(),
+    }
+
+
+def build_manifest(matrix: np.ndarray, config_hash: str, inputs: dict[str, dict]) -> dict:
+    day_ids = matrix["ts"] // _NS_PER_DAY
+    starts = np.flatnonzero(np.diff(day_ids, prepend=day_ids[:1] - 1)) if len(matrix) else []
+    ends = np.append(starts[1:], len(matrix)).astype(int) if len(matrix) else []
+    raw = memoryview(np.ascontiguousarray(matrix)).cast("B")
+    size = MATRIX_DTYPE.itemsize
+
+    days = []
+    months: dict[str, list[str]] = {}
+    for lo, hi in zip(starts, ends, strict=True):
+        key = str(np.datetime64(int(day_ids[lo]), "D"))
+        digest = _sha(raw[lo * size : hi * size])
+        days.append([key, int(lo), int(hi - lo), digest])
+        months.setdefault(key[:7], []).append(key + digest)
+
+    month_digests = {m: _sha("".join(parts).encode("ascii")) for m, parts in months.items()}
+    root = _sha("".join(m + d for m, d in month_digests.items()).encode("ascii"))
+    return {
+        "schema": MANIFEST_SCHEMA,
+        "engine_version": __version__,
+        "config_hash": config_hash,
+        "columns": list(DIGEST_COLUMNS),
+        "rows": len(matrix),
+        "first_ts": str(pd.Timestamp(int(matrix["ts"][0]), tz="UTC")) if len(matrix) else None,
+        "last_ts": str(pd.Timestamp(int(matrix["ts"][-1]), tz="UTC")) if len(matrix) else None,
+        "inputs": inputs,
+        "root": root,
+        "months": month_digests,
+        "days": days,  # [day, first row, rows, digest]
+    }
+
+
+def write_digest(
+    ts: pd.DataFrame, cfg: RIMConfig, out_dir: Path, input_files: dict[str, Path] | None = None
+) -> dict:
+    """Writes rim_matrix.bin and digest_manifest.json for a run; returns the manifest."""
+    matrix = canonical_matrix(ts)
+    fingerprints: dict[str, dict] = {}
+    by_path: dict[Path, dict] = {}
+    for key, p in (input_files or {}).items():
+        p = Path(p)
+        if p not in by_path:
+            by_path[p] = file_fingerprint(p)
+        fingerprints[key] = by_path[p]
+
+    manifest = build_manifest(matrix, cfg.config_hash(), fingerprints)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / MATRIX_FILE).write_bytes(matrix.tobytes())
+    (out_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    return manifest
+
+
+# ======================================================
+# Verification
+# ======================================================
+
+
+def _manifest_path(run: Path) -> Path:
+    run = Path(run)
+    return run / MANIFEST_FILE if run.is_dir() else run
+
+
+def load_manifest(run: Path) -> dict:
+    return json.loads(_manifest_path(run).read_text(encoding="utf-8"))
+
+
+def _day_rows(run: Path, entry: list) -> np.ndarray | None:
+    path = _manifest_path(run).parent / MATRIX_FILE
+    if not path.exists():
+        return None
+    _, offset, rows, _ = entry
+    return np.fromfile(path, dtype=MATRIX_DTYPE, count=rows, offset=offset * MATRIX_DTYPE.itemsize)
+
+
+def _first_divergence(a: np.ndarray | None, b: np.ndarray | None) -> dict | None:
+    """First differing row between two day blocks (None if a matrix is unavailable)."""
+    if a is None or b is None:
+        return None
+    n = min(len(a), len(b))
+    bits_a = a[:n].view(np.uint8).reshape(n, -1)
+    bits_b = b[:n].view(np.uint8).reshape(n, -1)
+    diff_rows = np.flatnonzero((bits_a != bits_b).any(axis=1))
+    if len(diff_rows) == 0:
+        if len(a) == len(b):
+            return None
+        k, longer = n, a if len(a) > len(b) else b
+        return {"ts": str(pd.Timestamp(int(longer["ts"][k]), tz="UTC")), "reason": "extra_row"}
+
+    k = int(diff_rows[0])
+    if a["ts"][k] != b["ts"][k]:
+        t = min(a["ts"][k], b["ts"][k])
+        return {"ts": str(pd.Timestamp(int(t), tz="UTC")), "reason": "timestamp_mismatch"}
+    cols = [c for c in DIGEST_COLUMNS if a[c][k].tobytes() != b[c][k].tobytes()]
+    return {
+        "ts": str(pd.Timestamp(int(a["ts"][k]), tz="UTC")),
+        "reason": "value_mismatch",
+        "columns": cols,
+        "a": {c: float(a[c][k]) for c in cols},
+        "b": {c: float(b[c][k]) for c in cols},
+    }
+
+
+def verify_runs(a: Path, b: Path, max_days: int = 20) -> dict:
+    """
+    Compares two runs (run directories or manifest files). Descends only into months and days
+    whose digests differ; the first differing day is compared row by row via rim_matrix.bin
+    to pinpoint the first diverging hour.
+    """
+    ma, mb = load_manifest(a), load_manifest(b)
+    report: dict = {
+        "identical": ma["root"] == mb["root"],
+        "config_hash": [ma["config_hash"], mb["config_hash"]],
+        "inputs_match": ma["inputs"] == mb["inputs"],
+        "rows": [ma["rows"], mb["rows"]],
+        "differing_months": [],
+        "differing_days": [],
+        "first_divergence": None,
+    }
+    if report["identical"]:
+        return report
+
+    months = sorted(set(ma["months"]) | set(mb["months"]))
+    bad_months = [m for m in months if ma["months"].get(m) != mb["months"].get(m)]
+    report["differing_months"] = bad_months
+
+    keys = {id(m): np.array([d[0] for d in m["days"]]) for m in (ma, mb)}
+
+    def days_of(manifest: dict, month: str) -> dict[str, list]:
+        # days are sorted; the month's entries are one contiguous slice
+        k = keys[id(manifest)]
+        lo, hi = np.searchsorted(k, [month + "-01", month + "-99"])
+        return {d[0]: d for d in manifest["days"][lo:hi]}
+
+    bad_days: list[str] = []
+    first: tuple[list | None, list | None] | None = None
+    for month in bad_months:
+        da, db = days_of(ma, month), days_of(mb, month)
+        for day in sorted(set(da) | set(db)):
+            ea, eb = da.get(day), db.get(day)
+            if (ea and ea[3]) == (eb and eb[3]):
+                continue
+            if first is None:
+                first = (ea, eb)
+            bad_days.append(day)
+    report["differing_days_total"] = len(bad_days)
+    report["differing_days"] = bad_days[:max_days]
+
+    if first is not None:
+        ea, eb = first
+        if ea is None or eb is None:
+            present = ea or eb
+            rows = _day_rows(a if ea else b, present)
+            ts = None if rows is None else str(pd.Timestamp(int(rows["ts"][0]), tz="UTC"))
+            report["first_divergence"] = {"day": present[0], "ts": ts, "reason": "missing_day"}
+        else:
+            found = _first_divergence(_day_rows(a, ea), _day_rows(b, eb))
+            report["first_divergence"] = {"day": ea[0], **(found or {})}
+    return report
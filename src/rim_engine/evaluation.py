@@ -0,0 +1,127 @@
+"""Deterministic historical evaluation (see docs/evaluation_plan.md), computed in memory."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import RIMConfig
+from .panel import run_end_to_end
+from .regime_thresholds import REGIME_LABELS_V1, THRESHOLDS_V1, derive_regimes
+from .regimes import REGIME_EDGE_COLUMNS, regime_codes
+
+FACTOR_COLUMNS = ["PD_0_25", "LD_0_25", "RES_0_25", "IMB_0_25"]
+
+
+def _regimes(df: pd.DataFrame) -> pd.Series:
+    if "regime" in df.columns:
+        return df["regime"]
+    if all(c in df.columns for c in REGIME_EDGE_COLUMNS):
+        # Adaptive run: classify against the edges recorded for each row
+        codes = regime_codes(df["RIM_0_100"].to_numpy(), df[list(REGIME_EDGE_COLUMNS)].to_numpy())
+        labels = np.asarray(REGIME_LABELS_V1, dtype=object)[codes]
+        return pd.Series(labels, index=df.index, name="regime")
+    return pd.Series(derive_regimes(df["RIM_0_100"].to_numpy()), index=df.index, name="regime")
+
+
+def regime_share(regime: pd.Series) -> dict:
+    counts = regime.value_counts().to_dict()
+    total = len(regime)
+    return {k: v / total for k, v in counts.items()}
+
+
+def average_regime_duration_hours(regime: pd.Series) -> float:
+    # Mean run length == rows / number of runs
+    r = regime.to_numpy()
+    if len(r) == 0:
+        return 0.0
+    n_runs = 1 + int(np.count_nonzero(r[1:] != r[:-1]))
+    return len(r) / n_runs
+
+
+def factor_dominance(df: pd.DataFrame, regime: pd.Series) -> dict:
+    high = df.loc[regime.isin(["elevated", "high"]).to_numpy(), FACTOR_COLUMNS]
+    if high.empty:
+        return {}
+
+    # First maximal factor per row, counts in order of first appearance
+    dominant = high.astype(float).idxmax(axis=1)
+    counts = dominant.value_counts()
+    return {k: int(counts[k]) for k in pd.unique(dominant)}
+
+
+def evaluate_timeseries(ts: pd.DataFrame) -> dict:
+    """
+    Builds the evaluation report from a scored timeseries.
+
+    Accepts either the in-memory output of `run_end_to_end` (timestamps on the index)
+    or the canonical panel CSV layout (timestamps in a `ts` column).
+    """
+    required = {"RIM_0_100", *FACTOR_COLUMNS}
+    missing = required - set(ts.columns)
+    if missing:
+        raise ValueError(f"Panel missing required columns: {sorted(missing)}")
+
+    stamps = ts["ts"] if "ts" in ts.columns else ts.index.to_series()
+    regime = _regimes(ts)
+
+    return {
+        "rows": int(len(ts)),
+        "window_start": stamps.min().isoformat(),
+        "window_end": stamps.max().isoformat(),
+        "regime_share": regime_share(regime),
+        "avg_regime_duration_hours": float(average_regime_duration_hours(regime)),
+        "factor_dominance_elevated_high": factor_dominance(ts, regime),
+        "thresholds_v1": {
+            "low_lt": THRESHOLDS_V1.low_lt,
+            "moderate_lt": THRESHOLDS_V1.moderate_lt,
+            "elevated_lt": THRESHOLDS_V1.elevated_lt,
+            "high_ge": THRESHOLDS_V1.elevated_lt,
+        },
+    }
+
+
+def report_to_markdown(report: dict) -> str:
+    return (
+        "# RIM Evaluation Report\n\n"
+        f"Rows: {report['rows']}\n\n"
+        f"Window: {report['window_start']} → {report['window_end']}\n\n"
+        "## Regime Share\n"
+        + "\n".join(f"- {k}: {v:.2%}" for k, v in report["regime_share"].items())
+        + "\n\n"
+        "## Average Regime Duration\n"
+        f"{report['avg_regime_duration_hours']:.2f} hours\n\n"
+        "## Factor Dominance (Elevated/High)\n"
+        + (
+            "\n".join(f"- {k}: {v}" for k, v in report["factor_dominance_elevated_high"].items())
+            or "- (none)"
+        )
+        + "\n\n"
+        "## Thresholds (v1)\n"
+        f"- low: RIM < {THRESHOLDS_V1.low_lt:g}\n"
+        f"- moderate: {THRESHOLDS_V1.low_lt:g} ≤ RIM < {THRESHOLDS_V1.moderate_lt:g}\n"
+        f"- elevated: {THRESHOLDS_V1.moderate_lt:g} ≤ RIM < {THRESHOLDS_V1.elevated_lt:g}\n"
+        f"- high: RIM ≥ {THRESHOLDS_V1.elevated_lt:g}\n"
+    )
+
+
+def write_eval_report(report: dict, out_dir: Path) -> tuple[Path, Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    json_path = out_dir / "eval_report.json"
+    md_path = out_dir / "eval_report.md"
+    json_path.write_text(json.dumps(report, indent=2))
+    md_path.write_text(report_to_markdown(report))
+    return json_path, md_path
+
+
+def run_and_evaluate(
+    data_dir: Path, out_dir: Path, cfg: RIMConfig
+) -> tuple[pd.DataFrame, dict, dict]:
+    """Runs the pipeline and evaluates its in-memory timeseries (no CSV round-trip)."""
+    ts, panel = run_end_to_end(data_dir, out_dir, cfg)
+    report = evaluate_timeseries(ts)
+    write_eval_report(report, out_dir)
+    return ts, panel, report
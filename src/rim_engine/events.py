@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .attribution import FACTOR_CODES
+from .regimes import REGIME_LABELS
+
+# ======================================================
+# Regime transition events
+# ======================================================
+#
+# Two filters suppress chatter around regime_edges:
+#   - hysteresis: crossing edge e upwards needs RIM >= e + band, downwards RIM < e - band
+#     (each edge is an independent Schmitt trigger; the regime is the number of "on" edges)
+#   - dwell: a new regime is confirmed only after it has held for `min_dwell` rows
+# An event is emitted at the confirming row. Batch and incremental modes implement the
+# same state machine and produce identical events. Edges are either fixed or given per row
+# (adaptive regime edges, regimes.row_edges).
+
+
+@dataclass(frozen=True)
+class TransitionSpec:
+    hysteresis: float = 2.5  # RIM points either side of each edge
+    min_dwell: int = 3  # rows a new regime must hold before it is confirmed
+
+    def validate(self, edges) -> None:
+        if self.min_dwell < 1:
+            raise ValueError(f"min_dwell must be >= 1. Got {self.min_dwell}")
+        gaps = np.diff(np.asarray(edges, dtype=float), axis=-1)
+        if self.hysteresis < 0 or (gaps.size and self.hysteresis * 2 >= gaps.min()):
+            shown = edges if gaps.ndim == 1 else "(per row)"
+            bound = f"[0, {gaps.min() / 2:g})" if gaps.size else ">= 0"
+            raise ValueError(f"hysteresis must be {bound} for edges {shown}. Got {self.hysteresis}")
+
+
+DEFAULT_TRANSITION_SPEC = TransitionSpec()
+
+
+def _ffill(a: np.ndarray) -> np.ndarray:
+    """Forward-fills NaN in a 1-D float array (leading NaN stays NaN)."""
+    pos = np.where(np.isnan(a), 0, np.arange(len(a)))
+    np.maximum.accumulate(pos, out=pos)
+    return a[pos]
+
+
+def hysteresis_codes(rim: np.ndarray, edges, band: float) -> np.ndarray:
+    """
+    Regime code per row after hysteresis (before dwell filtering). `edges` is one set of edges
+    or an (n, k) array of edges per row.
+    """
+    rim = np.asarray(rim, dtype=float)
+    codes = np.zeros(len(rim), dtype=np.int8)
+    if len(rim) == 0:
+        return codes
+    edges = np.asarray(edges, dtype=float)
+    for e in edges.T:
+        sig = np.full(len(rim), np.nan)
+        sig[rim < e - band] = 0.0
+        sig[rim >= e + band] = 1.0
+        if np.isnan(sig[0]):
+            sig[0] = float(rim[0] >= np.ravel(e)[0])
+        codes += _ffill(sig).astype(np.int8)
+    return codes
+
+
+def _dominant(ts: pd.DataFrame, pos: np.ndarray) -> list[str | None]:
+    if "dominant_factor" in ts.columns:
+        codes = ts["dominant_factor"].to_numpy()[pos]
+        return [FACTOR_CODES[int(c)] for c in codes]
+    cols = [f"{f}_0_25" for f in FACTOR_CODES if f"{f}_0_25" in ts.columns]
+    if not cols:
+        return [None] * len(pos)
+    idx = ts[cols].to_numpy(dtype=float)[pos].argmax(axis=1)
+    return [cols[i].split("_")[0] for i in idx]
+
+
+def detect_transitions(
+    ts: pd.DataFrame, edges, spec: TransitionSpec = DEFAULT_TRANSITION_SPEC
+) -> list[dict]:
+    """
+    Batch mode: transition events over the whole timeseries, vectorized.
+
+    `ts` needs RIM_0_100 on a sorted DatetimeIndex; `edges` are fixed or one row per row of
+    `ts`. The dominant factor is taken from `dominant_factor` (attribution) when present, else
+    the largest factor score.
+    """
+    spec.validate(edges)
+    rim = ts["RIM_0_100"].to_numpy(dtype=float)
+    raw = hysteresis_codes(rim, edges, spec.hysteresis)
+    if len(raw) == 0:
+        return []
+
+    # Run-length encode, keep the first run and every run long enough to be confirmed
+    starts = np.concatenate(([0], np.flatnonzero(raw[1:] != raw[:-1]) + 1))
+    lengths = np.diff(np.concatenate((starts, [len(raw)])))
+    keep = lengths >= spec.min_dwell
+    keep[0] = True
+    starts, values = starts[keep], raw[starts[keep]]
+
+    # Adjacent confirmed runs with the same regime are one regime (short excursions absorbed)
+    changed = np.flatnonzero(values[1:] != values[:-1]) + 1
+    onset = starts[changed]
+    at = onset + spec.min_dwell - 1
+
+    stamps = ts.index[at]
+    onsets = ts.index[onset]
+    dominant = _dominant(ts, at)
+    return [
+        {
+            "ts": stamps[i].isoformat(),
+            "onset_ts": onsets[i].isoformat(),
+            "from": REGIME_LABELS[int(values[changed[i] - 1])],
+            "to": REGIME_LABELS[int(values[changed[i]])],
+            "RIM_0_100": float(rim[at[i]]),
+            "dominant_factor": dominant[i],
+        }
+        for i in range(len(at))
+    ]
+
+
+class RegimeTransitionDetector:
+    """
+    Incremental mode: feed one row at a time, get an event dict when a transition confirms.
+
+    State is a small dict (`state()` / `RegimeTransitionDetector(..., state=...)`) so it can be
+    persisted between hourly runs.
+    """
+
+    def __init__(
+        self,
+        edges: tuple[float, ...],
+        spec: TransitionSpec = DEFAULT_TRANSITION_SPEC,
+        state: dict | None = None,
+    ):
+        spec.validate(edges)
+        self.edges = tuple(float(e) for e in edges)
+        self.spec = spec
+        s = state or {}
+        self._on: list[bool] | None = s.get("on")
+        self._confirmed: int | None = s.get("confirmed")
+        self._candidate: int | None = s.get("candidate")
+        self._cand_len: int = s.get("cand_len", 0)
+        self._cand_onset: str | None = s.get("cand_onset")
+
+    def state(self) -> dict:
+        return {
+            "on": self._on,
+            "confirmed": self._confirmed,
+            "candidate": self._candidate,
+            "cand_len": self._cand_len,
+            "cand_onset": self._cand_onset,
+        }
+
+    def update(
+        self,
+        ts: pd.Timestamp,
+        rim_0_100: float,
+        dominant_factor: str | None = None,
+        edges: tuple[float, ...] | None = None,
+    ) -> dict | None:
+        """`edges` overrides the detector's edges for this row (adaptive regime edges)."""
+        band = self.spec.hysteresis
+        if edges is None:
+            edges = self.edges
+        else:
+            self.spec.validate(edges)
+        if self._on is None:
+            self._on = [bool(rim_0_100 >= e) for e in edges]
+        else:
+            for k, e in enumerate(edges):
+                if rim_0_100 >= e + band:
+                    self._on[k] = True
+                elif rim_0_100 < e - band:
+                    self._on[k] = False
+        raw = sum(self._on)
+
+        stamp = pd.Timestamp(ts).isoformat()
+        if raw == self._candidate:
+            self._cand_len += 1
+        else:
+            self._candidate, self._cand_len, self._cand_onset = raw, 1, stamp
+
+        if self._confirmed is None:
+            self._confirmed = raw
+            return None
+        if raw != self._confirmed and self._cand_len == self.spec.min_dwell:
+            event = {
+                "ts": stamp,
+                "onset_ts": self._cand_onset,
+                "from": REGIME_LABELS[self._confirmed],
+                "to": REGIME_LABELS[raw],
+                "RIM_0_100": float(rim_0_100),
+                "dominant_factor": dominant_factor,
+            }
+            self._confirmed = raw
+            return event
+        return None
+
+
+def append_events_jsonl(events: list[dict], path: Path) -> int:
+    """
+    Appends events newer than the last logged one to an append-only JSONL log.
+
+    Returns the number of events written; re-running over the same history writes nothing.
+    """
+    last_ts: pd.Timestamp | None = None
+    if path.exists() and path.stat().st_size:
+        # Event lines are small; the tail of the file always holds the last one
+        with open(path, "rb") as fh:
+            fh.seek(max(0, path.stat().st_size - 65536))
+            last = fh.read().rstrip(b"\n").rsplit(b"\n", 1)[-1]
+        last_ts = pd.Timestamp(json.loads(last)["ts"])
+
+    new = [e for e in events if last_ts is None or pd.Timestamp(e["ts"]) > last_ts]
+    if not new:
+        return 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write("".join(json.dumps(e) + "\n" for e in new))
+    return len(new)
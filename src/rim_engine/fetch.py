@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import urllib.parse
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .colstore import ColumnStore
+from .io import DataQualityReport, _finalize_series, combine_inputs
+from .util.errors import MissingInputsError, RimEngineError
+
+# ======================================================
+# Incremental fetch into the ingestion cache
+# ======================================================
+#
+# Source protocol (SMARD chart_data style, one JSON document per series):
+#   GET {base_url}/{series_id}.json?start=<epoch ms>
+#   -> {"series": [[<epoch ms UTC>, <value or null>], ...]}
+# ETag / Last-Modified are honoured via If-None-Match / If-Modified-Since.
+#
+# Cache layout: one ColumnStore per input key (column name == key), UTC index at `freq`,
+# i.e. exactly the per-series frames `load_inputs` builds before combining them.
+
+# Cache key -> remote series ids; several ids are summed (RES = wind offshore + onshore + PV)
+SMARD_SERIES: dict[str, tuple[str, ...]] = {
+    "pd": ("4169",),
+    "pd_neigh": ("5078",),
+    "ld": ("410",),
+    "res": ("1225", "4067", "4068"),
+}
+
+
+class FetchError(RimEngineError):
+    """Raised when the source answers with an unexpected status or payload."""
+
+
+@dataclass(frozen=True)
+class FetchSource:
+    base_url: str
+    series: dict[str, tuple[str, ...]] = field(default_factory=lambda: dict(SMARD_SERIES))
+    max_connections: int = 4
+    timeout_s: float = 30.0
+
+
+@dataclass
+class FetchResult:
+    key: str
+    requested_from: str | None
+    not_modified: int
+    rows_written: int
+    bytes_downloaded: int
+
+
+# ======================================================
+# Pooled HTTP client
+# ======================================================
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to a single host, shared by concurrent requests."""
+
+    def __init__(self, base_url: str, size: int, timeout_s: float):
+        u = urllib.parse.urlsplit(base_url)
+        self.scheme, self.host, self.port = u.scheme, u.hostname, u.port
+        self.prefix = u.path.rstrip("/")
+        self.timeout_s = timeout_s
+        self._idle: asyncio.Queue[http.client.HTTPConnection | None] = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(None)  # connections are opened lazily
+        self.connections_opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        self.connections_opened += 1
+        return cls(self.host, self.port, timeout=self.timeout_s)
+
+    def _request(
+        self, conn: http.client.HTTPConnection | None, path: str, headers: dict[str, str]
+    ) -> tuple[http.client.HTTPConnection, int, dict[str, str], bytes]:
+        reused = conn is not None
+        conn = conn or self._connect()
+        try:
+            conn.request("GET", self.prefix + path, headers=headers)
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionError):
+            if not reused:
+                raise
+            # Server closed an idle keep-alive connection; retry once on a fresh one
+            conn.close()
+            conn = self._connect()
+            conn.request("GET", self.prefix + path, headers=headers)
+            resp = conn.getresponse()
+        return conn, resp.status, dict(resp.getheaders()), resp.read()
+
+    async def get(self, path: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        conn = await self._idle.get()
+        try:
+            conn, status, resp_headers, body = await asyncio.to_thread(
+                self._request, conn, path, headers
+            )
+        except BaseException:
+            self._idle.put_nowait(None)
+            raise
+        self._idle.put_nowait(conn)
+        return status, resp_headers, body
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            if conn is not None:
+                conn.close()
+
+
+# ======================================================
+# Cache
+# ======================================================
+
+
+def _store(cache_dir: Path, key: str) -> ColumnStore:
+    return ColumnStore(Path(cache_dir) / key)
+
+
+def cache_stores(cache_dir: Path, keys: tuple[str, ...]) -> dict[str, Path]:
+    """Store directory of each cached input key (fingerprinted by digest.write_digest)."""
+    return {key: _store(cache_dir, key).root for key in keys}
+
+
+def load_cached_inputs(
+    cache_dir: Path, keys: tuple[str, ...], freq: str | None = None
+) -> tuple[pd.DataFrame, dict[str, DataQualityReport]]:
+    """Reads cached series and combines them like `load_inputs` does."""
+    frames: dict[str, pd.DataFrame] = {}
+    reports: dict[str, DataQualityReport] = {}
+    for key in keys:
+        store = _store(cache_dir, key)
+        if not store.exists() or len(store) == 0:
+            raise MissingInputsError(f"No cached data for {key!r} in {cache_dir}")
+        meta = store.user_meta()
+        if freq is not None and meta.get("freq") != freq:
+            raise MissingInputsError(
+                f"Cached {key!r} is at freq={meta.get('freq')!r}, requested {freq!r}"
+            )
+        df = store.read()
+        frames[key] = df
+        reports[key] = DataQualityReport(
+            name=key,
+            time_col="ts",
+            value_col=" + ".join(meta.get("series_ids", [])),
+            sep_used="",
+            n_rows_raw=len(df),
+            n_rows_valid=len(df),
+            first_ts=str(df.index.min()) if len(df) else None,
+            last_ts=str(df.index.max()) if len(df) else None,
+            notes=[f"Fetched from {meta.get('base_url')}"],
+        )
+    return combine_inputs(frames, reports), reports
+
+
+# ======================================================
+# Fetch
+# ======================================================
+
+
+def _parse_series(body: bytes, series_id: str) -> pd.Series:
+    try:
+        points = json.loads(body)["series"]
+    except (ValueError, KeyError) as e:
+        raise FetchError(f"Unexpected payload for series {series_id}") from e
+    if not points:
+        return pd.Series(dtype=float)
+    arr = np.array([(p[0], np.nan if p[1] is None else p[1]) for p in points], dtype=float)
+    return pd.Series(arr[:, 1], index=arr[:, 0].astype("int64"))
+
+
+async def _fetch_key(
+    pool: _ConnectionPool,
+    cache_dir: Path,
+    key: str,
+    series_ids: tuple[str, ...],
+    base_url: str,
+    freq: str,
+) -> FetchResult:
+    store = _store(cache_dir, key)
+    meta = store.user_meta()
+    if meta and (meta.get("freq") != freq or meta.get("series_ids") != list(series_ids)):
+        store.reset()
+        meta = {}
+
+    # Re-request the last cached bucket too: it may have been incomplete when cached
+    last = store.last_ts()
+    start_ms = None if last is None else int(last.value // 1_000_000)
+    validators: dict = meta.get("validators", {})
+
+    async def one(series_id: str, conditional: bool) -> tuple[int, bytes]:
+        path = f"/{series_id}.json" + ("" if start_ms is None else f"?start={start_ms}")
+        headers = {"Accept": "application/json"}
+        v = validators.get(series_id, {})
+        if conditional and v.get("path") == path:
+            if v.get("etag"):
+                headers["If-None-Match"] = v["etag"]
+            if v.get("last_modified"):
+                headers["If-Modified-Since"] = v["last_modified"]
+        status, resp_headers, body = await pool.get(path, headers)
+        if status not in (200, 304):
+            raise FetchError(f"GET {base_url}{path} returned HTTP {status}")
+        if status == 200:
+            h = {k.lower(): val for k, val in resp_headers.items()}
+            validators[series_id] = {
+                "path": path,
+                "etag": h.get("etag"),
+                "last_modified": h.get("last-modified"),
+            }
+        return status, body
+
+    responses = dict(
+        zip(series_ids, await asyncio.gather(*(one(sid, True) for sid in series_ids)), strict=True)
+    )
+    not_modified = sum(1 for status, _ in responses.values() if status == 304)
+    if 0 < not_modified < len(series_ids):
+        # Summed series need every component; re-request the unchanged ones in full
+        stale = [sid for sid, (status, _) in responses.items() if status == 304]
+        for sid, r in zip(
+            stale, await asyncio.gather(*(one(sid, False) for sid in stale)), strict=True
+        ):
+            responses[sid] = r
+    n_bytes = sum(len(body) for _, body in responses.values())
+
+    written = 0
+    if not_modified < len(series_ids):
+        parts = [_parse_series(body, sid) for sid, (_, body) in responses.items()]
+        # Row-wise sum with NaN propagation, as load_res_actual_csv does
+        raw = pd.concat(parts, axis=1).sum(axis=1, min_count=len(parts)).sort_index()
+        if len(raw):
+            idx = pd.to_datetime(raw.index.to_numpy(), unit="ms", utc=True)
+            out, _ = _finalize_series(key, pd.Series(idx), raw, tz=None, freq=freq)
+            if len(out):
+                # Rewrite already-cached buckets only if the source revised them
+                cached = store.read(start=out.index[0])
+                overlap = out.loc[out.index <= cached.index.max()] if len(cached) else out.iloc[:0]
+                if len(overlap) and not np.array_equal(
+                    overlap[key].to_numpy(), cached[key].reindex(overlap.index).to_numpy()
+                ):
+                    store.truncate_from(out.index[0])
+                written = store.append(out)
+
+    store.set_user_meta(
+        freq=freq, series_ids=list(series_ids), base_url=base_url, validators=validators
+    )
+    return FetchResult(
+        key=key,
+        requested_from=None if last is None else last.isoformat(),
+        not_modified=not_modified,
+        rows_written=written,
+        bytes_downloaded=n_bytes,
+    )
+
+
+async def afetch_inputs(
+    source: FetchSource, cache_dir: Path, freq: str = "h"
+) -> dict[str, FetchResult]:
+    """Fetches every configured series concurrently over one pooled client."""
+    pool = _ConnectionPool(source.base_url, source.max_connections, source.timeout_s)
+    try:
+        results = await asyncio.gather(
+            *(
+                _fetch_key(pool, Path(cache_dir), key, ids, source.base_url, freq)
+                for key, ids in source.series.items()
+            )
+        )
+    finally:
+        await pool.close()
+    return {r.key: r for r in results}
+
+
+def fetch_inputs(source: FetchSource, cache_dir: Path, freq: str = "h") -> dict[str, FetchResult]:
+    return asyncio.run(afetch_inputs(source, cache_dir, freq))
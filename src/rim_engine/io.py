@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from .align import align_inputs
+from .registry import CORE_INPUTS
+
 # ======================================================
 # Data Quality Report
 # ======================================================
@@ -22,6 +26,13 @@ class DataQualityReport:
     last_ts: str | None
     notes: list[str]
 
+    # Profiling (computed in the same pass as finalization)
+    dropped: dict[str, int] = field(default_factory=dict)
+    gaps: list[tuple[str, int]] = field(default_factory=list)
+    stats: dict[str, float | None] = field(default_factory=dict)
+    # Filled when combined with other inputs (see align.align_inputs)
+    overlap: dict = field(default_factory=dict)
+
     def to_dict(self) -> dict:
         return {
             "name": self.name,
@@ -33,6 +44,10 @@ class DataQualityReport:
             "first_ts": self.first_ts,
             "last_ts": self.last_ts,
             "notes": self.notes,
+            "dropped": self.dropped,
+            "gaps": [[start, length] for start, length in self.gaps],
+            "stats": self.stats,
+            "overlap": self.overlap,
         }
 
 
@@ -115,47 +130,156 @@ def _to_numeric_robust(s: pd.Series) -> pd.Series:
     return pd.to_numeric(x, errors="coerce")
 
 
+def _gap_runs(missing: np.ndarray, index: pd.DatetimeIndex) -> list[tuple[str, int]]:
+    """Run-length encodes a boolean missing mask into (start, length) pairs."""
+    edges = np.diff(np.concatenate(([0], missing.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    return [(str(index[i]), int(n)) for i, n in zip(starts, lengths, strict=True)]
+
+
 def _finalize_series(
     name: str,
     idx: pd.Series,
     values: pd.Series,
     tz: str | None,
     freq: str,
-) -> pd.DataFrame:
+) -> tuple[pd.DataFrame, dict]:
     """
     Finalizes a single series into a clean, hourly (or freq) time series.
 
     CRITICAL: avoid pandas alignment bugs by using to_numpy() so values are assigned positionally.
     Also: handle Europe/Berlin DST ambiguity deterministically by converting to UTC.
+
+    Returns the series plus a profile dict (dropped rows per reason, gap runs on the
+    expected `freq` grid, min/max/NaN share). Every check is a whole-array operation.
     """
+    dropped = {"nat_timestamp": 0, "duplicate": 0, "ambiguous_dst": 0, "non_numeric": 0}
+    profile: dict = {"dropped": dropped, "gaps": [], "stats": {}}
+
     # Force positional assignment (no index alignment surprises)
     out = pd.DataFrame({name: values.to_numpy()}, index=pd.DatetimeIndex(idx))
 
     # Remove NaT timestamps early
-    out = out[~out.index.isna()].sort_index()
+    nat = out.index.isna()
+    dropped["nat_timestamp"] = int(nat.sum())
+    out = out[~nat].sort_index(kind="stable")  # stable: "keep last" means last in the file
     if out.empty:
-        return out
-
-    # Remove duplicates (keep last)
-    out = out[~out.index.duplicated(keep="last")]
+        return out, profile
 
     # Timezone policy:
     # - If tz provided: localize (drop ambiguous repeated-hour stamps) then convert to UTC
+    # Ambiguity is classified before deduplication, so both copies of the DST fall-back hour
+    # count as ambiguous_dst and `duplicate` only counts genuinely repeated rows.
     if tz:
         if out.index.tz is None:
             # AmbiguousTimeError-safe: drop ambiguous timestamps
             out.index = out.index.tz_localize(tz, nonexistent="shift_forward", ambiguous="NaT")
-            out = out[~out.index.isna()]
+            amb = out.index.isna()
+            dropped["ambiguous_dst"] = int(amb.sum())
+            out = out[~amb]
             if out.empty:
-                return out
+                return out, profile
             out.index = out.index.tz_convert("UTC")
         else:
             out.index = out.index.tz_convert("UTC")
 
+    # Remove duplicates (keep last)
+    dup = out.index.duplicated(keep="last")
+    dropped["duplicate"] = int(dup.sum())
+    out = out[~dup]
+
+    dropped["non_numeric"] = int(out[name].isna().sum())
+
     # Resample to target frequency and drop missing
     out = out.resample(freq).mean()
+    missing = out[name].isna().to_numpy()
+    profile["gaps"] = _gap_runs(missing, out.index)
     out = out.dropna()
-    return out
+
+    v = out[name].to_numpy(dtype=float)
+    profile["stats"] = {
+        "min": float(v.min()) if len(v) else None,
+        "max": float(v.max()) if len(v) else None,
+        "nan_share": float(missing.mean()) if len(missing) else 0.0,
+    }
+    return out, profile
+
+
+# ======================================================
+# Arrow backend (optional: pip install "rim-engine-de-lu[arrow]")
+# ======================================================
+#
+# CSV reading, column projection, timestamp parsing and the robust numeric parsing run in
+# multithreaded Arrow kernels. DST handling, UTC conversion and resampling stay in
+# _finalize_series so both engines share one definition of the output.
+
+ENGINES = ("pandas", "arrow")
+
+_NUMERIC_RE = r"^[+-]?((\d+\.?\d*|\.\d+)([eE][+-]?\d+)?|(?i:inf|infinity))$"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pv
+    except ImportError as e:
+        raise ImportError(
+            "engine='arrow' requires pyarrow: pip install 'rim-engine-de-lu[arrow]'"
+        ) from e
+    return pa, pc, pv
+
+
+def _csv_header(path: Path, sep: str) -> list[str]:
+    with open(path, encoding="utf-8-sig") as fh:
+        return fh.readline().rstrip("\r\n").split(sep)
+
+
+def _read_csv_arrow(path: Path, sep: str, columns: list[str]):
+    pa, _, pv = _require_pyarrow()
+    return pv.read_csv(
+        path,
+        read_options=pv.ReadOptions(use_threads=True),
+        parse_options=pv.ParseOptions(delimiter=sep),
+        convert_options=pv.ConvertOptions(
+            include_columns=columns,
+            column_types={c: pa.string() for c in columns},
+            strings_can_be_null=False,
+        ),
+    )
+
+
+def _to_numeric_arrow(arr):
+    """Arrow twin of `_to_numeric_robust` (same three cases), returns float64 with nulls."""
+    pa, pc, _ = _require_pyarrow()
+    x = pc.utf8_trim_whitespace(pc.replace_substring(arr, "\u00a0", " "))
+
+    has_comma = pc.match_substring(x, ",")
+    has_dot = pc.match_substring(x, ".")
+
+    # Case 1: comma thousands: 51,882.82 -> remove commas
+    x = pc.if_else(pc.and_(has_comma, has_dot), pc.replace_substring(x, ",", ""), x)
+    # Case 2 (euro style) never triggers after case 1 in the pandas parser either.
+    # Case 3: only comma decimal: 51882,82 -> swap comma to dot
+    x = pc.if_else(pc.and_(has_comma, pc.invert(has_dot)), pc.replace_substring(x, ",", "."), x)
+
+    x = pc.replace_substring(x, " ", "")
+    valid = pc.match_substring_regex(x, _NUMERIC_RE)
+    return pc.cast(pc.if_else(valid, x, pa.scalar(None, pa.string())), pa.float64())
+
+
+def _datetime_unit() -> str:
+    # Match the resolution pandas' own parser produces, so both engines yield identical frames
+    return str(pd.to_datetime(pd.Series(["2000-01-01"]), format="%Y-%m-%d").dtype)
+
+
+def _to_datetime_arrow(arr, fmt: str | None) -> pd.Series:
+    _, pc, _ = _require_pyarrow()
+    if fmt is None:
+        return pd.to_datetime(arr.to_pandas(), errors="coerce")
+    ts = pc.strptime(arr, format=fmt, unit="us", error_is_null=True)
+    return ts.to_pandas().astype(_datetime_unit())
 
 
 # ======================================================
@@ -163,29 +287,41 @@ def _finalize_series(
 # ======================================================
 
 
-def load_series_csv(path: Path, spec: SeriesSpec) -> tuple[pd.DataFrame, DataQualityReport]:
+def load_series_csv(
+    path: Path, spec: SeriesSpec, engine: str = "pandas"
+) -> tuple[pd.DataFrame, DataQualityReport]:
     notes: list[str] = []
 
     sep = spec.sep or ";"
-    df = pd.read_csv(path, sep=sep, encoding="utf-8-sig", low_memory=False)
-    n_rows_raw = len(df)
+    if engine == "arrow":
+        header = pd.DataFrame(columns=_csv_header(path, sep))
+    else:
+        df = pd.read_csv(path, sep=sep, encoding="utf-8-sig", low_memory=False)
+        header = df
 
-    time_col = spec.time_col or _guess_col(df, spec.preferred_time_cols or [])
-    value_col = spec.value_col or _guess_col(df, spec.preferred_value_cols or [])
+    time_col = spec.time_col or _guess_col(header, spec.preferred_time_cols or [])
+    value_col = spec.value_col or _guess_col(header, spec.preferred_value_cols or [])
 
     if time_col is None or value_col is None:
         raise ValueError(
             f"[{spec.name}] Cannot determine time/value columns. "
-            f"Available columns: {list(df.columns)[:50]}"
+            f"Available columns: {list(header.columns)[:50]}"
         )
 
-    if spec.datetime_format:
-        idx = pd.to_datetime(df[time_col], format=spec.datetime_format, errors="coerce")
+    if engine == "arrow":
+        table = _read_csv_arrow(path, sep, [time_col, value_col])
+        n_rows_raw = table.num_rows
+        idx = _to_datetime_arrow(table[time_col], spec.datetime_format).rename(time_col)
+        values = _to_numeric_arrow(table[value_col]).to_pandas().rename(value_col)
     else:
-        idx = pd.to_datetime(df[time_col], errors="coerce")
+        n_rows_raw = len(df)
+        if spec.datetime_format:
+            idx = pd.to_datetime(df[time_col], format=spec.datetime_format, errors="coerce")
+        else:
+            idx = pd.to_datetime(df[time_col], errors="coerce")
+        values = _to_numeric_robust(df[value_col])
 
-    values = _to_numeric_robust(df[value_col])
-    out = _finalize_series(spec.name, idx, values, spec.tz, spec.freq)
+    out, profile = _finalize_series(spec.name, idx, values, spec.tz, spec.freq)
 
     rep = DataQualityReport(
         name=spec.name,
@@ -197,6 +333,7 @@ def load_series_csv(path: Path, spec: SeriesSpec) -> tuple[pd.DataFrame, DataQua
         first_ts=str(out.index.min()) if len(out) else None,
         last_ts=str(out.index.max()) if len(out) else None,
         notes=notes,
+        **profile,
     )
     return out, rep
 
@@ -207,7 +344,7 @@ def load_series_csv(path: Path, spec: SeriesSpec) -> tuple[pd.DataFrame, DataQua
 
 
 def load_res_actual_csv(
-    path: Path, tz: str | None, freq: str = "h"
+    path: Path, tz: str | None, freq: str = "h", engine: str = "pandas"
 ) -> tuple[pd.DataFrame, DataQualityReport]:
     """
     Loads RES actual generation CSV and derives a single total RES series (wind+solar).
@@ -221,34 +358,45 @@ def load_res_actual_csv(
     sep = ";"
     dtfmt = "%b %d, %Y %I:%M %p"
 
-    df = pd.read_csv(path, sep=sep, encoding="utf-8-sig", low_memory=False)
-    n_rows_raw = len(df)
-
-    if "Start date" not in df.columns:
-        raise ValueError(
-            f"[res] Missing 'Start date' in {path.name}. Columns: {list(df.columns)[:30]}"
-        )
+    if engine == "arrow":
+        columns = _csv_header(path, sep)
+    else:
+        df = pd.read_csv(path, sep=sep, encoding="utf-8-sig", low_memory=False)
+        columns = list(df.columns)
 
-    idx = pd.to_datetime(df["Start date"], format=dtfmt, errors="coerce")
+    if "Start date" not in columns:
+        raise ValueError(f"[res] Missing 'Start date' in {path.name}. Columns: {columns[:30]}")
 
     candidates = [
         "Wind offshore [MWh] Original resolutions",
         "Wind onshore [MWh] Original resolutions",
         "Photovoltaics [MWh] Original resolutions",
     ]
-    present = [c for c in candidates if c in df.columns]
+    present = [c for c in candidates if c in columns]
     if not present:
         raise ValueError(
             f"[res] None of expected RES component columns found in {path.name}. "
-            f"Columns: {list(df.columns)[:50]}"
+            f"Columns: {columns[:50]}"
         )
 
     res_total = None
-    for c in present:
-        s = _to_numeric_robust(df[c])
-        res_total = s if res_total is None else (res_total + s)
+    if engine == "arrow":
+        _, pc, _ = _require_pyarrow()
+        table = _read_csv_arrow(path, sep, ["Start date", *present])
+        n_rows_raw = table.num_rows
+        idx = _to_datetime_arrow(table["Start date"], dtfmt).rename("Start date")
+        for c in present:
+            s = _to_numeric_arrow(table[c])
+            res_total = s if res_total is None else pc.add(res_total, s)
+        res_total = res_total.to_pandas().rename(present[-1] if len(present) == 1 else None)
+    else:
+        n_rows_raw = len(df)
+        idx = pd.to_datetime(df["Start date"], format=dtfmt, errors="coerce")
+        for c in present:
+            s = _to_numeric_robust(df[c])
+            res_total = s if res_total is None else (res_total + s)
 
-    out = _finalize_series("res", idx, res_total, tz, freq)
+    out, profile = _finalize_series("res", idx, res_total, tz, freq)
 
     rep = DataQualityReport(
         name="res",
@@ -260,6 +408,85 @@ def load_res_actual_csv(
         first_ts=str(out.index.min()) if len(out) else None,
         last_ts=str(out.index.max()) if len(out) else None,
         notes=notes + [f"Aggregated columns: {present}"],
+        **profile,
+    )
+    return out, rep
+
+
+# ======================================================
+# Cross-border loader (neighbour price columns -> widest single-border spread)
+# ======================================================
+
+XB_PRICE_COL = "Germany/Luxembourg [€/MWh] Calculated resolutions"
+# Bidding zones with an interconnector to DE-LU (BE, DK1, DK2, FR, NL, NO2, AT, PL, SE4, CH, CZ).
+# SMARD also lists zones that only bordered the pre-2018 DE/AT/LU zone (Northern Italy,
+# Slovenia, Hungary) and the neighbour average; neither is a single DE-LU border.
+XB_NEIGHBOUR_ZONES = (
+    "Belgium",
+    "Denmark 1",
+    "Denmark 2",
+    "France",
+    "Netherlands",
+    "Norway 2",
+    "Austria",
+    "Poland",
+    "Sweden 4",
+    "Switzerland",
+    "Czech Republic",
+)
+XB_NEIGHBOUR_COLS = tuple(f"{z} [€/MWh] Calculated resolutions" for z in XB_NEIGHBOUR_ZONES)
+
+
+def load_xb_spread_csv(
+    path: Path, tz: str | None, freq: str = "h", engine: str = "pandas"
+) -> tuple[pd.DataFrame, DataQualityReport]:
+    """
+    Loads the day-ahead price CSV and derives the widest absolute spread between DE/LU and any
+    single neighbouring zone (the XB_NEIGHBOUR_COLS present; zones without a price are skipped).
+    Output column: 'xb'
+    """
+    sep = ";"
+    dtfmt = "%b %d, %Y %I:%M %p"
+
+    if engine == "arrow":
+        columns = _csv_header(path, sep)
+    else:
+        df = pd.read_csv(path, sep=sep, encoding="utf-8-sig", low_memory=False)
+        columns = list(df.columns)
+
+    if "Start date" not in columns or XB_PRICE_COL not in columns:
+        raise ValueError(
+            f"[xb] Missing 'Start date' or {XB_PRICE_COL!r} in {path.name}. Columns: {columns[:30]}"
+        )
+    zones = [c for c in XB_NEIGHBOUR_COLS if c in columns]
+    if not zones:
+        raise ValueError(f"[xb] No neighbour price columns found in {path.name}.")
+
+    if engine == "arrow":
+        table = _read_csv_arrow(path, sep, ["Start date", XB_PRICE_COL, *zones])
+        n_rows_raw = table.num_rows
+        idx = _to_datetime_arrow(table["Start date"], dtfmt).rename("Start date")
+        prices = {c: _to_numeric_arrow(table[c]).to_pandas() for c in [XB_PRICE_COL, *zones]}
+    else:
+        n_rows_raw = len(df)
+        idx = pd.to_datetime(df["Start date"], format=dtfmt, errors="coerce")
+        prices = {c: _to_numeric_robust(df[c]) for c in [XB_PRICE_COL, *zones]}
+
+    home = prices.pop(XB_PRICE_COL)
+    spread = pd.DataFrame(prices).sub(home, axis=0).abs().max(axis=1)
+    out, profile = _finalize_series("xb", idx, spread, tz, freq)
+
+    rep = DataQualityReport(
+        name="xb",
+        time_col="Start date",
+        value_col=f"max |{XB_PRICE_COL} - neighbour|",
+        sep_used=sep,
+        n_rows_raw=n_rows_raw,
+        n_rows_valid=len(out),
+        first_ts=str(out.index.min()) if len(out) else None,
+        last_ts=str(out.index.max()) if len(out) else None,
+        notes=[f"Neighbour zones: {zones}"],
+        **profile,
     )
     return out, rep
 
@@ -273,6 +500,7 @@ def load_inputs(
     paths: dict[str, Path],
     tz: str | None,
     freq: str = "h",
+    engine: str = "pandas",
 ) -> tuple[pd.DataFrame, dict[str, DataQualityReport]]:
     """
     Loads and returns a unified dataframe of:
@@ -280,11 +508,47 @@ def load_inputs(
       - pd_neigh
       - ld
       - res (derived from RES actual components)
+      - rl, xb when given (residual load; widest cross-border spread)
 
     IMPORTANT:
     - All outputs are in UTC if tz is provided.
     - Resampling happens per-series.
+    - Rows are those where pd, pd_neigh and ld are all present; other series are NaN where
+      they have no row (see combine_inputs).
+    - engine="arrow" parses the CSVs with pyarrow (optional dependency); output is identical.
+    """
+    frames: dict[str, pd.DataFrame] = {}
+    reports: dict[str, DataQualityReport] = {}
+
+    for key, p in paths.items():
+        frames[key], reports[key] = load_input(key, Path(p), tz=tz, freq=freq, engine=engine)
+
+    return combine_inputs(frames, reports), reports
+
+
+def combine_inputs(
+    frames: dict[str, pd.DataFrame], reports: dict[str, DataQualityReport]
+) -> pd.DataFrame:
+    """
+    Aligns ingested series on the rows where all core inputs (pd, pd_neigh, ld) are present,
+    left-joining the others, and records each series' overlap in its report.
+    """
+    combined, overlap = align_inputs(frames, CORE_INPUTS)
+    for key, stats in overlap.items():
+        reports[key].overlap = stats.to_dict()
+    return combined
+
+
+def load_input(
+    key: str, path: Path, tz: str | None, freq: str = "h", engine: str = "pandas"
+) -> tuple[pd.DataFrame, DataQualityReport]:
     """
+    Loads one input series by key ("pd", "pd_neigh", "ld", "res", "rl", "xb" or a generic
+    series).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}. Got {engine!r}")
+
     dtfmt = "%b %d, %Y %I:%M %p"
 
     SPECS: dict[str, SeriesSpec] = {
@@ -315,20 +579,20 @@ def load_inputs(
             tz=tz,
             freq=freq,
         ),
+        "rl": SeriesSpec(
+            name="rl",
+            sep=";",
+            time_col="Start date",
+            value_col="Residual load [MWh] Calculated resolutions",
+            datetime_format=dtfmt,
+            tz=tz,
+            freq=freq,
+        ),
     }
 
-    frames: list[pd.DataFrame] = []
-    reports: dict[str, DataQualityReport] = {}
-
-    for key, p in paths.items():
-        if key == "res":
-            df_k, rep = load_res_actual_csv(Path(p), tz=tz, freq=freq)
-        else:
-            spec = SPECS.get(key, SeriesSpec(name=key, tz=tz, freq=freq))
-            df_k, rep = load_series_csv(Path(p), spec)
-
-        frames.append(df_k)
-        reports[key] = rep
-
-    combined = pd.concat(frames, axis=1).sort_index()
-    return combined, reports
+    if key == "res":
+        return load_res_actual_csv(path, tz=tz, freq=freq, engine=engine)
+    if key == "xb":
+        return load_xb_spread_csv(path, tz=tz, freq=freq, engine=engine)
+    spec = SPECS.get(key, SeriesSpec(name=key, tz=tz, freq=freq))
+    return load_series_csv(path, spec, engine=engine)
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import mmap
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .regimes import regime_codes
+
+try:  # advisory single-writer lock where available
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+# ======================================================
+# Memory-mapped live feed (binary ring file)
+# ======================================================
+#
+# Layout (little-endian, fixed size):
+#   header   HEADER_SIZE bytes, see HEADER_DTYPE
+#   records  capacity × RECORD_DTYPE (32 bytes), a ring: record i lives in slot i % capacity
+#
+# One writer, any number of readers. The writer follows a seqlock: `seq` is made odd before
+# touching records and even again after `count` / `last_ts` are updated. Readers copy what they
+# need and retry if `seq` was odd or changed meanwhile, so they never see a torn append.
+# Nothing is parsed: both sides map the file and view it through the numpy dtypes below.
+
+FEED_FILE = "rim_feed.bin"
+FEED_MAGIC = b"RIMFEED1"
+FEED_SCHEMA_VERSION = 1
+DEFAULT_CAPACITY = 1 << 16  # ~7.5 years hourly, ~1.9 years at 15min; 2 MiB
+
+HEADER_SIZE = 128
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("schema_version", "<u4"),
+        ("record_size", "<u4"),
+        ("capacity", "<u8"),
+        ("seq", "<u8"),  # odd while an append is in progress
+        ("count", "<u8"),  # records ever appended since the last reset
+        ("generation", "<u8"),  # bumped on every reset (config change)
+        ("last_ts", "<i8"),  # UTC ns of the newest record, 0 when empty
+        ("config_hash", "S16"),
+        ("_reserved", "V56"),
+    ]
+)
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),  # UTC ns
+        ("PD_0_25", "<f4"),
+        ("LD_0_25", "<f4"),
+        ("RES_0_25", "<f4"),
+        ("IMB_0_25", "<f4"),
+        ("RIM_0_100", "<f4"),
+        ("regime", "i1"),  # index into regimes.REGIME_LABELS, -1 if RIM is NaN
+        ("_pad", "V3"),
+    ]
+)
+
+FEED_COLUMNS = ("PD_0_25", "LD_0_25", "RES_0_25", "IMB_0_25", "RIM_0_100")
+
+
+class FeedFormatError(ValueError):
+    """Raised when a file is not a live feed of a supported schema version."""
+
+
+class FeedBusyError(RuntimeError):
+    """Raised when no consistent read is possible in time (e.g. a writer died mid-append)."""
+
+
+def _map(path: Path, writable: bool) -> tuple[mmap.mmap, np.ndarray, np.ndarray]:
+    with open(path, "r+b" if writable else "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    header = np.frombuffer(mm, dtype=HEADER_DTYPE, count=1)
+    if bytes(header["magic"][0]) != FEED_MAGIC:
+        raise FeedFormatError(f"{path} is not a RIM live feed")
+    if int(header["schema_version"][0]) != FEED_SCHEMA_VERSION:
+        raise FeedFormatError(
+            f"{path} has schema version {int(header['schema_version'][0])}, "
+            f"expected {FEED_SCHEMA_VERSION}"
+        )
+    capacity = int(header["capacity"][0])
+    records = np.frombuffer(mm, dtype=RECORD_DTYPE, count=capacity, offset=HEADER_SIZE)
+    return mm, header, records
+
+
+def _unmap(obj) -> None:
+    mm = obj._mm
+    del obj._hdr, obj._rec
+    try:
+        mm.close()
+    except BufferError:
+        pass  # a caller still holds a view of the records; the map goes with its last view
+
+
+class LiveFeedWriter:
+    """
+    Appends scored rows to the feed. Creates the file on first use; a different config_hash
+    resets it (same capacity: in place, readers see `generation` change; otherwise the file
+    is replaced atomically).
+    """
+
+    def __init__(self, path: Path, config_hash: str, capacity: int = DEFAULT_CAPACITY):
+        self.path = Path(path)
+        self.config_hash = config_hash.encode("ascii")
+        if len(self.config_hash) > HEADER_DTYPE["config_hash"].itemsize:
+            raise ValueError(f"config_hash too long: {config_hash!r}")
+
+        try:
+            self._mm, self._hdr, self._rec = _map(self.path, writable=True)
+        except (FileNotFoundError, FeedFormatError):
+            self._create(capacity, generation=0)
+        if int(self._hdr["capacity"][0]) != capacity:
+            self._create(capacity, generation=int(self._hdr["generation"][0]) + 1)
+        elif bytes(self._hdr["config_hash"][0]) != self.config_hash or self._hdr["seq"][0] & 1:
+            # Odd seq: a previous writer died mid-append, the ring may hold a torn record
+            self._reset()
+
+    def _create(self, capacity: int, generation: int) -> None:
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = FEED_MAGIC
+        header["schema_version"] = FEED_SCHEMA_VERSION
+        header["record_size"] = RECORD_DTYPE.itemsize
+        header["capacity"] = capacity
+        header["generation"] = generation
+        header["config_hash"] = self.config_hash
+
+        if hasattr(self, "_mm"):
+            _unmap(self)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(header.tobytes())
+            fh.truncate(HEADER_SIZE + capacity * RECORD_DTYPE.itemsize)
+        os.replace(tmp, self.path)
+        self._mm, self._hdr, self._rec = _map(self.path, writable=True)
+
+    def _reset(self) -> None:
+        h = self._hdr
+        h["seq"] = int(h["seq"][0]) | 1
+        h["count"] = 0
+        h["last_ts"] = 0
+        h["generation"] += 1
+        h["config_hash"] = self.config_hash
+        h["seq"] += 1
+
+    @property
+    def last_ts(self) -> pd.Timestamp | None:
+        if int(self._hdr["count"][0]) == 0:
+            return None
+        return pd.Timestamp(int(self._hdr["last_ts"][0]), tz="UTC")
+
+    def append(self, records: np.ndarray) -> int:
+        """Appends RECORD_DTYPE rows newer than the last record. Returns records written."""
+        records = np.asarray(records, dtype=RECORD_DTYPE)
+        if np.any(np.diff(records["ts"]) <= 0):
+            raise ValueError("Live feed records must have strictly increasing timestamps.")
+
+        h = self._hdr
+        capacity = len(self._rec)
+        lock = open(self.path, "rb") if fcntl else None
+        try:
+            if lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            count = int(h["count"][0])
+            if count:
+                records = records[records["ts"] > h["last_ts"][0]]
+            if len(records) == 0:
+                return 0
+            tail = records[-capacity:]  # older rows would be overwritten by this append anyway
+            slots = (count + len(records) - len(tail) + np.arange(len(tail))) % capacity
+            h["seq"] += 1
+            self._rec[slots] = tail
+            h["last_ts"] = tail["ts"][-1]
+            h["count"] = count + len(records)
+            h["seq"] += 1
+        finally:
+            if lock:
+                lock.close()
+        return len(records)
+
+    def append_frame(self, ts: pd.DataFrame, regime_edges) -> int:
+        """
+        Appends timeseries rows (UTC index, factor and RIM columns) newer than the feed.
+        `regime_edges` is one set of edges or one row per timeseries row (regimes.row_edges).
+        """
+        return self.append(to_records(ts, regime_edges))
+
+    def flush(self) -> None:
+        self._mm.flush()
+
+    def close(self) -> None:
+        self.flush()
+        _unmap(self)
+
+
+def to_records(ts: pd.DataFrame, regime_edges) -> np.ndarray:
+    idx = pd.DatetimeIndex(ts.index)
+    if idx.tz is None:
+        raise ValueError("Live feed requires a tz-aware (UTC) index.")
+    out = np.zeros(len(ts), dtype=RECORD_DTYPE)
+    out["ts"] = idx.tz_convert("UTC").as_unit("ns").asi8
+    for c in FEED_COLUMNS:
+        out[c] = ts[c].to_numpy(dtype=np.float32)
+    rim = ts["RIM_0_100"].to_numpy(dtype=float)
+    out["regime"] = np.where(np.isnan(rim), -1, regime_codes(rim, regime_edges))
+    return out
+
+
+class LiveFeedReader:
+    """
+    Zero-copy reader. Typical tailing loop:
+
+        feed = LiveFeedReader(path)
+        recs, pos = feed.read()            # everything currently in the ring
+        ...
+        recs, pos = feed.read(since=pos)   # only rows appended since
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._open()
+
+    def _open(self) -> None:
+        self._mm, self._hdr, self._rec = _map(self.path, writable=False)
+        self._ino = os.stat(self.path).st_ino
+
+    def refresh(self) -> bool:
+        """Re-maps the file if the writer replaced it (capacity change). Returns True if so."""
+        if os.stat(self.path).st_ino == self._ino:
+            return False
+        self.close()
+        self._open()
+        return True
+
+    @property
+    def seq(self) -> int:
+        """Write sequence number; changes (by 2) with every append. A cheap change probe."""
+        return int(self._hdr["seq"][0])
+
+    def header(self) -> dict:
+        h = self._hdr[0]
+        return {
+            "schema_version": int(h["schema_version"]),
+            "capacity": int(h["capacity"]),
+            "seq": int(h["seq"]),
+            "count": int(h["count"]),
+            "generation": int(h["generation"]),
+            "config_hash": bytes(h["config_hash"]).rstrip(b"\0").decode("ascii"),
+            "last_ts": pd.Timestamp(int(h["last_ts"]), tz="UTC") if int(h["count"]) else None,
+        }
+
+    @property
+    def records(self) -> np.ndarray:
+        """Raw ring (zero-copy, slot order, unsynchronized); prefer `read` for consistent rows."""
+        return self._rec
+
+    def read(
+        self, since: int = 0, max_records: int | None = None, timeout_s: float = 1.0
+    ) -> tuple[np.ndarray, int]:
+        """
+        Consistent copy of the records appended after position `since` (a previous `count`),
+        oldest first. Returns (records, count). Rows already overwritten by the ring are skipped;
+        after a reset (count < since) everything currently stored is returned.
+
+        Raises FeedBusyError if no consistent copy is possible within `timeout_s`, e.g. when a
+        writer died mid-append and left `seq` odd (the next writer to open the feed resets it).
+        """
+        capacity = len(self._rec)
+        h = self._hdr
+        deadline = time.perf_counter() + timeout_s
+        while True:
+            s1 = int(h["seq"][0])
+            if s1 & 1:
+                if time.perf_counter() >= deadline:
+                    raise FeedBusyError(
+                        f"Live feed {self.path} is mid-append (seq={s1}) after {timeout_s:g}s; "
+                        "the writer may have died. Reopening a writer resets the feed."
+                    )
+                time.sleep(0)
+                continue
+            count = int(h["count"][0])
+            lo = since if since <= count else 0
+            lo = max(lo, count - capacity)
+            if max_records is not None:
+                lo = max(lo, count - max_records)
+            out = self._rec[np.arange(lo, count) % capacity]
+            if int(h["seq"][0]) == s1:
+                return out, count
+
+    def latest(self) -> np.void | None:
+        """The newest record, or None when empty."""
+        out, _ = self.read(max_records=1)
+        return out[0] if len(out) else None
+
+    def wait(self, seq: int, timeout_s: float = 1.0, spin_s: float = 0.0) -> int:
+        """
+        Blocks until `seq` changes (polling the mapped header) or the timeout expires; returns
+        the current seq. spin_s=0 busy-polls for the lowest latency.
+        """
+        deadline = time.perf_counter() + timeout_s
+        while True:
+            cur = int(self._hdr["seq"][0])
+            if cur != seq and not cur & 1:
+                return cur
+            if time.perf_counter() >= deadline:
+                return cur
+            time.sleep(spin_s)
+
+    def close(self) -> None:
+        _unmap(self)
+
+
+def records_to_frame(records: np.ndarray) -> pd.DataFrame:
+    """Feed records as a DataFrame on a UTC index (copies)."""
+    idx = pd.DatetimeIndex(records["ts"].astype("datetime64[ns]")).tz_localize("UTC")
+    data = {c: records[c] for c in FEED_COLUMNS}
+    data["regime"] = records["regime"]
+    return pd.DataFrame(data, index=idx)
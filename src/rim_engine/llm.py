@@ -1,17 +1,240 @@
-"""LLM integration stubs (intentionally not enabled in v0.1.0)."""
+"""
+LLM integration: analyst/evaluator hooks backed by an HTTP model endpoint.
+
+Disabled unless an endpoint is configured (RIM_LLM_ENDPOINT). Requests for many panel
+contexts are issued concurrently under a semaphore, retried with exponential backoff,
+and cached on disk keyed by a hash of (role, context, config_hash), so re-running a
+report never re-queries unchanged days.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+from .util.errors import InvalidArgumentsError, RimEngineError
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class LLMClientConfig:
+    endpoint: str
+    max_concurrency: int = 8
+    max_retries: int = 4
+    backoff_s: float = 0.5
+    timeout_s: float = 60.0
+    cache_dir: Path | None = Path("outputs") / "llm_cache"
+    cache_max_bytes: int = 64 * 1024 * 1024
+
+    @staticmethod
+    def from_env() -> LLMClientConfig:
+        endpoint = os.getenv("RIM_LLM_ENDPOINT")
+        if not endpoint:
+            raise InvalidArgumentsError(
+                "LLM integration is disabled. Set RIM_LLM_ENDPOINT to enable it."
+            )
+        cache_dir = os.getenv("RIM_LLM_CACHE_DIR")
+        return LLMClientConfig(
+            endpoint=endpoint,
+            max_concurrency=int(os.getenv("RIM_LLM_MAX_CONCURRENCY", "8")),
+            cache_dir=Path(cache_dir) if cache_dir else LLMClientConfig.cache_dir,
+        )
+
+
+class LLMRequestError(RimEngineError):
+    """Raised when the model endpoint keeps failing after all retries."""
+
+
+# ======================================================
+# Disk cache
+# ======================================================
+
+
+def context_key(role: str, context: dict[str, Any], config_hash: str | None = None) -> str:
+    payload = {
+        "role": role,
+        "context": context,
+        "config_hash": config_hash or context.get("config_hash"),
+    }
+    s = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(s).hexdigest()
+
+
+class ResponseCache:
+    """
+    One JSON file per key. Hits refresh the file mtime; when the directory grows past
+    `max_bytes`, the least recently used entries are evicted.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        p = self._path(key)
+        try:
+            value = json.loads(p.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(p)
+        return value
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(value), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def evict(self) -> int:
+        """Evicts least recently used entries until the cache fits. Returns entries removed."""
+        entries = [(p.stat(), p) for p in self.root.glob("*/*.json")]
+        total = sum(st.st_size for st, _ in entries)
+        removed = 0
+        for st, p in sorted(entries, key=lambda e: e[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= st.st_size
+            removed += 1
+        return removed
+
+
+# ======================================================
+# Client
+# ======================================================
+
+
+class LLMClient:
+    def __init__(self, cfg: LLMClientConfig):
+        self.cfg = cfg
+        self.cache = ResponseCache(cfg.cache_dir, cfg.cache_max_bytes) if cfg.cache_dir else None
+        self.stats = {"requests": 0, "retries": 0, "cache_hits": 0}
+
+    def _post_blocking(self, payload: dict[str, Any]) -> dict[str, Any]:
+        req = urllib.request.Request(
+            self.cfg.endpoint,
+            data=json.dumps(payload, default=str).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(req, timeout=self.cfg.timeout_s) as resp:
+            body = resp.read()
+        try:
+            value = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise LLMRequestError(f"LLM endpoint returned a body that is not JSON: {e}") from e
+        # Only objects are valid responses (and only those get cached)
+        if not isinstance(value, dict):
+            raise LLMRequestError(
+                f"LLM endpoint returned JSON {type(value).__name__}, expected an object"
+            )
+        return value
+
+    async def _post(self, payload: dict[str, Any], sem: asyncio.Semaphore) -> dict[str, Any]:
+        for attempt in range(self.cfg.max_retries + 1):
+            delay = self.cfg.backoff_s * (2**attempt)
+            try:
+                async with sem:
+                    self.stats["requests"] += 1
+                    return await asyncio.to_thread(self._post_blocking, payload)
+            except urllib.error.HTTPError as e:
+                if e.code not in RETRYABLE_STATUS or attempt == self.cfg.max_retries:
+                    raise LLMRequestError(f"LLM endpoint returned HTTP {e.code}") from e
+                retry_after = e.headers.get("Retry-After") if e.headers else None
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                if attempt == self.cfg.max_retries:
+                    raise LLMRequestError(f"LLM endpoint unreachable: {e}") from e
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+        raise LLMRequestError("LLM retries exhausted")
+
+    async def acall_many(
+        self, role: str, contexts: list[dict[str, Any]], config_hash: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Returns one response per context, in order. Cached and duplicate contexts cost nothing.
+        """
+        keys = [context_key(role, c, config_hash) for c in contexts]
+        results: dict[str, dict[str, Any]] = {}
+        todo: dict[str, dict[str, Any]] = {}
+        for k, c in zip(keys, contexts, strict=True):
+            if k in results or k in todo:
+                continue
+            hit = self.cache.get(k) if self.cache else None
+            if hit is not None:
+                self.stats["cache_hits"] += 1
+                results[k] = hit
+            else:
+                todo[k] = c
+
+        sem = asyncio.Semaphore(self.cfg.max_concurrency)
+
+        async def fetch(k: str, c: dict[str, Any]) -> None:
+            value = await self._post({"role": role, "context": c}, sem)
+            # Cache as each response lands so a failure elsewhere keeps finished work
+            if self.cache:
+                self.cache.put(k, value)
+            results[k] = value
+
+        try:
+            await asyncio.gather(*(fetch(k, c) for k, c in todo.items()))
+        finally:
+            if self.cache and todo:
+                self.cache.evict()
+        return [results[k] for k in keys]
+
+    def call_many(
+        self, role: str, contexts: list[dict[str, Any]], config_hash: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Sync form of `acall_many`. Inside a running event loop (notebook, async service) the
+        batch runs on a worker thread with its own loop; prefer awaiting `acall_many` there.
+        """
+        coro = self.acall_many(role, contexts, config_hash)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+
+_CLIENT: LLMClient | None = None
+
+
+def _default_client() -> LLMClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = LLMClient(LLMClientConfig.from_env())
+    return _CLIENT
+
 
 def call_analyst_llm(context: dict[str, Any]) -> dict[str, Any]:
-    raise NotImplementedError(
-        "LLM integration is not enabled in v0.1.0. Implement in rim_engine/llm.py"
-    )
+    return _default_client().call_many("analyst", [context])[0]
 
 
 def call_evaluator_llm(context: dict[str, Any]) -> dict[str, Any]:
-    raise NotImplementedError(
-        "LLM integration is not enabled in v0.1.0. Implement in rim_engine/llm.py"
-    )
+    return _default_client().call_many("evaluator", [context])[0]
+
+
+def call_analyst_llm_batch(contexts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return _default_client().call_many("analyst", contexts)
+
+
+def call_evaluator_llm_batch(contexts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return _default_client().call_many("evaluator", contexts)
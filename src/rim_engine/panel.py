@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping
 from pathlib import Path
 
 import pandas as pd
 
+from .attribution import FACTOR_CODES
 from .config import DatasetPaths, RIMConfig
+from .digest import write_digest
+from .fetch import cache_stores, load_cached_inputs
 from .io import DataQualityReport, load_inputs
-from .processing import compute_factors
-from .regimes import map_score_to_regime
+from .livefeed import FEED_FILE, LiveFeedWriter
+from .processing import FactorOutputs, compute_factors
+from .regimes import REGIME_EDGE_COLUMNS, map_score_to_regime, row_edges, with_regime_edges
+from .registry import CORE_FACTORS, INPUTS, enabled_factors, input_keys
+from .rollups import RollupPyramid
+
+# Inputs of the core factors (what a default config ingests)
+INPUT_KEYS = input_keys(CORE_FACTORS)
 
 
 def build_risk_panel(
@@ -18,29 +28,47 @@ def build_risk_panel(
     if ts_nonan.empty:
         raise ValueError("No data available to build risk panel. Check ingestion and timestamps.")
 
-    latest = ts_nonan.iloc[-1]
-    rim = float(latest["RIM_0_100"])
-    reg = map_score_to_regime(rim, cfg)
-
     return {
         "zone": cfg.zone,
         "config_hash": cfg.config_hash(),
         "latest_timestamp": str(ts.index.max()),
-        "latest": {
-            "RIM_0_100": rim,
-            "regime": reg,
-            "factors_0_25": {
-                "PD": float(latest["PD_0_25"]),
-                "LD": float(latest["LD_0_25"]),
-                "RES": float(latest["RES_0_25"]),
-                "IMB": float(latest["IMB_0_25"]),
-            },
-        },
+        "latest": latest_block(ts_nonan.iloc[-1], cfg),
         "ingestion_reports": {k: v.to_dict() for k, v in reports.items()},
     }
 
 
+def latest_block(latest: Mapping, cfg: RIMConfig) -> dict:
+    """The panel's "latest" section from one timeseries row (a Series or a plain dict)."""
+    rim = float(latest["RIM_0_100"])
+    # Adaptive mode records the edges each row was scored against
+    edges = None
+    if REGIME_EDGE_COLUMNS[0] in latest:
+        edges = tuple(float(latest[c]) for c in REGIME_EDGE_COLUMNS)
+    block = {
+        "RIM_0_100": rim,
+        "regime": map_score_to_regime(rim, cfg, edges),
+        "factors_0_25": {
+            f: float(latest[f"{f}_0_25"]) for f in FACTOR_CODES if f"{f}_0_25" in latest
+        },
+    }
+    if edges is not None:
+        block["regime_edges"] = list(edges)
+
+    if "dominant_factor" in latest:
+        block["dominant_factor"] = FACTOR_CODES[int(latest["dominant_factor"])]
+        block["contributions_0_100"] = {
+            f: float(latest[f"{f}_contrib"]) for f in FACTOR_CODES if f"{f}_contrib" in latest
+        }
+
+    return block
+
+
 def panel_to_markdown(panel: dict) -> str:
+    lines = markdown_latest_lines(panel) + markdown_report_lines(panel["ingestion_reports"])
+    return "\n".join(lines)
+
+
+def markdown_latest_lines(panel: dict) -> list[str]:
     latest = panel["latest"]
     f = latest["factors_0_25"]
 
@@ -51,52 +79,120 @@ def panel_to_markdown(panel: dict) -> str:
         f"- Latest timestamp: `{panel['latest_timestamp']}`",
         f"- RIM score (0–100): **{latest['RIM_0_100']:.2f}**",
         f"- Regime: **{latest['regime']}**",
+    ]
+    if "regime_edges" in latest:
+        lines.append(
+            "- Regime edges (adaptive): " + ", ".join(f"{e:.2f}" for e in latest["regime_edges"])
+        )
+    lines += [
         "",
         "## Factor scores (0–25)",
         "",
-        f"- PD: {f['PD']:.2f}",
-        f"- LD: {f['LD']:.2f}",
-        f"- RES: {f['RES']:.2f}",
-        f"- IMB: {f['IMB']:.2f}",
+        *(f"- {k}: {v:.2f}" for k, v in f.items()),
         "",
-        "## Ingestion quality (summary)",
     ]
 
-    for name, rep in panel["ingestion_reports"].items():
+    if "dominant_factor" in latest:
+        c = latest["contributions_0_100"]
+        lines += [
+            "## Attribution (RIM points)",
+            "",
+            f"- Dominant factor: **{latest['dominant_factor']}**",
+            *(f"- {k}: {v:.2f}" for k, v in c.items()),
+            "",
+        ]
+    return lines
+
+
+def markdown_report_lines(reports: dict[str, dict]) -> list[str]:
+    lines = ["## Ingestion quality (summary)"]
+
+    for name, rep in reports.items():
         lines.append(
             f"- **{name}**: rows_raw={rep['n_rows_raw']}, rows_valid={rep['n_rows_valid']}, "
             f"sep='{rep['sep_used']}', time='{rep['time_col']}', value='{rep['value_col']}'"
         )
+        dropped = {k: v for k, v in rep.get("dropped", {}).items() if v}
+        if dropped or rep.get("gaps"):
+            lines.append(f"  - dropped={dropped or '{}'}, gap_runs={len(rep.get('gaps', []))}")
+        overlap = rep.get("overlap") or {}
+        if overlap and overlap["coverage"] < 1.0:
+            lines.append(
+                f"  - window_coverage={overlap['coverage']:.1%} "
+                f"({overlap['rows_in_window']}/{overlap['window_rows']} rows)"
+            )
 
     lines.append("")
-    return "\n".join(lines)
+    return lines
 
 
-def run_end_to_end(data_dir: Path, out_dir: Path, cfg: RIMConfig) -> tuple[pd.DataFrame, dict]:
-    paths = DatasetPaths.from_data_dir(data_dir)
+def score_inputs(inputs: pd.DataFrame, cfg: RIMConfig) -> pd.DataFrame:
+    """Scores unified inputs into the output timeseries (factors, RIM, attribution, edges)."""
+    return with_regime_edges(factors_to_timeseries(compute_factors(inputs, cfg)), cfg)
 
-    inputs, reports = load_inputs(
-        paths={
-            "pd": paths.power_csv,
-            "pd_neigh": paths.power_csv,
-            "ld": paths.load_csv,
-            "res": paths.res_actual_csv,
-        },
-        tz=cfg.tz,
-        freq=cfg.freq,
-    )
-
-    fo = compute_factors(inputs, cfg)
 
+def factors_to_timeseries(fo: FactorOutputs) -> pd.DataFrame:
     ts = fo.factor_scores_0_25.copy()
     ts["RIM_0_100"] = fo.rim_score_0_100
-    ts = ts.sort_index()
+    if fo.attribution is not None:
+        ts = ts.join(fo.attribution)
+    return ts.sort_index()
+
 
+def write_outputs(
+    ts: pd.DataFrame,
+    cfg: RIMConfig,
+    reports: dict[str, DataQualityReport],
+    out_dir: Path,
+    input_files: dict[str, Path] | None = None,
+) -> dict:
     out_dir.mkdir(parents=True, exist_ok=True)
     ts.to_csv(out_dir / "rim_timeseries.csv", index=True)
+    write_digest(ts, cfg, out_dir, input_files)
+    feed = LiveFeedWriter(out_dir / FEED_FILE, cfg.config_hash())
+    try:
+        feed.append_frame(ts, row_edges(ts, cfg))
+    finally:
+        feed.close()
+    RollupPyramid(out_dir / "rollups", cfg.freq).append(ts, cfg.config_hash())
 
     panel = build_risk_panel(ts, cfg, reports)
     (out_dir / "risk_panel.json").write_text(json.dumps(panel, indent=2), encoding="utf-8")
     (out_dir / "risk_panel.md").write_text(panel_to_markdown(panel), encoding="utf-8")
+    return panel
+
+
+def load_dataset(
+    data_dir: Path, cfg: RIMConfig, engine: str = "pandas"
+) -> tuple[pd.DataFrame, dict[str, DataQualityReport]]:
+    """Ingests the input files of a data dir (see DatasetPaths) the config's factors need."""
+    files = input_files(data_dir, config_input_keys(cfg))
+    return load_inputs(paths=files, tz=cfg.tz, freq=cfg.freq, engine=engine)
+
+
+def config_input_keys(cfg: RIMConfig) -> tuple[str, ...]:
+    return input_keys(enabled_factors(cfg.weights()))
+
+
+def input_files(data_dir: Path, keys: tuple[str, ...] = INPUT_KEYS) -> dict[str, Path]:
+    paths = DatasetPaths.from_data_dir(data_dir)
+    return {k: getattr(paths, INPUTS[k]) for k in keys}
+
+
+def run_end_to_end(
+    data_dir: Path, out_dir: Path, cfg: RIMConfig, engine: str = "pandas"
+) -> tuple[pd.DataFrame, dict]:
+    inputs, reports = load_dataset(data_dir, cfg, engine=engine)
+
+    ts = score_inputs(inputs, cfg)
+    panel = write_outputs(ts, cfg, reports, out_dir, input_files(data_dir, tuple(reports)))
+    return ts, panel
+
+
+def run_from_cache(cache_dir: Path, out_dir: Path, cfg: RIMConfig) -> tuple[pd.DataFrame, dict]:
+    """Same as `run_end_to_end`, reading inputs from the ingestion cache filled by `fetch`."""
+    inputs, reports = load_cached_inputs(cache_dir, keys=config_input_keys(cfg), freq=cfg.freq)
 
+    ts = score_inputs(inputs, cfg)
+    panel = write_outputs(ts, cfg, reports, out_dir, cache_stores(cache_dir, tuple(reports)))
     return ts, panel
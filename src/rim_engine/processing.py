@@ -5,7 +5,16 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
+from .attribution import attribute
 from .config import RIMConfig
+from .registry import (
+    CORE_FACTORS,
+    CORE_INPUTS,
+    DRIVERS,
+    FACTORS,
+    enabled_factors,
+    factor_drivers,
+)
 
 
 def rolling_zscore(x: pd.Series, window: int) -> pd.Series:
@@ -26,6 +35,7 @@ class FactorOutputs:
     factor_scores_0_25: pd.DataFrame
     rim_score_0_100: pd.Series
     drivers: pd.DataFrame
+    attribution: pd.DataFrame | None = None
 
 
 def _safe_align_to_index(s: pd.Series, idx: pd.DatetimeIndex) -> pd.Series:
@@ -34,110 +44,163 @@ def _safe_align_to_index(s: pd.Series, idx: pd.DatetimeIndex) -> pd.Series:
     return s.reindex(idx).ffill().bfill()
 
 
-def compute_factors(df_inputs: pd.DataFrame, cfg: RIMConfig) -> FactorOutputs:
+def res_overlap_sufficient(n_valid, n_rows):
+    """RES is used only if it covers enough of the core rows (works on scalars and arrays)."""
+    return n_valid >= np.maximum(5, np.asarray(n_rows) // 20)
+
+
+# ======================================================
+# Lazy factor graph over the registry
+# ======================================================
+
+
+class FactorGraph:
     """
-    Uses unified ingested inputs:
-      - pd, pd_neigh, ld, res
+    Evaluates registry drivers and z-scores on one unified input frame, lazily and memoized:
+    each driver and each (driver, window) z-score is computed at most once, however many
+    factors share it. `computed` lists the evaluated nodes in order.
 
     With your CURRENT sample data, RES is from 2023 and PD/LD are from 2025.
-    So we must not require full intersection across all columns, otherwise df becomes empty.
-
-    This function:
-      - builds PD & LD on PD/LD timeframe
-      - uses RES if it overlaps; otherwise sets RES factor neutral (12.5)
-      - uses IMB proxy from load ramp (until proper residual / imbalance sources are added)
+    So we must not require full intersection across all columns, otherwise df becomes empty:
+    the working index is the rows where the core inputs (pd, pd_neigh, ld) are all present,
+    other inputs are aligned to it. RES is used only if it overlaps enough (see
+    res_overlap_sufficient); use_res=True/False overrides that check.
     """
-    cfg.validate()
 
-    required = ["pd", "pd_neigh", "ld", "res"]
-    missing = [c for c in required if c not in df_inputs.columns]
-    if missing:
-        raise KeyError(
-            f"compute_factors missing required columns: {missing}. Have: {list(df_inputs.columns)}"
-        )
-
-    df = df_inputs.copy().sort_index()
-    df = df[~df.index.isna()]
-
-    # Coerce numeric (io.py already does robust parsing, but keep safe)
-    for c in required:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    # Determine a working index that does NOT force intersection with RES
-    # We use the union of pd/pd_neigh/ld timestamps, then drop rows where those are missing.
-    core = df[["pd", "pd_neigh", "ld"]].dropna()
-    if core.empty:
-        raise ValueError(
-            "compute_factors: core inputs (pd, pd_neigh, ld) are empty after coercion/dropna. "
-            "This indicates ingestion is still broken."
-        )
-    idx = core.index
-
-    # === PD factor (spread zscore) ===
-    spread = (core["pd"] - core["pd_neigh"]).astype(float)
-    pd_score = z_to_0_25(rolling_zscore(spread, cfg.zscore_window_h))
-
-    # === LD factor (level + ramp) ===
-    load = core["ld"].astype(float)
-    ramp_abs = load.diff().abs().fillna(0.0)
-    ld_z = 0.7 * rolling_zscore(load, cfg.zscore_window_h) + 0.3 * rolling_zscore(
-        ramp_abs, cfg.zscore_window_h
-    )
-    ld_score = z_to_0_25(ld_z)
-
-    # === RES factor ===
-    res_series = df["res"].dropna()
-    if res_series.empty:
-        # neutral if no res data at all
-        res_score = pd.Series(12.5, index=idx)
-        res_used = False
-    else:
-        # try to align res to idx; if no overlap, it becomes all NaN
-        res_aligned = res_series.reindex(idx)
-        if res_aligned.notna().sum() < max(5, len(idx) // 20):
-            # not enough overlap → neutral factor
-            res_score = pd.Series(12.5, index=idx)
-            res_used = False
-        else:
-            # use inverse res (low RES => higher risk)
-            inv_res = (
-                (1.0 / res_aligned.replace(0, np.nan))
-                .replace([np.inf, -np.inf], np.nan)
-                .ffill()
-                .bfill()
+    def __init__(self, df_inputs: pd.DataFrame, use_res: bool | None = None):
+        required = [*CORE_INPUTS, "res"]
+        missing = [c for c in required if c not in df_inputs.columns]
+        if missing:
+            raise KeyError(
+                f"compute_factors missing required columns: {missing}. "
+                f"Have: {list(df_inputs.columns)}"
             )
 
-            inv_res = inv_res.fillna(inv_res.median() if inv_res.notna().any() else 0.0)
-            res_score = z_to_0_25(rolling_zscore(inv_res, cfg.zscore_window_h))
-            res_used = True
+        # Inputs from io.load_inputs are already sorted, numeric and aligned to the core rows;
+        # only other frames pay for sorting and coercion
+        df = df_inputs
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        if df.index.hasnans:
+            df = df[~df.index.isna()]
+        core = df[list(CORE_INPUTS)]
+        if not all(pd.api.types.is_float_dtype(t) for t in core.dtypes):
+            core = core.apply(pd.to_numeric, errors="coerce")
+        core = core.dropna()
+        if core.empty:
+            raise ValueError(
+                "compute_factors: core inputs (pd, pd_neigh, ld) are empty after coercion/dropna. "
+                "This indicates ingestion is still broken."
+            )
+        self.index = core.index
+        self._df = df
+        self._core = core
+
+        res = pd.to_numeric(df["res"], errors="coerce").dropna()
+        # try to align res to the index; if no overlap, it becomes all NaN
+        res_aligned = res.reindex(self.index)
+        if use_res is None:
+            use_res = bool(res_overlap_sufficient(res_aligned.notna().sum(), len(self.index)))
+        self.res_used = bool(use_res) and not res.empty
+        self._res = res_aligned if self.res_used else pd.Series(np.nan, index=self.index)
+
+        self._memo: dict[tuple[str, int | None], pd.Series] = {}
+        self.computed: list[tuple[str, int | None]] = []
+
+    def input(self, key: str) -> pd.Series:
+        if key in CORE_INPUTS:
+            return self._core[key]
+        if key == "res":
+            return self._res
+        if key not in self._df.columns:
+            raise KeyError(
+                f"Input {key!r} is required by an enabled factor but missing. "
+                f"Have: {list(self._df.columns)}"
+            )
+        return pd.to_numeric(self._df[key], errors="coerce").reindex(self.index)
+
+    def driver(self, name: str) -> pd.Series:
+        key = (name, None)
+        if key not in self._memo:
+            spec = DRIVERS[name]
+            args = [self.driver(d) if d in DRIVERS else self.input(d) for d in spec.deps]
+            self._memo[key] = spec.fn(*args)
+            self.computed.append(key)
+        return self._memo[key]
+
+    def zscore(self, name: str, window: int) -> pd.Series:
+        key = (name, window)
+        if key not in self._memo:
+            self._memo[key] = rolling_zscore(self.driver(name), window)
+            self.computed.append(key)
+        return self._memo[key]
+
+    def drivers_frame(self, names: tuple[str, ...]) -> pd.DataFrame:
+        out = pd.DataFrame({n: self.driver(n) for n in names}, index=self.index)
+        out["res_used_flag"] = 1.0 if self.res_used else 0.0
+        return out
+
+    def factor_outputs(self, weights: dict[str, float], window: int) -> FactorOutputs:
+        names = factor_drivers(enabled_factors(weights))
+        driver_z = pd.DataFrame({n: self.zscore(n, window) for n in names}, index=self.index)
+        return aggregate_factors(self.drivers_frame(names), driver_z.sort_index(), weights)
+
+
+def compute_drivers(
+    df_inputs: pd.DataFrame, use_res: bool | None = None, factors: tuple[str, ...] = CORE_FACTORS
+) -> pd.DataFrame:
+    """
+    Raw driver series of the given factors on the core timeframe, plus `res_used_flag`.
+    They do not depend on the config, so one driver frame can feed every z-score window and
+    weight set (res_inv is NaN when RES is neutral).
+    """
+    return FactorGraph(df_inputs, use_res=use_res).drivers_frame(factor_drivers(factors))
 
-    # === IMB factor (proxy until proper imbalance sources) ===
-    # For now: treat sudden load ramps as balancing stress proxy.
-    imb_proxy = ramp_abs
-    imb_score = z_to_0_25(rolling_zscore(imb_proxy, cfg.zscore_window_h))
 
-    factors = pd.DataFrame(
-        {"PD_0_25": pd_score, "LD_0_25": ld_score, "RES_0_25": res_score, "IMB_0_25": imb_score},
-        index=idx,
+def driver_zscores(drivers: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Rolling z-scores of the drivers over `window` rows (res_inv is 0 when RES is neutral)."""
+    return pd.DataFrame(
+        {c: rolling_zscore(drivers[c], window) for c in drivers.columns if c in DRIVERS},
+        index=drivers.index,
     ).sort_index()
 
-    w = cfg.weights()
-    rim_0_100 = (
-        factors["PD_0_25"] * w["pd"]
-        + factors["LD_0_25"] * w["ld"]
-        + factors["RES_0_25"] * w["res"]
-        + factors["IMB_0_25"] * w["imb"]
-    ) * 4.0
-
-    drivers = pd.DataFrame(
-        {
-            "pd_spread": spread,
-            "ld_load": load,
-            "ld_ramp_abs": ramp_abs,
-            "res_used_flag": pd.Series(1.0 if res_used else 0.0, index=idx),
-            "imb_proxy": imb_proxy,
-        },
-        index=idx,
+
+def aggregate_factors(
+    drivers: pd.DataFrame, driver_z: pd.DataFrame, weights: dict[str, float]
+) -> FactorOutputs:
+    """Factor scores of the enabled factors (see registry.FACTORS) and their weighted RIM."""
+    codes = enabled_factors(weights)
+
+    scores = {}
+    for code in codes:
+        z = None
+        for name, loading in FACTORS[code].loadings:
+            term = loading * driver_z[name]
+            z = term if z is None else z + term
+        # A neutral factor (12.5) is the same as a zero z-score: z_to_0_25(0) == 12.5
+        scores[f"{code}_0_25"] = z_to_0_25(z)
+    factors = pd.DataFrame(scores, index=drivers.index).sort_index()
+
+    rim = None
+    for code in codes:
+        term = factors[f"{code}_0_25"] * weights[code.lower()]
+        rim = term if rim is None else rim + term
+
+    return FactorOutputs(
+        factor_scores_0_25=factors,
+        rim_score_0_100=rim * 4.0,
+        drivers=drivers,
+        attribution=attribute(factors, driver_z, weights),
     )
 
-    return FactorOutputs(factor_scores_0_25=factors, rim_score_0_100=rim_0_100, drivers=drivers)
+
+def compute_factors(df_inputs: pd.DataFrame, cfg: RIMConfig) -> FactorOutputs:
+    """
+    Drivers -> z-scores -> factor scores and RIM, evaluated lazily over the registry. The three
+    stages are also exposed separately so the scheduler can share drivers and z-scores between
+    configs.
+    """
+    cfg.validate()
+
+    graph = FactorGraph(df_inputs)
+    return graph.factor_outputs(cfg.weights(), cfg.periods(cfg.zscore_window_h))
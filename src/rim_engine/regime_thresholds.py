@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class RegimeThresholdsV1:
@@ -13,6 +15,10 @@ class RegimeThresholdsV1:
       - moderate: [25, 50)
       - elevated: [50, 75)
       - high:     [75, 100]
+
+    These are the fixed edges; with RIMConfig.regime_mode="adaptive" the edges are trailing
+    quantiles of RIM_0_100 instead (regimes.AdaptiveRegimeEdges), recorded per row in the
+    timeseries as regime_edge_1..3.
     """
 
     low_lt: float = 25.0
@@ -31,3 +37,13 @@ def derive_regime(rim_0_100: float, t: RegimeThresholdsV1 = THRESHOLDS_V1) -> st
     if rim_0_100 < t.elevated_lt:
         return "elevated"
     return "high"
+
+
+REGIME_LABELS_V1 = ("low", "moderate", "elevated", "high")
+
+
+def derive_regimes(rim_0_100: np.ndarray, t: RegimeThresholdsV1 = THRESHOLDS_V1) -> np.ndarray:
+    """Vectorized `derive_regime`: one label per value (NaN maps to "high", as in scalar form)."""
+    edges = np.array([t.low_lt, t.moderate_lt, t.elevated_lt])
+    codes = np.searchsorted(edges, np.asarray(rim_0_100, dtype=float), side="right")
+    return np.asarray(REGIME_LABELS_V1, dtype=object)[codes]
@@ -1,14 +1,145 @@
 from __future__ import annotations
 
+import numpy as np
+import pandas as pd
+
 from .config import RIMConfig
+from .sketch import SlidingDigest, TDigest
+
+REGIME_LABELS = (
+    "REGIME_1_NORMAL",
+    "REGIME_2_ATTENTION",
+    "REGIME_3_STRESSED",
+    "REGIME_4_SEVERE",
+)
+
+# Per-row edges recorded in the timeseries in adaptive mode
+REGIME_EDGE_COLUMNS = ("regime_edge_1", "regime_edge_2", "regime_edge_3")
 
 
-def map_score_to_regime(score_0_100: float, cfg: RIMConfig) -> str:
-    a, b, c = cfg.regime_edges
+def map_score_to_regime(
+    score_0_100: float, cfg: RIMConfig, edges: tuple[float, float, float] | None = None
+) -> str:
+    a, b, c = cfg.regime_edges if edges is None else edges
     if score_0_100 < a:
-        return "REGIME_1_NORMAL"
+        return REGIME_LABELS[0]
     if score_0_100 < b:
-        return "REGIME_2_ATTENTION"
+        return REGIME_LABELS[1]
     if score_0_100 < c:
-        return "REGIME_3_STRESSED"
-    return "REGIME_4_SEVERE"
+        return REGIME_LABELS[2]
+    return REGIME_LABELS[3]
+
+
+def regime_codes(scores_0_100: np.ndarray, edges) -> np.ndarray:
+    """
+    Vectorized `map_score_to_regime`: int8 index into REGIME_LABELS per score. `edges` is one
+    set of edges, or one row of edges per score (adaptive mode).
+    """
+    x = np.asarray(scores_0_100, dtype=float)
+    e = np.asarray(edges, dtype=float)
+    if e.ndim == 1:
+        return np.searchsorted(e, x, side="right").astype(np.int8)
+    # Number of edges at or below the score; NaN maps to the top regime, as with searchsorted
+    return np.where(np.isnan(x), e.shape[1], (x[:, None] >= e).sum(axis=1)).astype(np.int8)
+
+
+def row_edges(ts: pd.DataFrame, cfg: RIMConfig):
+    """Edges per row if the timeseries records them (adaptive mode), else cfg.regime_edges."""
+    if all(c in ts.columns for c in REGIME_EDGE_COLUMNS):
+        return ts[list(REGIME_EDGE_COLUMNS)].to_numpy(dtype=float)
+    return cfg.regime_edges
+
+
+# ======================================================
+# Adaptive regime edges (trailing quantiles of RIM_0_100)
+# ======================================================
+#
+# Time is cut into shards of regime_shard_h hours (aligned to the UTC epoch, so daily shards
+# start at UTC midnight). Each shard's scores go into a t-digest; the edges for every row of
+# shard s are quantiles of the merged digests of the regime_horizon_h / regime_shard_h shards
+# before s, pushed apart to at least regime_min_gap (a calm market can put all three quantiles
+# within a point of each other, which would merge regimes and defeat transition hysteresis).
+# Rows only depend on earlier shards, so batch history and incremental updates give the same
+# edges, and the per-row edges are written out for reproducibility.
+
+
+def separate_edges(edges: np.ndarray, min_gap: float) -> np.ndarray:
+    """
+    Increasing edges at least `min_gap` apart within [0, 100]: each edge is raised to min_gap
+    above the one below, then lowered to min_gap below the one above if the top exceeds 100.
+    """
+    e = np.asarray(edges, dtype=float).copy()
+    for k in range(1, len(e)):
+        e[k] = max(e[k], e[k - 1] + min_gap)
+    e[-1] = min(e[-1], 100.0)
+    for k in range(len(e) - 2, -1, -1):
+        e[k] = min(e[k], e[k + 1] - min_gap)
+    return e
+
+
+class AdaptiveRegimeEdges:
+    """Streaming edge estimator: feed rows in time order, get the edges used for each row."""
+
+    def __init__(self, cfg: RIMConfig, compression: float = 200.0):
+        cfg.validate()
+        self.quantiles = np.asarray(cfg.regime_quantiles, dtype=float)
+        self.fallback = np.asarray(cfg.regime_edges, dtype=float)
+        self.min_count = cfg.periods(cfg.regime_min_history_h)
+        self.min_gap = cfg.regime_min_gap
+        self._shard_ns = cfg.regime_shard_h * 3600 * 10**9
+        self._horizon = cfg.regime_horizon_h // cfg.regime_shard_h
+        self._compression = compression
+        self._window = SlidingDigest(compression)
+        self._shard: int | None = None
+        self._values: list[np.ndarray] = []  # scores of the current shard
+        self._edges = self.fallback
+
+    def _open_shard(self, shard: int) -> None:
+        if self._shard is not None:
+            values = np.concatenate(self._values) if self._values else np.empty(0)
+            self._window.push(self._shard, TDigest.from_values(values, self._compression))
+        self._shard, self._values = shard, []
+        self._window.evict_before(shard - self._horizon)
+        window = self._window.aggregate()
+        if window.count >= self.min_count:
+            self._edges = separate_edges(window.quantile(self.quantiles), self.min_gap)
+        else:
+            self._edges = self.fallback
+
+    def update(self, ts_ns: np.ndarray, rim_0_100: np.ndarray) -> np.ndarray:
+        """
+        Edges (n, 3) for rows with UTC ns timestamps `ts_ns` (increasing, newer than any row fed
+        before) and their scores. NaN scores get edges but do not enter the sketch.
+        """
+        ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        rim = np.asarray(rim_0_100, dtype=float)
+        out = np.empty((len(ts_ns), len(self.quantiles)))
+        shards = ts_ns // self._shard_ns
+        starts = np.flatnonzero(np.diff(shards, prepend=shards[:1] - 1)) if len(shards) else []
+        ends = np.append(starts[1:], len(shards)).astype(int) if len(shards) else []
+        for lo, hi in zip(starts, ends, strict=True):
+            shard = int(shards[lo])
+            if self._shard is not None and shard < self._shard:
+                raise ValueError("AdaptiveRegimeEdges rows must be fed in time order.")
+            if shard != self._shard:
+                self._open_shard(shard)
+            out[lo:hi] = self._edges
+            self._values.append(rim[lo:hi])
+        return out
+
+
+def adaptive_edges(index: pd.DatetimeIndex, rim_0_100: np.ndarray, cfg: RIMConfig) -> np.ndarray:
+    """Batch form of AdaptiveRegimeEdges over a whole (tz-aware, sorted) timeseries."""
+    keys = pd.DatetimeIndex(index).as_unit("ns").asi8
+    return AdaptiveRegimeEdges(cfg).update(keys, rim_0_100)
+
+
+def with_regime_edges(ts: pd.DataFrame, cfg: RIMConfig) -> pd.DataFrame:
+    """Adds the per-row REGIME_EDGE_COLUMNS in adaptive mode; fixed mode returns ts as is."""
+    if cfg.regime_mode == "fixed":
+        return ts
+    edges = adaptive_edges(ts.index, ts["RIM_0_100"].to_numpy(dtype=float), cfg)
+    out = ts.copy()
+    for j, c in enumerate(REGIME_EDGE_COLUMNS):
+        out[c] = edges[:, j]
+    return out
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# Factor / driver registry
+# ======================================================
+#
+# Factors and the drivers they are built from are declared here as nodes with dependencies;
+# processing.FactorGraph evaluates them lazily (only what the enabled factors need) and memoizes
+# every driver and every (driver, window) z-score, so an intermediate shared by several factors
+# (e.g. the load ramp behind LD and IMB) is computed once per run.
+#
+#   input   a column of the unified input frame (io.load_inputs), aligned to the core index
+#   driver  fn(*deps) -> Series, deps being inputs or other drivers
+#   factor  z_to_0_25(sum of loading × rolling z-score of a driver), weighted into RIM
+#
+# The core factors are always scored; optional ones only when their weight is non-zero.
+
+# input key -> DatasetPaths attribute of the file it is read from
+INPUTS: dict[str, str] = {
+    "pd": "power_csv",
+    "pd_neigh": "power_csv",
+    "ld": "load_csv",
+    "res": "res_actual_csv",
+    "rl": "load_csv",
+    "xb": "power_csv",
+}
+
+# Rows where all of these are present make up the output index
+CORE_INPUTS = ("pd", "pd_neigh", "ld")
+
+
+@dataclass(frozen=True)
+class DriverSpec:
+    name: str
+    deps: tuple[str, ...]
+    fn: Callable[..., pd.Series]
+
+
+@dataclass(frozen=True)
+class FactorSpec:
+    code: str
+    loadings: tuple[tuple[str, float], ...]  # (driver, loading on its z-score)
+    optional: bool = False
+
+
+DRIVERS: dict[str, DriverSpec] = {}
+
+
+def driver(name: str, *deps: str) -> Callable:
+    """Registers fn(*deps) as driver `name`."""
+
+    def register(fn: Callable[..., pd.Series]) -> Callable[..., pd.Series]:
+        DRIVERS[name] = DriverSpec(name, deps, fn)
+        return fn
+
+    return register
+
+
+@driver("pd_spread", "pd", "pd_neigh")
+def _pd_spread(price: pd.Series, neigh: pd.Series) -> pd.Series:
+    return (price - neigh).astype(float)
+
+
+@driver("ld_load", "ld")
+def _ld_load(load: pd.Series) -> pd.Series:
+    return load.astype(float)
+
+
+@driver("ld_ramp_abs", "ld_load")
+def _ld_ramp_abs(load: pd.Series) -> pd.Series:
+    return load.diff().abs().fillna(0.0)
+
+
+@driver("res_inv", "res")
+def _res_inv(res: pd.Series) -> pd.Series:
+    # Inverse RES (low RES => higher risk); all NaN when RES is not used, which z-scores to 0
+    if res.isna().all():
+        return res.astype(float)
+    inv = (1.0 / res.replace(0, np.nan)).replace([np.inf, -np.inf], np.nan).ffill().bfill()
+    return inv.fillna(inv.median() if inv.notna().any() else 0.0)
+
+
+@driver("rl_load", "rl")
+def _rl_load(residual: pd.Series) -> pd.Series:
+    return residual.astype(float)
+
+
+@driver("nlr_abs", "ld_load", "res")
+def _nlr_abs(load: pd.Series, res: pd.Series) -> pd.Series:
+    # |Δload − ΔRES|; hours without a RES step (gaps, RES unused) fall back to the load ramp
+    return (load.diff() - res.diff().fillna(0.0)).abs().fillna(0.0)
+
+
+@driver("xb_spread", "xb")
+def _xb_spread(spread: pd.Series) -> pd.Series:
+    return spread.astype(float)
+
+
+FACTORS: dict[str, FactorSpec] = {
+    f.code: f
+    for f in (
+        FactorSpec("PD", (("pd_spread", 1.0),)),
+        FactorSpec("LD", (("ld_load", 0.7), ("ld_ramp_abs", 0.3))),
+        FactorSpec("RES", (("res_inv", 1.0),)),
+        # Proxy until proper imbalance sources: sudden load ramps as balancing stress
+        FactorSpec("IMB", (("ld_ramp_abs", 1.0),)),
+        FactorSpec("RL", (("rl_load", 1.0),), optional=True),
+        FactorSpec("NLR", (("nlr_abs", 1.0),), optional=True),
+        FactorSpec("XB", (("xb_spread", 1.0),), optional=True),
+    )
+}
+
+CORE_FACTORS = tuple(c for c, f in FACTORS.items() if not f.optional)
+
+
+def enabled_factors(weights: dict[str, float]) -> tuple[str, ...]:
+    """Factor codes scored for a weight dict (RIMConfig.weights()), in registry order."""
+    unknown = sorted(set(weights) - {c.lower() for c in FACTORS})
+    if unknown:
+        raise KeyError(f"Weights for unregistered factors: {unknown}")
+    return tuple(c for c in FACTORS if c.lower() in weights)
+
+
+def factor_drivers(codes: tuple[str, ...]) -> tuple[str, ...]:
+    """Drivers the given factors load on, in order of first use."""
+    return tuple(dict.fromkeys(d for c in codes for d, _ in FACTORS[c].loadings))
+
+
+def input_keys(codes: tuple[str, ...]) -> tuple[str, ...]:
+    """Input columns needed to score the given factors (core inputs first), in INPUTS order."""
+    needed = set(CORE_INPUTS)
+    stack = list(factor_drivers(codes))
+    while stack:
+        name = stack.pop()
+        for dep in DRIVERS[name].deps:
+            if dep in DRIVERS:
+                stack.append(dep)
+            else:
+                needed.add(dep)
+    return tuple(k for k in INPUTS if k in needed)
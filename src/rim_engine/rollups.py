@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .colstore import ColumnStore
+
+# ======================================================
+# Multi-resolution aggregate pyramid
+# ======================================================
+#
+# The base level holds factor scores and RIM at the scoring frequency (e.g. 15min).
+# Coarser levels hold mean/min/max/last per bucket. Appends only touch the buckets
+# that can change: everything from the start of the bucket containing the first
+# new or revised base row is recomputed from the stored base level, the rest is left as-is.
+
+ROLLUP_COLUMNS = ("PD_0_25", "LD_0_25", "RES_0_25", "IMB_0_25", "RIM_0_100")
+ROLLUP_STATS = ("mean", "min", "max", "last")
+ROLLUP_LEVELS = ("h", "D")
+
+
+def rollup(base: pd.DataFrame, level: str) -> pd.DataFrame:
+    """
+    Aggregates base rows into `level` buckets (UTC, left-closed, left-labelled).
+
+    Output columns are `<column>__<stat>` plus `n_rows`; empty buckets are dropped.
+    """
+    cols = [c for c in ROLLUP_COLUMNS if c in base.columns]
+    r = base[cols].resample(level)
+    parts = {stat: getattr(r, stat)() for stat in ROLLUP_STATS}
+
+    out = pd.DataFrame(index=parts["mean"].index)
+    for c in cols:
+        for stat in ROLLUP_STATS:
+            out[f"{c}__{stat}"] = parts[stat][c].astype("float64")
+    out["n_rows"] = r.size().astype("int64")
+    return out[out["n_rows"] > 0]
+
+
+def _freq_td(freq: str) -> pd.Timedelta:
+    t0 = pd.Timestamp(0)
+    return (t0 + pd.tseries.frequencies.to_offset(freq)) - t0
+
+
+def _coarser_than(level: str, base_freq: str) -> bool:
+    return _freq_td(level) > _freq_td(base_freq)
+
+
+class RollupPyramid:
+    """
+    Appendable base level plus pre-aggregated coarser levels, stored columnar on disk.
+
+    Levels not coarser than `base_freq` are skipped (an hourly base has no hourly rollup).
+    """
+
+    def __init__(self, root: Path, base_freq: str, levels: tuple[str, ...] = ROLLUP_LEVELS):
+        self.root = Path(root)
+        self.base_freq = base_freq
+        self.levels = tuple(lv for lv in levels if _coarser_than(lv, base_freq))
+        self.base = ColumnStore(self.root / "base")
+        self._stores = {lv: ColumnStore(self.root / f"level_{lv}") for lv in self.levels}
+
+    def _reset_if_stale(self, config_hash: str | None) -> None:
+        meta = self.base.user_meta()
+        stale = meta and (
+            meta.get("config_hash") != config_hash or meta.get("base_freq") != self.base_freq
+        )
+        if stale:
+            self.base.reset()
+            for s in self._stores.values():
+                s.reset()
+        if not meta or stale:
+            self.base.set_user_meta(config_hash=config_hash, base_freq=self.base_freq)
+
+    def append(self, ts: pd.DataFrame, config_hash: str | None = None) -> dict[str, int]:
+        """
+        Appends base rows and refreshes affected buckets. Stored rows the incoming frame
+        revises (a different value, or a row present on only one side, within the frame's
+        range) are dropped from the first such row on and rewritten from the frame.
+
+        Returns the number of rows written per level (`"base"` included) and the number of
+        stored base rows that were replaced (`"revised"`).
+        A different `config_hash` than the stored one starts the pyramid afresh.
+        """
+        self._reset_if_stale(config_hash)
+
+        cols = [c for c in ROLLUP_COLUMNS if c in ts.columns]
+        # NaN is kept per column (warm-up, missing inputs); only rows without any value go
+        frame = ts[cols].dropna(how="all").astype("float64")
+        first_new = self._first_revised(frame)
+        revised = 0
+        if first_new is not None:
+            revised = len(self.base) - self.base.truncate_from(first_new)
+        prev_last = self.base.last_ts()
+        written = {"base": self.base.append(frame), "revised": revised}
+        if written["base"] == 0 and not revised:
+            return written | {lv: 0 for lv in self.levels}
+
+        if first_new is None and prev_last is not None:
+            first_new = frame.index[frame.index > prev_last][0]
+        for lv, store in self._stores.items():
+            if first_new is None:
+                bucket_start = None
+            else:
+                bucket_start = first_new.floor(lv)
+                store.truncate_from(bucket_start)
+            agg = rollup(self.base.read(start=bucket_start), lv)
+            written[lv] = store.append(agg)
+        return written
+
+    def _first_revised(self, frame: pd.DataFrame) -> pd.Timestamp | None:
+        """First timestamp where `frame` disagrees with the stored base, None if it does not."""
+        last = self.base.last_ts()
+        if frame.empty or last is None or frame.index[0] > last:
+            return None
+        stored = self.base.read(start=frame.index[0], end=min(frame.index[-1], last))
+        incoming = frame.loc[: stored.index[-1] if len(stored) else last]
+        union = incoming.index.union(stored.index)
+        a = incoming.reindex(union).to_numpy()
+        b = stored.reindex(union, columns=incoming.columns).to_numpy()
+        same = ((a == b) | (np.isnan(a) & np.isnan(b))).all(axis=1)
+        same &= union.isin(incoming.index) & union.isin(stored.index)
+        diff = np.flatnonzero(~same)
+        return union[diff[0]] if len(diff) else None
+
+    def read(
+        self,
+        level: str,
+        start: pd.Timestamp | str | None = None,
+        end: pd.Timestamp | str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Reads `level` ("base" or one of `self.levels`) for start <= ts <= end."""
+        if level == "base":
+            return self.base.read(start, end, columns)
+        if level not in self._stores:
+            raise KeyError(f"Unknown rollup level {level!r}. Have: ['base', *{list(self.levels)}]")
+        return self._stores[level].read(start, end, columns)
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .align import align_inputs
+from .config import RIMConfig
+from .io import ENGINES, load_input
+from .panel import (
+    config_input_keys,
+    factors_to_timeseries,
+    input_files,
+    write_outputs,
+)
+from .processing import aggregate_factors, compute_drivers, driver_zscores
+from .regimes import with_regime_edges
+from .registry import CORE_INPUTS, enabled_factors
+from .util.errors import InvalidArgumentsError
+
+# ======================================================
+# Multi-job scheduler
+# ======================================================
+#
+# Every job (zone / config / window / output dir) is the same pipeline:
+#   ingest (per input series) -> drivers -> z-scores -> aggregate -> output
+# Jobs are expanded into one DAG whose node keys hold exactly the inputs that determine the
+# node's result, so shared work is computed once:
+#   ingest     file + series key + tz + freq + engine
+#   drivers    the ingest nodes it combines + the enabled factors
+#   zscore     drivers + window length in rows
+#   aggregate  zscore + factor weights
+#   output     the job (regime_edges, zone and window only affect the written panel)
+# Intermediate results live in the parent process and are freed as soon as their last
+# consumer has run; a memory budget caps how much may be held or in flight at once.
+
+# Estimated result size relative to the node's inputs (before the actual size is known)
+_SIZE_FACTOR = {"drivers": 1.5, "zscore": 0.7, "aggregate": 2.5, "output": 0.0}
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    name: str
+    cfg: RIMConfig
+    data_dir: Path
+    out_dir: Path
+    start: pd.Timestamp | None = None
+    end: pd.Timestamp | None = None
+    engine: str = "pandas"
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> JobSpec:
+        """
+        {"name": "prod", "data_dir": "data", "out_dir": "outputs/prod",
+         "config": {"w_pd": 0.3, "regime_edges": [25, 50, 75], ...},
+         "window": {"start": "2025-01-01", "end": null}, "engine": "pandas"}
+        """
+        known = {f.name for f in fields(RIMConfig)}
+        raw_cfg = dict(d.get("config", {}))
+        unknown = sorted(set(raw_cfg) - known)
+        if unknown:
+            raise InvalidArgumentsError(f"Job {d.get('name')!r}: unknown config keys {unknown}")
+        if "regime_edges" in raw_cfg:
+            raw_cfg["regime_edges"] = tuple(float(e) for e in raw_cfg["regime_edges"])
+        if "regime_quantiles" in raw_cfg:
+            raw_cfg["regime_quantiles"] = tuple(float(q) for q in raw_cfg["regime_quantiles"])
+        cfg = RIMConfig(**raw_cfg)
+        try:
+            cfg.validate()
+        except ValueError as e:
+            raise InvalidArgumentsError(f"Job {d.get('name')!r}: {e}") from e
+
+        window = d.get("window") or {}
+        engine = d.get("engine", "pandas")
+        if engine not in ENGINES:
+            raise InvalidArgumentsError(f"Job {d.get('name')!r}: engine must be one of {ENGINES}")
+        try:
+            name, out_dir = str(d["name"]), Path(d["out_dir"])
+        except KeyError as e:
+            raise InvalidArgumentsError(f"Job spec is missing {e}") from e
+        return JobSpec(
+            name=name,
+            cfg=cfg,
+            data_dir=Path(d.get("data_dir", "data")),
+            out_dir=out_dir,
+            start=_utc(window.get("start")),
+            end=_utc(window.get("end")),
+            engine=engine,
+        )
+
+
+def _utc(value: str | None) -> pd.Timestamp | None:
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def load_job_specs(path: Path) -> list[JobSpec]:
+    """Reads a job-spec file: {"jobs": [<JobSpec dict>, ...]}. Relative paths are kept as-is."""
+    try:
+        doc = json.loads(Path(path).read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise InvalidArgumentsError(f"Invalid job spec {path}: {e}") from e
+    jobs = [JobSpec.from_dict(d) for d in doc.get("jobs", [])]
+    if not jobs:
+        raise InvalidArgumentsError(f"Job spec {path} defines no jobs")
+    for attr in ("name", "out_dir"):
+        values = [getattr(j, attr) for j in jobs]
+        dupes = sorted({str(v) for v in values if values.count(v) > 1})
+        if dupes:
+            raise InvalidArgumentsError(f"Job {attr} must be unique. Duplicated: {dupes}")
+    return jobs
+
+
+# ======================================================
+# Node functions (module level so worker processes can unpickle them)
+# ======================================================
+
+
+def _drivers(
+    factors: tuple[str, ...], keys: tuple[str, ...], *ingested: pd.DataFrame
+) -> tuple[pd.DataFrame, dict[str, dict]]:
+    """Drivers plus each input's overlap with the working index (as io.combine_inputs)."""
+    inputs, overlap = align_inputs(dict(zip(keys, ingested, strict=True)), CORE_INPUTS)
+    drivers = compute_drivers(inputs, factors=factors)
+    return drivers, {k: stats.to_dict() for k, stats in overlap.items()}
+
+
+def _zscores(window: int, drivers: pd.DataFrame) -> pd.DataFrame:
+    return driver_zscores(drivers, window)
+
+
+def _aggregate(weights: dict[str, float], drivers: pd.DataFrame, driver_z: pd.DataFrame):
+    return factors_to_timeseries(aggregate_factors(drivers, driver_z, weights))
+
+
+def _output(job: JobSpec, ts: pd.DataFrame, overlap: dict[str, dict], *reports) -> dict:
+    # Adaptive edges need the full history, so they are derived before the start/end cut
+    ts = with_regime_edges(ts, job.cfg)
+    if job.start is not None:
+        ts = ts.loc[ts.index >= job.start]
+    if job.end is not None:
+        ts = ts.loc[ts.index <= job.end]
+    keys = config_input_keys(job.cfg)
+    panel = write_outputs(
+        ts,
+        job.cfg,
+        # Ingest nodes are shared between jobs: attach the overlap to copies of their reports
+        {k: replace(rep, overlap=overlap.get(k, {})) for k, rep in zip(keys, reports, strict=True)},
+        job.out_dir,
+        input_files(job.data_dir, keys),
+    )
+    return {"rows": len(ts), "latest_timestamp": panel["latest_timestamp"], **panel["latest"]}
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def _run_node(fn: Callable, args: tuple) -> tuple[Any, float, int]:
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0, _nbytes(result)
+
+
+# ======================================================
+# DAG
+# ======================================================
+
+NodeKey = tuple
+
+
+@dataclass
+class Node:
+    key: NodeKey
+    fn: Callable
+    args: tuple  # static leading arguments
+    deps: tuple[tuple[NodeKey, int | None], ...]  # (node, tuple element or None for all)
+    est_bytes: int = 0
+    jobs: list[str] = field(default_factory=list)
+
+    @property
+    def kind(self) -> str:
+        return self.key[0]
+
+
+def build_dag(jobs: list[JobSpec]) -> dict[NodeKey, Node]:
+    """Expands jobs into a deduplicated DAG; dict order is a valid topological order."""
+    dag: dict[NodeKey, Node] = {}
+
+    def add(key: NodeKey, fn: Callable, args: tuple, deps: tuple, job: str, est: int = 0):
+        node = dag.setdefault(key, Node(key, fn, args, deps, est))
+        node.jobs.append(job)
+        return key
+
+    for job in jobs:
+        cfg = job.cfg
+        keys = config_input_keys(cfg)
+        files = input_files(job.data_dir, keys)
+        ingest = []
+        for k in keys:
+            p = Path(files[k]).resolve()
+            if not p.exists():
+                raise FileNotFoundError(f"Job {job.name!r}: missing input {p}")
+            # Parsed series are far smaller than the CSV text; the file size is an upper bound
+            ingest.append(
+                add(
+                    ("ingest", k, str(p), cfg.tz, cfg.freq, job.engine),
+                    load_input,
+                    (k, p, cfg.tz, cfg.freq, job.engine),
+                    (),
+                    job.name,
+                    p.stat().st_size,
+                )
+            )
+        factors = enabled_factors(cfg.weights())
+        drivers = add(
+            ("drivers", factors, *ingest),
+            _drivers,
+            (factors, keys),
+            tuple((k, 0) for k in ingest),
+            job.name,
+        )
+        window = cfg.periods(cfg.zscore_window_h)
+        zscore = add(("zscore", drivers, window), _zscores, (window,), ((drivers, 0),), job.name)
+        w = cfg.weights()
+        agg = add(
+            ("aggregate", zscore, tuple(sorted(w.items()))),
+            _aggregate,
+            (w,),
+            ((drivers, 0), (zscore, None)),
+            job.name,
+        )
+        add(
+            ("output", job.name),
+            _output,
+            (job,),
+            ((agg, None), (drivers, 1), *((k, 1) for k in ingest)),
+            job.name,
+        )
+    return dag
+
+
+# ======================================================
+# Execution
+# ======================================================
+
+
+@dataclass
+class JobReport:
+    name: str
+    out_dir: str
+    wall_s: float = 0.0  # from scheduler start until the job's outputs were written
+    compute_s: float = 0.0  # node time spent on this job's behalf (shared nodes: first job)
+    nodes: int = 0
+    cache_hits: int = 0  # nodes reused from an earlier job instead of recomputed
+    latest: dict = field(default_factory=dict)
+
+
+@dataclass
+class ScheduleReport:
+    jobs: dict[str, JobReport]
+    nodes_total: int
+    nodes_requested: int
+    wall_s: float
+    peak_bytes: int
+    memory_budget_bytes: int | None
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["jobs"] = [asdict(j) for j in self.jobs.values()]
+        return d
+
+
+class _InlineExecutor:
+    """Executor stand-in running each node in the calling process (workers=0)."""
+
+    def submit(self, fn: Callable, *args) -> Future:
+        fut: Future = Future()
+        try:
+            fut.set_result(fn(*args))
+        except BaseException as e:
+            fut.set_exception(e)
+        return fut
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        pass
+
+
+def run_schedule(
+    jobs: list[JobSpec], workers: int = 0, memory_budget_bytes: int | None = None
+) -> ScheduleReport:
+    """
+    Executes all jobs over one shared DAG.
+
+    workers=0 runs nodes in-process; otherwise on a process pool of that size. A node is only
+    started while held results + in-flight estimates + its own estimate fit the memory budget
+    (a node always runs when nothing else is in flight, so an over-budget node cannot stall).
+    """
+    if workers < 0:
+        raise InvalidArgumentsError(f"workers must be >= 0. Got {workers}")
+    t_start = time.perf_counter()
+    dag = build_dag(jobs)
+
+    consumers: dict[NodeKey, int] = {k: 0 for k in dag}
+    part_consumers: dict[tuple[NodeKey, int | None], int] = {}
+    children: dict[NodeKey, list[NodeKey]] = {k: [] for k in dag}
+    for node in dag.values():
+        for dep, part in node.deps:
+            consumers[dep] += 1
+            part_consumers[dep, part] = part_consumers.get((dep, part), 0) + 1
+        for dep in {d for d, _ in node.deps}:
+            children[dep].append(node.key)
+    waiting = {k: len({d for d, _ in n.deps}) for k, n in dag.items()}
+
+    results: dict[NodeKey, Any] = {}
+    sizes: dict[NodeKey, int] = {}  # result size as produced, drives child estimates
+    held: dict[NodeKey, int] = {}  # bytes currently held per result
+    ready = [k for k, n in waiting.items() if n == 0]
+    running: dict[Future, tuple[NodeKey, int]] = {}
+    in_flight_bytes = 0
+    peak = 0
+
+    reports = {j.name: JobReport(name=j.name, out_dir=str(j.out_dir)) for j in jobs}
+    for node in dag.values():
+        owner, *others = node.jobs
+        reports[owner].nodes += 1
+        for name in others:
+            reports[name].nodes += 1
+            reports[name].cache_hits += 1
+
+    def estimate(node: Node) -> int:
+        if not node.deps:
+            return node.est_bytes
+        return int(_SIZE_FACTOR[node.kind] * sum(sizes[d] for d in {d for d, _ in node.deps}))
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers else _InlineExecutor()
+    slots = max(workers, 1)
+    try:
+        while ready or running:
+            for key in list(ready):
+                if len(running) >= slots:
+                    break
+                node = dag[key]
+                est = estimate(node)
+                if (
+                    running
+                    and memory_budget_bytes is not None
+                    and sum(held.values()) + in_flight_bytes + est > memory_budget_bytes
+                ):
+                    continue
+                args = node.args + tuple(
+                    results[d] if part is None else results[d][part] for d, part in node.deps
+                )
+                ready.remove(key)
+                in_flight_bytes += est
+                running[executor.submit(_run_node, node.fn, args)] = (key, est)
+                peak = max(peak, sum(held.values()) + in_flight_bytes)
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                key, est = running.pop(fut)
+                node = dag[key]
+                in_flight_bytes -= est
+                value, seconds, nbytes = fut.result()
+
+                reports[node.jobs[0]].compute_s += seconds
+                if node.kind == "output":
+                    rep = reports[key[1]]
+                    rep.latest = value
+                    rep.wall_s = time.perf_counter() - t_start
+                else:
+                    results[key], sizes[key], held[key] = value, nbytes, nbytes
+                    peak = max(peak, sum(held.values()) + in_flight_bytes)
+
+                # Free dependencies once their last consumer has finished
+                for dep, part in node.deps:
+                    consumers[dep] -= 1
+                    part_consumers[dep, part] -= 1
+                    if consumers[dep] == 0:
+                        results.pop(dep, None)
+                        held.pop(dep, None)
+                    elif (
+                        part is not None
+                        and part_consumers[dep, part] == 0
+                        and not part_consumers.get((dep, None))
+                    ):
+                        # Nobody needs this element any more (e.g. ingested frames once the
+                        # drivers are built); keep the rest (the quality reports)
+                        value = list(results[dep])
+                        value[part] = None
+                        results[dep] = tuple(value)
+                        held[dep] = _nbytes(results[dep])
+                for child in children[key]:
+                    waiting[child] -= 1
+                    if waiting[child] == 0:
+                        ready.append(child)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return ScheduleReport(
+        jobs=reports,
+        nodes_total=len(dag),
+        nodes_requested=sum(len(n.jobs) for n in dag.values()),
+        wall_s=time.perf_counter() - t_start,
+        peak_bytes=peak,
+        memory_budget_bytes=memory_budget_bytes,
+    )
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import numpy as np
+
+# ======================================================
+# Mergeable quantile sketch (t-digest)
+# ======================================================
+#
+# A merging t-digest (Dunning & Ertl) with the k1 scale function k(q) = δ/2π · asin(2q − 1).
+# Compression is one vectorized pass: centroids are sorted by mean and those whose midpoints
+# fall into the same unit interval of k are merged. Centroids stay small near the tails, the
+# digest holds at most ~δ/2 of them, and merging digests is the same pass over their union,
+# so results are deterministic for a given merge order.
+
+
+class TDigest:
+    def __init__(self, compression: float = 200.0):
+        if compression < 10:
+            raise ValueError(f"compression must be >= 10. Got {compression}")
+        self.compression = float(compression)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, compression: float = 200.0) -> TDigest:
+        d = cls(compression)
+        d.update(values)
+        return d
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def __len__(self) -> int:
+        """Number of centroids."""
+        return len(self.means)
+
+    def update(self, values: np.ndarray) -> None:
+        """Adds values (NaN ignored) in one compression pass."""
+        v = np.asarray(values, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            return
+        self._set(
+            np.concatenate((self.means, v)),
+            np.concatenate((self.weights, np.ones(len(v)))),
+            min(self.min, v.min()),
+            max(self.max, v.max()),
+        )
+
+    def merge(self, *others: TDigest) -> TDigest:
+        """A new digest of this one and `others` (inputs are not modified)."""
+        parts = [self, *others]
+        out = TDigest(self.compression)
+        means = np.concatenate([p.means for p in parts])
+        if len(means):
+            out._set(
+                means,
+                np.concatenate([p.weights for p in parts]),
+                min(p.min for p in parts),
+                max(p.max for p in parts),
+            )
+        return out
+
+    def _set(self, means: np.ndarray, weights: np.ndarray, lo: float, hi: float) -> None:
+        order = np.argsort(means, kind="stable")
+        m, w = means[order], weights[order]
+        cum = np.cumsum(w)
+        q = (cum - w / 2) / cum[-1]
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        new = np.empty(len(k), dtype=bool)
+        new[0], new[1:] = True, k[1:] != k[:-1]
+        starts = np.flatnonzero(new)
+        w_out = np.add.reduceat(w, starts)
+        self.means = np.add.reduceat(m * w, starts) / w_out
+        self.weights = w_out
+        self.min, self.max = float(lo), float(hi)
+
+    def quantile(self, q) -> np.ndarray:
+        """Estimated quantiles (NaN when empty), interpolating between centroid centers."""
+        q = np.asarray(q, dtype=float)
+        if not len(self.means):
+            return np.full(q.shape, np.nan)
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        xp = np.concatenate(([0.0], centers, [total]))
+        fp = np.concatenate(([self.min], self.means, [self.max]))
+        return np.interp(q * total, xp, fp)
+
+
+class SlidingDigest:
+    """
+    Digest over a sliding window of shards (e.g. one per day), keyed by increasing shard ids.
+    Two-stack aggregation: every shard is merged a constant number of times on its way
+    through the window, so push, evict and aggregate cost amortized O(1) merges.
+    """
+
+    def __init__(self, compression: float = 200.0):
+        self.compression = compression
+        self._front: list[tuple[int, TDigest]] = []  # oldest last; digest of it and newer front
+        self._back: list[tuple[int, TDigest]] = []  # oldest first
+        self._back_agg = TDigest(compression)
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._back)
+
+    def push(self, shard_id: int, digest: TDigest) -> None:
+        self._back.append((shard_id, digest))
+        self._back_agg = self._back_agg.merge(digest)
+
+    def evict_before(self, shard_id: int) -> None:
+        """Drops shards with id < shard_id."""
+        while True:
+            if not self._front:
+                if not self._back or self._back[0][0] >= shard_id:
+                    return
+                agg = TDigest(self.compression)
+                for sid, d in reversed(self._back):
+                    agg = d.merge(agg)
+                    self._front.append((sid, agg))
+                self._back, self._back_agg = [], TDigest(self.compression)
+            if self._front[-1][0] >= shard_id:
+                return
+            self._front.pop()
+
+    def aggregate(self) -> TDigest:
+        if not self._front:
+            return self._back_agg
+        return self._front[-1][1].merge(self._back_agg)
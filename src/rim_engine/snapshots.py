@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import io
+import json
+import tarfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import RIMConfig
+from .io import DataQualityReport
+from .panel import factors_to_timeseries, latest_block, markdown_latest_lines, markdown_report_lines
+from .processing import aggregate_factors, compute_drivers, driver_zscores, res_overlap_sufficient
+from .regimes import with_regime_edges
+from .registry import enabled_factors
+
+# ======================================================
+# Historical panel snapshots
+# ======================================================
+#
+# A panel only depends on the last valid row of the timeseries. Every factor is causal (trailing
+# rolling windows, forward-filled RES) except one whole-history decision: whether RES overlaps
+# the core rows enough to be used at all. So the timeseries is scored once per RES decision
+# (at most twice), and the snapshot at cut-off t takes its row from the variant a run cut off
+# at t would have chosen.
+#
+# Ingestion reports describe the single ingestion pass and are the same in every snapshot;
+# everything else equals the panel of a run on inputs truncated at the cut-off.
+
+SNAPSHOT_FORMATS = ("files", "jsonl", "tar")
+
+
+def cutoff_positions(index: pd.DatetimeIndex, every: str, tz: str | None) -> pd.Series:
+    """
+    Position of the last row in each `every` period (periods in local time when tz is given,
+    so daily panels follow local midnight across DST). Indexed by the period start.
+    """
+    local = index.tz_convert(tz) if tz and index.tz is not None else index
+    pos = pd.Series(np.arange(len(index)), index=local).resample(every).last().dropna()
+    return pos.astype(np.int64)
+
+
+def _label_format(every: str) -> str:
+    t0 = pd.Timestamp(0)
+    step = (t0 + pd.tseries.frequencies.to_offset(every)) - t0
+    return "%Y-%m-%d" if step % pd.Timedelta(days=1) == pd.Timedelta(0) else "%Y-%m-%dT%H%M"
+
+
+def _last_valid(ts: pd.DataFrame) -> np.ndarray:
+    """Per row: position of the last row at or before it without NaN (-1 if none)."""
+    valid = ~ts.isna().any(axis=1).to_numpy()
+    pos = np.where(valid, np.arange(len(ts)), -1)
+    return np.maximum.accumulate(pos) if len(pos) else pos
+
+
+def snapshot_rows(inputs: pd.DataFrame, cfg: RIMConfig, every: str = "1D") -> pd.DataFrame:
+    """
+    One row per cut-off: the timeseries row a run cut off at that period's last timestamp would
+    report as latest. Index is the period start; `latest_timestamp` holds the cut-off.
+    """
+    cfg.validate()
+    window = cfg.periods(cfg.zscore_window_h)
+
+    def score(use_res: bool | None) -> tuple[pd.DataFrame, bool]:
+        drivers = compute_drivers(inputs, use_res=use_res, factors=enabled_factors(cfg.weights()))
+        fo = aggregate_factors(drivers, driver_zscores(drivers, window), cfg.weights())
+        ts = with_regime_edges(factors_to_timeseries(fo), cfg)
+        return ts, bool(drivers["res_used_flag"].iloc[0])
+
+    ts, full_uses_res = score(None)
+    cut = cutoff_positions(ts.index, every, cfg.tz)
+    pos = cut.to_numpy()
+
+    # RES decision of a run cut off at each position (same rule as compute_drivers)
+    res = pd.to_numeric(inputs["res"], errors="coerce").dropna()
+    res_valid = np.cumsum(res.reindex(ts.index).notna().to_numpy())
+    uses_res = res_overlap_sufficient(res_valid[pos], pos + 1) if len(res) else np.zeros(len(pos))
+    uses_res = np.asarray(uses_res, dtype=bool)
+
+    variants = {full_uses_res: ts}
+    if (uses_res != full_uses_res).any():
+        variants[not full_uses_res] = score(not full_uses_res)[0]
+
+    parts = []
+    for used, frame in variants.items():
+        sel = uses_res == used
+        last = _last_valid(frame)[pos[sel]]
+        part = frame.iloc[last[last >= 0]].copy()
+        part.index = cut.index[sel][last >= 0]
+        part.insert(0, "latest_timestamp", ts.index[pos[sel][last >= 0]].astype(str))
+        parts.append(part)
+    return pd.concat(parts).sort_index()
+
+
+def _split_template(template: str) -> tuple[str, str, str]:
+    before, rest = template.split('"@@TS@@"')
+    middle, after = rest.split('"@@LATEST@@"')
+    return before, middle, after
+
+
+def render_snapshots(
+    rows: pd.DataFrame, cfg: RIMConfig, reports: dict[str, DataQualityReport], every: str = "1D"
+) -> Iterator[tuple[str, str, str, str]]:
+    """
+    Yields (label, panel_json, panel_md, panel_jsonl_line) per snapshot. The parts shared by
+    every panel (header, ingestion reports) are rendered once; only the latest block is
+    rendered per row.
+    """
+    report_dicts = {k: v.to_dict() for k, v in reports.items()}
+    head = {"zone": cfg.zone, "config_hash": cfg.config_hash()}
+    slots = {"latest_timestamp": "@@TS@@", "latest": "@@LATEST@@", "ingestion_reports": "@@REP@@"}
+    templates = [
+        json.dumps({**head, **slots}, indent=2).replace(
+            '"@@REP@@"', json.dumps(report_dicts, indent=2).replace("\n", "\n  ")
+        ),
+        json.dumps({**head, **slots}).replace('"@@REP@@"', json.dumps(report_dicts)),
+    ]
+    (json_before, json_middle, json_after), (line_before, line_middle, line_after) = (
+        _split_template(t) for t in templates
+    )
+    md_reports = "\n".join(markdown_report_lines(report_dicts))
+
+    labels = rows.index.strftime(_label_format(every)).tolist()
+    stamps = rows["latest_timestamp"].tolist()
+    for label, stamp, row in zip(
+        labels, stamps, rows.drop(columns="latest_timestamp").to_dict("records"), strict=True
+    ):
+        latest = latest_block(row, cfg)
+        panel = {**head, "latest_timestamp": stamp, "latest": latest}
+        text = (
+            json_before
+            + json.dumps(stamp)
+            + json_middle
+            + json.dumps(latest, indent=2).replace("\n", "\n  ")
+            + json_after
+        )
+        line = (
+            line_before + json.dumps(stamp) + line_middle + json.dumps(latest) + line_after + "\n"
+        )
+        md = "\n".join(markdown_latest_lines(panel)) + "\n" + md_reports
+        yield label, text, md, line
+
+
+def write_snapshots(
+    rows: pd.DataFrame,
+    cfg: RIMConfig,
+    reports: dict[str, DataQualityReport],
+    out_dir: Path,
+    every: str = "1D",
+    fmt: str = "files",
+) -> Path:
+    """
+    Writes snapshots under out_dir/panels:
+      files  <label>/risk_panel.json + risk_panel.md
+      jsonl  risk_panels.jsonl (one compact panel per line)
+      tar    risk_panels.tar (<label>/risk_panel.json + .md members)
+    Returns the directory or bundle written.
+    """
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"fmt must be one of {SNAPSHOT_FORMATS}. Got {fmt!r}")
+    root = out_dir / "panels"
+    root.mkdir(parents=True, exist_ok=True)
+    snaps = render_snapshots(rows, cfg, reports, every)
+
+    if fmt == "jsonl":
+        path = root / "risk_panels.jsonl"
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.writelines(line for _, _, _, line in snaps)
+        return path
+
+    if fmt == "tar":
+        path = root / "risk_panels.tar"
+        with tarfile.open(path, "w") as tar:
+            for label, text, md, _ in snaps:
+                for name, body in (("risk_panel.json", text), ("risk_panel.md", md)):
+                    data = body.encode("utf-8")
+                    info = tarfile.TarInfo(f"{label}/{name}")
+                    info.size = len(data)
+                    tar.addfile(info, io.BytesIO(data))
+        return path
+
+    for label, text, md, _ in snaps:
+        d = root / label
+        d.mkdir(exist_ok=True)
+        (d / "risk_panel.json").write_text(text, encoding="utf-8")
+        (d / "risk_panel.md").write_text(md, encoding="utf-8")
+    return root
@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _smard_ts(ts: pd.Timestamp) -> str:
+    # SMARD export style: "Nov 22, 2025 1:00 AM" (no zero padding on day/hour)
+    hour = ts.hour % 12 or 12
+    return f"{ts:%b} {ts.day}, {ts.year} {hour}:{ts:%M} {'AM' if ts.hour < 12 else 'PM'}"
+
+
+def _fmt(v: float) -> str:
+    return f"{v:,.2f}"
+
+
+def write_smard_inputs(
+    data_dir: Path,
+    start: str = "2025-03-01",
+    days: int = 40,
+    freq: str = "h",
+    seed: int = 7,
+) -> Path:
+    """Writes synthetic power/load/RES CSVs in the SMARD export format into data_dir."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    utc = pd.date_range(start, periods=days * 24, freq="h", tz="UTC")
+    if freq != "h":
+        utc = pd.date_range(start, periods=len(utc) * 4, freq=freq, tz="UTC")
+    local = utc.tz_convert("Europe/Berlin").tz_localize(None)
+    step = pd.Timedelta(pd.tseries.frequencies.to_offset(freq))
+    starts = [_smard_ts(t) for t in local]
+    ends = [_smard_ts(t + step) for t in local]
+
+    n = len(utc)
+    hours = np.arange(n) * (step / pd.Timedelta("1h"))
+    daily = np.sin(2 * np.pi * hours / 24.0)
+
+    price = 80 + 25 * daily + rng.normal(0, 6, n)
+    neigh = price + rng.normal(0, 3, n)
+    load = 55_000 + 8_000 * daily + rng.normal(0, 900, n)
+    wind = np.clip(12_000 + rng.normal(0, 4_000, n).cumsum() / 20, 500, None)
+    pv = np.clip(9_000 * daily, 0, None)
+    residual = load - wind - pv
+    # Individual zones (drawn last so the series above keep their values). Northern Italy is
+    # in the SMARD file but does not border DE-LU; its wide spread must not reach XB.
+    zones = {
+        z: price + rng.normal(0, sd, n)
+        for z, sd in (("France", 8), ("Austria", 4), ("Northern Italy", 30))
+    }
+
+    power = pd.DataFrame(
+        {
+            "Start date": starts,
+            "End date": ends,
+            "Germany/Luxembourg [€/MWh] Calculated resolutions": [_fmt(v) for v in price],
+            "∅ DE/LU neighbours [€/MWh] Calculated resolutions": [_fmt(v) for v in neigh],
+            **{
+                f"{z} [€/MWh] Calculated resolutions": [_fmt(v) for v in p]
+                for z, p in zones.items()
+            },
+            "DE/AT/LU [€/MWh] Calculated resolutions": "-",
+        }
+    )
+    load_df = pd.DataFrame(
+        {
+            "Start date": starts,
+            "End date": ends,
+            "Grid load incl. hydro pumped storage [MWh] Calculated resolutions": [
+                _fmt(v) for v in load
+            ],
+            "Residual load [MWh] Calculated resolutions": [_fmt(v) for v in residual],
+        }
+    )
+    res_df = pd.DataFrame(
+        {
+            "Start date": starts,
+            "End date": ends,
+            "Wind offshore [MWh] Original resolutions": [_fmt(v * 0.3) for v in wind],
+            "Wind onshore [MWh] Original resolutions": [_fmt(v * 0.7) for v in wind],
+            "Photovoltaics [MWh] Original resolutions": [_fmt(v) for v in pv],
+        }
+    )
+
+    power.to_csv(data_dir / "de_power_data.csv", sep=";", index=False, encoding="utf-8-sig")
+    load_df.to_csv(data_dir / "de_load_data.csv", sep=";", index=False, encoding="utf-8-sig")
+    res_df.to_csv(data_dir / "de_res_actual.csv", sep=";", index=False, encoding="utf-8-sig")
+    return data_dir
+
+
+@pytest.fixture
+def smard_data_dir(tmp_path: Path) -> Path:
+    return write_smard_inputs(tmp_path / "data")
+
+
+@pytest.fixture
+def make_smard_data(tmp_path: Path):
+    """Factory fixture: make_smard_data(name, **kwargs) -> data dir under tmp_path."""
+
+    def _make(name: str = "data", **kwargs) -> Path:
+        return write_smard_inputs(tmp_path / name, **kwargs)
+
+    return _make
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from rim_engine.align import align_inputs, index_keys, lookup, merge_join
+from rim_engine.config import RIMConfig
+from rim_engine.io import load_input
+from rim_engine.panel import INPUT_KEYS, input_files, load_dataset
+from rim_engine.processing import compute_factors
+
+
+def test_merge_join_and_lookup_match_set_operations():
+    rng = np.random.default_rng(3)
+    a, b, c = (np.unique(rng.integers(0, 5_000, n)) for n in (3_000, 2_000, 4_000))
+    np.testing.assert_array_equal(merge_join(a, b, c), np.intersect1d(np.intersect1d(a, b), c))
+
+    pos = lookup(a, np.array([-1, a[0], a[-1], a[-1] + 1]))
+    np.testing.assert_array_equal(pos, [-1, 0, len(a) - 1, -1])
+    assert (lookup(np.array([], dtype=np.int64), a) == -1).all()
+
+
+def _frames(data_dir: Path, tz: str) -> dict[str, pd.DataFrame]:
+    files = input_files(data_dir, INPUT_KEYS)
+    return {k: load_input(k, p, tz)[0] for k, p in files.items()}
+
+
+def test_misaligned_res_matches_outer_join(smard_data_dir: Path):
+    cfg = RIMConfig()
+    frames = _frames(smard_data_dir, cfg.tz)
+    # RES starts 30 days before and ends 10 days into the 40 days of core data
+    frames["res"].index = frames["res"].index - pd.Timedelta(days=30)
+
+    combined, stats = align_inputs(frames, ("pd", "pd_neigh", "ld"))
+    outer = pd.concat(list(frames.values()), axis=1, sort=True)
+    expected = outer.dropna(subset=["pd", "pd_neigh", "ld"])
+    pd.testing.assert_frame_equal(combined, expected, check_freq=False)
+
+    assert stats["pd"].rows_in_window == stats["pd"].window_rows == len(combined)
+    assert stats["res"].rows == len(frames["res"])
+    assert stats["res"].rows_in_window == combined["res"].notna().sum() == 10 * 24
+    assert stats["res"].first_in_window == str(combined.index[0])
+    assert abs(stats["res"].coverage - 0.25) < 1e-9
+
+    # Scoring the aligned frame equals scoring the outer join
+    pd.testing.assert_frame_equal(
+        compute_factors(combined, cfg).factor_scores_0_25,
+        compute_factors(outer, cfg).factor_scores_0_25,
+        check_freq=False,
+    )
+
+
+def test_overlap_reported_and_union_without_core(smard_data_dir: Path):
+    _, reports = load_dataset(smard_data_dir, RIMConfig())
+    assert reports["res"].to_dict()["overlap"]["coverage"] == 1.0
+
+    frames = _frames(smard_data_dir, "Europe/Berlin")
+    a = frames["res"].iloc[:100]
+    b = frames["ld"].iloc[50:200]
+    union, _ = align_inputs({"res": a, "ld": b}, ("pd",))
+    assert len(union) == 200 and union.index.equals(a.index.union(b.index))
+    assert index_keys(union.index)[0] == index_keys(a.index)[0]
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import numpy as np
+
+from rim_engine.config import RIMConfig
+from rim_engine.io import load_inputs
+from rim_engine.processing import compute_factors, rolling_zscore, z_to_0_25
+from rim_engine.registry import CORE_FACTORS
+
+
+def test_contributions_sum_to_rim_and_marginals_match_rescoring(smard_data_dir: Path):
+    cfg = RIMConfig()
+    inputs, _ = load_inputs(
+        {
+            "pd": smard_data_dir / "de_power_data.csv",
+            "pd_neigh": smard_data_dir / "de_power_data.csv",
+            "ld": smard_data_dir / "de_load_data.csv",
+            "res": smard_data_dir / "de_res_actual.csv",
+        },
+        tz=cfg.tz,
+    )
+    fo = compute_factors(inputs, cfg)
+    att = fo.attribution
+
+    contrib = att[[f"{f}_contrib" for f in CORE_FACTORS]]
+    assert (contrib.dtypes == np.float32).all()
+    assert att["dominant_factor"].dtype == np.int8
+    np.testing.assert_allclose(contrib.sum(axis=1), fo.rim_score_0_100, rtol=1e-5)
+    np.testing.assert_array_equal(att["dominant_factor"], contrib.to_numpy().argmax(axis=1))
+
+    # Marginal of the load ramp: neutralize it in LD and IMB and re-score one row by hand
+    row = fo.factor_scores_0_25.index[100]
+    w = cfg.weights()
+    f = fo.factor_scores_0_25.loc[row]
+    z_load = rolling_zscore(fo.drivers["ld_load"], cfg.zscore_window_h).loc[row]
+    ld_wo = float(z_to_0_25(np.array([0.7 * z_load])).item())
+    expected = 4 * (w["ld"] * (f["LD_0_25"] - ld_wo) + w["imb"] * (f["IMB_0_25"] - 12.5))
+    assert abs(att.loc[row, "mc_ld_ramp_abs"] - expected) < 1e-4
@@ -0,0 +1,82 @@
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from rim_engine.__main__ import main
+from rim_engine.config import RIMConfig
+from rim_engine.digest import (
+    MANIFEST_FILE,
+    MATRIX_DTYPE,
+    MATRIX_FILE,
+    build_manifest,
+    load_manifest,
+    verify_runs,
+)
+from rim_engine.panel import run_end_to_end
+
+
+def _tamper(run: Path, row: int, column: str, value: float) -> None:
+    """Edits one matrix row and rebuilds the manifest, as a diverging run would produce."""
+    matrix = np.fromfile(run / MATRIX_FILE, dtype=MATRIX_DTYPE)
+    matrix[column][row] = value
+    matrix.tofile(run / MATRIX_FILE)
+    old = load_manifest(run)
+    manifest = build_manifest(matrix, old["config_hash"], old["inputs"])
+    (run / MANIFEST_FILE).write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def test_identical_runs_verify(smard_data_dir: Path, tmp_path: Path):
+    cfg = RIMConfig()
+    ts, _ = run_end_to_end(smard_data_dir, tmp_path / "a", cfg)
+    run_end_to_end(smard_data_dir, tmp_path / "b", cfg)
+
+    manifest = load_manifest(tmp_path / "a")
+    assert manifest["rows"] == len(ts)
+    assert sum(d[2] for d in manifest["days"]) == len(ts)
+    assert manifest["inputs"]["pd"] == manifest["inputs"]["pd_neigh"]
+    assert (tmp_path / "a" / MATRIX_FILE).read_bytes() == (
+        tmp_path / "b" / MATRIX_FILE
+    ).read_bytes()
+
+    report = verify_runs(tmp_path / "a", tmp_path / "b")
+    assert report["identical"] and report["first_divergence"] is None
+    assert main(["verify", str(tmp_path / "a"), str(tmp_path / "b")]) == 0
+
+
+def test_verify_pinpoints_first_diverging_hour(smard_data_dir: Path, tmp_path: Path):
+    run_end_to_end(smard_data_dir, tmp_path / "a", RIMConfig())
+    shutil.copytree(tmp_path / "a", tmp_path / "b")
+
+    matrix = np.fromfile(tmp_path / "a" / MATRIX_FILE, dtype=MATRIX_DTYPE)
+    _tamper(tmp_path / "b", 500, "RIM_0_100", 99.0)
+    _tamper(tmp_path / "b", 900, "IMB_0_25", 1.0)
+
+    report = verify_runs(tmp_path / "a", tmp_path / "b")
+    assert not report["identical"]
+    assert report["differing_days_total"] == 2
+    first = report["first_divergence"]
+    assert first["reason"] == "value_mismatch" and first["columns"] == ["RIM_0_100"]
+    assert first["ts"] == str(pd.Timestamp(int(matrix["ts"][500]), tz="UTC"))
+    assert first["b"] == {"RIM_0_100": 99.0}
+    assert main(["verify", str(tmp_path / "a"), str(tmp_path / "b")]) == 1
+
+
+def test_verify_reports_missing_day(smard_data_dir: Path, tmp_path: Path):
+    run_end_to_end(smard_data_dir, tmp_path / "a", RIMConfig())
+    run_end_to_end(smard_data_dir, tmp_path / "b", RIMConfig())
+
+    # Drop the first day from run b (rows shift, later days keep their digests)
+    manifest = load_manifest(tmp_path / "b")
+    matrix = np.fromfile(tmp_path / "b" / MATRIX_FILE, dtype=MATRIX_DTYPE)
+    matrix = matrix[manifest["days"][0][2] :]
+    matrix.tofile(tmp_path / "b" / MATRIX_FILE)
+    trimmed = build_manifest(matrix, manifest["config_hash"], manifest["inputs"])
+    (tmp_path / "b" / MANIFEST_FILE).write_text(json.dumps(trimmed), encoding="utf-8")
+
+    report = verify_runs(tmp_path / "a", tmp_path / "b")
+    assert report["differing_days"] == [manifest["days"][0][0]]
+    assert report["first_divergence"]["reason"] == "missing_day"
+    assert report["first_divergence"]["ts"] == manifest["first_ts"]
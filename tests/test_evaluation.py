@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pandas as pd
+
+from rim_engine.__main__ import main
+from rim_engine.config import RIMConfig
+from rim_engine.evaluation import evaluate_timeseries, run_and_evaluate
+
+
+def test_in_memory_evaluation_matches_csv_round_trip(smard_data_dir: Path, tmp_path: Path):
+    out_dir = tmp_path / "outputs"
+    ts, _, report = run_and_evaluate(smard_data_dir, out_dir, RIMConfig())
+
+    # Same layout scripts/run_local.py writes and scripts/evaluate_historical.py reads
+    ts_out = ts.copy()
+    ts_out.insert(0, "ts", ts_out.index)
+    ts_out.to_csv(out_dir / "rim_panel.csv", index=False)
+    from_csv = evaluate_timeseries(pd.read_csv(out_dir / "rim_panel.csv", parse_dates=["ts"]))
+
+    assert report == from_csv
+    assert (out_dir / "eval_report.json").exists()
+    assert (out_dir / "eval_report.md").exists()
+
+
+def test_cli_run_evaluate(smard_data_dir: Path, tmp_path: Path):
+    out_dir = tmp_path / "cli"
+    rc = main(["run", "--data-dir", str(smard_data_dir), "--out-dir", str(out_dir), "--evaluate"])
+    assert rc == 0
+    assert (out_dir / "eval_report.json").exists()
+
+    assert main(["--data-dir", str(tmp_path / "missing"), "--out-dir", str(out_dir)]) == 3
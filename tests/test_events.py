@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rim_engine.events import (
+    RegimeTransitionDetector,
+    TransitionSpec,
+    append_events_jsonl,
+    detect_transitions,
+)
+
+EDGES = (25.0, 50.0, 75.0)
+
+
+def _rim(values) -> pd.DataFrame:
+    idx = pd.date_range("2025-01-01", periods=len(values), freq="h", tz="UTC")
+    return pd.DataFrame({"RIM_0_100": np.asarray(values, dtype=float)}, index=idx)
+
+
+def test_hysteresis_and_dwell_suppress_chatter():
+    # Oscillates around 50 inside the band, then a sustained move up, a 1h dip, and a drop
+    rim = [40, 49, 51, 49, 51, 53, 55, 55, 49, 55, 55, 30, 30, 30, 30]
+    events = detect_transitions(_rim(rim), EDGES, TransitionSpec(hysteresis=2.5, min_dwell=3))
+
+    assert [(e["from"], e["to"]) for e in events] == [
+        ("REGIME_2_ATTENTION", "REGIME_3_STRESSED"),
+        ("REGIME_3_STRESSED", "REGIME_2_ATTENTION"),
+    ]
+    assert events[0]["onset_ts"] == "2025-01-01T05:00:00+00:00"
+    assert events[0]["ts"] == "2025-01-01T07:00:00+00:00"
+    assert events[1]["RIM_0_100"] == 30.0
+
+
+def test_incremental_matches_batch(tmp_path: Path):
+    rng = np.random.default_rng(11)
+    rim = np.clip(50 + np.cumsum(rng.normal(0, 3, 5000)), 0, 100)
+    ts = _rim(rim)
+    spec = TransitionSpec(hysteresis=2.0, min_dwell=4)
+
+    batch = detect_transitions(ts, EDGES, spec)
+    assert len(batch) > 10
+
+    det = RegimeTransitionDetector(EDGES, spec)
+    live = []
+    for i, (stamp, value) in enumerate(ts["RIM_0_100"].items()):
+        if i == 2500:  # survive a restart mid-stream
+            det = RegimeTransitionDetector(EDGES, spec, state=det.state())
+        e = det.update(stamp, value)
+        if e:
+            live.append(e)
+    assert live == batch
+
+    log = tmp_path / "regime_events.jsonl"
+    assert append_events_jsonl(batch[:5], log) == 5
+    assert append_events_jsonl(batch, log) == len(batch) - 5
+    assert append_events_jsonl(batch, log) == 0
+
+
+def test_validate_reports_bad_hysteresis():
+    with pytest.raises(ValueError, match=r"must be >= 0"):
+        TransitionSpec(hysteresis=-1).validate((50.0,))
+    with pytest.raises(ValueError, match=r"\[0, 12.5\)"):
+        TransitionSpec(hysteresis=20).validate(EDGES)
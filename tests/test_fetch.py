@@ -0,0 +1,133 @@
+import hashlib
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rim_engine.config import RIMConfig
+from rim_engine.digest import load_manifest, verify_runs
+from rim_engine.fetch import SMARD_SERIES, FetchSource, fetch_inputs, load_cached_inputs
+from rim_engine.panel import run_from_cache
+
+START = pd.Timestamp("2025-03-01", tz="UTC")
+
+
+class _SmardStandIn(BaseHTTPRequestHandler):
+    """Serves fixture series as {"series": [[ms, value], ...]} with ETag support."""
+
+    protocol_version = "HTTP/1.1"
+    data: dict[str, list[list]] = {}
+    log: list[tuple[str, str | None, int]] = []
+    peers: set[int] = set()
+
+    def do_GET(self):
+        u = urllib.parse.urlsplit(self.path)
+        sid = u.path.rsplit("/", 1)[-1].removesuffix(".json")
+        start = urllib.parse.parse_qs(u.query).get("start", [None])[0]
+        points = [p for p in self.data[sid] if start is None or p[0] >= int(start)]
+        body = json.dumps({"series": points}).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+        status = 304 if self.headers.get("If-None-Match") == etag else 200
+        self.log.append((sid, start, status))
+        self.peers.add(self.client_address[1])
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0" if status == 304 else str(len(body)))
+        self.end_headers()
+        if status == 200:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _publish(hours: int) -> None:
+    stamps = pd.date_range(START, periods=hours, freq="h")
+    ms = (stamps.as_unit("ms").asi8).tolist()
+    _SmardStandIn.data = {
+        sid: [
+            [t, round(float(v), 2)]
+            for t, v in zip(
+                ms, np.random.default_rng(int(sid)).uniform(10, 1000, hours), strict=True
+            )
+        ]
+        for ids in SMARD_SERIES.values()
+        for sid in ids
+    }
+
+
+@pytest.fixture
+def smard_server():
+    _publish(24 * 5)
+    _SmardStandIn.log, _SmardStandIn.peers = [], set()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _SmardStandIn)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}/chart_data"
+    srv.shutdown()
+
+
+def test_incremental_conditional_fetch(smard_server: str, tmp_path: Path):
+    cache = tmp_path / "processed"
+    source = FetchSource(base_url=smard_server, max_connections=2)
+
+    first = fetch_inputs(source, cache)
+    assert {k: r.rows_written for k, r in first.items()} == {k: 120 for k in SMARD_SERIES}
+    assert len(_SmardStandIn.peers) <= 2  # six requests over a pool of two connections
+
+    df, reports = load_cached_inputs(cache, tuple(SMARD_SERIES), freq="h")
+    assert df.index.tz is not None and str(df.index.tz) == "UTC"
+    res_ids = SMARD_SERIES["res"]
+    expected_res = sum(_SmardStandIn.data[sid][3][1] for sid in res_ids)
+    assert df["res"].iloc[3] == pytest.approx(expected_res)
+    assert reports["res"].n_rows_valid == 120
+
+    # Nothing new upstream: the re-requested last hour is unchanged, so nothing is
+    # rewritten; a repeat of the same range request is answered with 304
+    second = fetch_inputs(source, cache)
+    assert all(r.rows_written == 0 for r in second.values())
+    third = fetch_inputs(source, cache)
+    assert all(r.not_modified == len(SMARD_SERIES[k]) for k, r in third.items())
+    assert all(r.bytes_downloaded == 0 for r in third.values())
+
+    # One more day published: only the range from the last cached hour is requested
+    _publish(24 * 6)
+    _SmardStandIn.log.clear()
+    fourth = fetch_inputs(source, cache)
+    last_ms = str(int((START + pd.Timedelta(hours=119)).value // 1_000_000))
+    assert {start for _, start, _ in _SmardStandIn.log} == {last_ms}
+    assert all(r.rows_written == 24 for r in fourth.values())
+    assert len(load_cached_inputs(cache, ("pd",))[0]) == 144
+
+
+def test_run_from_cache(smard_server: str, tmp_path: Path):
+    cache = tmp_path / "processed"
+    fetch_inputs(FetchSource(base_url=smard_server), cache)
+    ts, panel = run_from_cache(cache, tmp_path / "out", RIMConfig())
+    assert len(ts) == 120
+    assert panel["ingestion_reports"]["pd"]["n_rows_valid"] == 120
+
+
+def test_cache_runs_fingerprint_fetched_inputs(smard_server: str, tmp_path: Path):
+    source = FetchSource(base_url=smard_server)
+    for name in ("a", "b"):
+        fetch_inputs(source, tmp_path / f"cache_{name}")
+        run_from_cache(tmp_path / f"cache_{name}", tmp_path / name, RIMConfig())
+    inputs = load_manifest(tmp_path / "a")["inputs"]
+    assert set(inputs) == {"pd", "pd_neigh", "ld", "res"} and inputs["pd"]["sha256"]
+    assert verify_runs(tmp_path / "a", tmp_path / "b")["inputs_match"]
+
+    # Upstream revises one load value: a fresh fetch differs in the ld store only
+    sid = SMARD_SERIES["ld"][0]
+    _SmardStandIn.data[sid][7][1] += 1.0
+    fetch_inputs(source, tmp_path / "cache_c")
+    run_from_cache(tmp_path / "cache_c", tmp_path / "c", RIMConfig())
+    report = verify_runs(tmp_path / "a", tmp_path / "c")
+    assert not report["inputs_match"]
+    changed = load_manifest(tmp_path / "c")["inputs"]
+    assert [k for k in inputs if inputs[k] != changed[k]] == ["ld"]
@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rim_engine.config import DatasetPaths
+from rim_engine.io import (
+    SeriesSpec,
+    _to_numeric_arrow,
+    _to_numeric_robust,
+    load_inputs,
+    load_series_csv,
+)
+
+HEADER = "Start date;End date;Germany/Luxembourg [€/MWh] Calculated resolutions\n"
+
+
+def test_quality_profile_counts_drops_and_gaps(tmp_path: Path):
+    rows = [
+        ("Oct 25, 2025 11:00 PM", "10.00"),
+        ("Oct 26, 2025 12:00 AM", "11.00"),
+        ("Oct 26, 2025 1:00 AM", "12.00"),
+        # DST fall-back: 2 AM occurs twice; both copies are ambiguous, neither a duplicate
+        ("Oct 26, 2025 2:00 AM", "13.00"),
+        ("Oct 26, 2025 2:00 AM", "14.00"),
+        # A genuinely repeated row: the later value wins
+        ("Oct 26, 2025 1:00 AM", "99.00"),
+        ("Oct 26, 2025 3:00 AM", "-"),
+        ("not a date", "15.00"),
+        ("Oct 26, 2025 4:00 AM", "1,016.00"),
+        # 5 AM and 6 AM missing
+        ("Oct 26, 2025 7:00 AM", "17.00"),
+    ]
+    path = tmp_path / "power.csv"
+    path.write_text(HEADER + "".join(f"{t};;{v}\n" for t, v in rows), encoding="utf-8")
+
+    spec = SeriesSpec(
+        name="pd",
+        sep=";",
+        time_col="Start date",
+        value_col="Germany/Luxembourg [€/MWh] Calculated resolutions",
+        datetime_format="%b %d, %Y %I:%M %p",
+        tz="Europe/Berlin",
+    )
+    out, rep = load_series_csv(path, spec)
+
+    assert rep.dropped == {
+        "nat_timestamp": 1,
+        "duplicate": 1,
+        "ambiguous_dst": 2,
+        "non_numeric": 1,
+    }
+    # UTC grid: both 2 AM stamps and the unparsable 3 AM value leave 00:00-02:00Z empty
+    assert rep.gaps == [("2025-10-26 00:00:00+00:00", 3), ("2025-10-26 04:00:00+00:00", 2)]
+    assert rep.stats["nan_share"] == 5 / 10
+    assert rep.stats["min"] == 10.0
+    assert out.loc["2025-10-25 23:00:00+00:00", "pd"] == 99.0
+    assert rep.stats["max"] == 1016.0
+    assert rep.n_rows_valid == len(out) == 5
+
+    d = rep.to_dict()
+    assert d["gaps"][0] == ["2025-10-26 00:00:00+00:00", 3]
+
+
+def test_arrow_engine_matches_pandas(make_smard_data):
+    pytest.importorskip("pyarrow")
+    data_dir = make_smard_data("arrow", days=40, freq="15min")
+    paths = DatasetPaths.from_data_dir(data_dir)
+    mapping = {
+        "pd": paths.power_csv,
+        "pd_neigh": paths.power_csv,
+        "ld": paths.load_csv,
+        "res": paths.res_actual_csv,
+    }
+    for freq in ("h", "15min"):
+        ref, ref_reports = load_inputs(mapping, tz="Europe/Berlin", freq=freq)
+        got, got_reports = load_inputs(mapping, tz="Europe/Berlin", freq=freq, engine="arrow")
+        pd.testing.assert_frame_equal(got, ref)
+        assert {k: r.to_dict() for k, r in got_reports.items()} == {
+            k: r.to_dict() for k, r in ref_reports.items()
+        }
+
+
+def test_arrow_numeric_parsing_matches_pandas():
+    pa = pytest.importorskip("pyarrow")
+    tokens = ["51,882.82", "51882,82", " 1 234,5 ", "-", "", "nan", "-inf", "1e5", "+3", ".5"]
+    tokens += ["5.", "1,2,3", "1.2.3", "abc", "0x10", "N/A", "1,5e3", " 12.5"]
+    ref = _to_numeric_robust(pd.Series(tokens)).to_numpy()
+    got = _to_numeric_arrow(pa.array(tokens)).to_pandas().to_numpy()
+    np.testing.assert_array_equal(got, ref)
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from rim_engine.llm import LLMClient, LLMClientConfig, LLMRequestError, ResponseCache
+
+
+class _ModelStandIn(BaseHTTPRequestHandler):
+    """Mimics the model endpoint: echoes a narrative, fails the first call per day with 503."""
+
+    calls: list[str] = []
+    failed: set[str] = set()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        day = body["context"]["latest_timestamp"]
+        with self.lock:
+            self.calls.append(day)
+            fail = day not in self.failed
+            self.failed.add(day)
+        if body["context"].get("reject"):
+            self.send_response(400)
+            self.end_headers()
+            return
+        if fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+        payload = json.dumps({"role": body["role"], "narrative": f"Summary for {day}"}).encode()
+        malformed = body["context"].get("malformed")
+        if malformed:
+            payload = {"text": b"<html>bad gateway", "bytes": b"\xff\xfe", "list": b"[1, 2]"}[
+                malformed
+            ]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def model_server():
+    _ModelStandIn.calls, _ModelStandIn.failed = [], set()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _ModelStandIn)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}/v1/analyze"
+    srv.shutdown()
+
+
+def _contexts(n: int) -> list[dict]:
+    return [
+        {"zone": "DE-LU", "config_hash": "abc", "latest_timestamp": f"2025-01-{d + 1:02d}"}
+        for d in range(n)
+    ]
+
+
+def test_batch_is_concurrent_retried_and_cached(model_server: str, tmp_path: Path):
+    cfg = LLMClientConfig(
+        endpoint=model_server, max_concurrency=4, backoff_s=0.01, cache_dir=tmp_path / "cache"
+    )
+    contexts = _contexts(12)
+
+    client = LLMClient(cfg)
+    out = client.call_many("analyst", contexts + contexts[:3])
+    assert [o["narrative"] for o in out[:12]] == [
+        f"Summary for {c['latest_timestamp']}" for c in contexts
+    ]
+    assert out[12:] == out[:3]
+    assert client.stats["requests"] == 24  # one 503 + one success per distinct day
+    assert client.stats["retries"] == 12
+
+    # Re-running the report hits the disk cache only
+    rerun = LLMClient(cfg)
+    assert rerun.call_many("analyst", contexts) == out[:12]
+    assert rerun.stats["requests"] == 0
+    assert rerun.stats["cache_hits"] == 12
+
+    # A different config hash is a different key
+    assert LLMClient(cfg).call_many("analyst", contexts[:1], config_hash="other")
+    assert len(_ModelStandIn.calls) == 25
+
+
+def test_sync_call_inside_running_loop(model_server: str, tmp_path: Path):
+    cfg = LLMClientConfig(endpoint=model_server, backoff_s=0.01, cache_dir=None)
+
+    async def handler() -> list[dict]:
+        return LLMClient(cfg).call_many("analyst", _contexts(2))
+
+    out = asyncio.run(handler())
+    assert [o["narrative"] for o in out] == [
+        f"Summary for {c['latest_timestamp']}" for c in _contexts(2)
+    ]
+
+
+def test_non_retryable_error_raises(model_server: str, tmp_path: Path):
+    cfg = LLMClientConfig(endpoint=model_server, backoff_s=0.01, cache_dir=None)
+    with pytest.raises(LLMRequestError):
+        LLMClient(cfg).call_many("evaluator", [{"latest_timestamp": "x", "reject": True}])
+
+
+@pytest.mark.parametrize("malformed", ["text", "bytes", "list"])
+def test_malformed_body_raises_and_is_not_cached(model_server: str, tmp_path: Path, malformed: str):
+    cfg = LLMClientConfig(endpoint=model_server, backoff_s=0.01, cache_dir=tmp_path / "cache")
+    context = {"latest_timestamp": f"m-{malformed}", "malformed": malformed}
+    with pytest.raises(LLMRequestError, match="not JSON|expected an object"):
+        LLMClient(cfg).call_many("analyst", [context])
+    assert not list((tmp_path / "cache").glob("*/*.json"))
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ResponseCache(tmp_path, max_bytes=250)
+    for i in range(10):
+        key = f"{i:02d}" + "0" * 62
+        cache.put(key, {"narrative": "x" * 40})
+        os.utime(cache._path(key), (i, i))
+    assert cache.evict() > 0
+    assert sum(p.stat().st_size for p in tmp_path.glob("*/*.json")) <= 250
+    assert cache.get("09" + "0" * 62) is not None
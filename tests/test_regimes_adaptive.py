@@ -0,0 +1,150 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from rim_engine.config import RIMConfig
+from rim_engine.events import (
+    RegimeTransitionDetector,
+    TransitionSpec,
+    append_events_jsonl,
+    detect_transitions,
+)
+from rim_engine.livefeed import FEED_FILE, LiveFeedReader
+from rim_engine.panel import run_end_to_end
+from rim_engine.regimes import (
+    REGIME_EDGE_COLUMNS,
+    REGIME_LABELS,
+    AdaptiveRegimeEdges,
+    adaptive_edges,
+    regime_codes,
+    row_edges,
+    separate_edges,
+)
+from rim_engine.sketch import SlidingDigest, TDigest
+
+ADAPTIVE = RIMConfig(regime_mode="adaptive", regime_horizon_h=10 * 24, regime_min_history_h=48)
+
+
+def _rank_error(values: np.ndarray, q: np.ndarray, est: np.ndarray) -> float:
+    return float(np.abs(np.searchsorted(np.sort(values), est) / len(values) - q).max())
+
+
+def test_tdigest_quantiles_and_merge():
+    rng = np.random.default_rng(0)
+    x = rng.gamma(2.0, 10.0, 100_000)
+    q = np.array([0.01, 0.25, 0.5, 0.8, 0.95, 0.99])
+
+    d = TDigest.from_values(x)
+    assert len(d) <= 200
+    assert _rank_error(x, q, d.quantile(q)) < 2e-3
+
+    # Merging shard digests is as accurate as one digest over all values
+    shards = [TDigest.from_values(s) for s in np.array_split(x, 50)]
+    merged = shards[0].merge(*shards[1:])
+    assert merged.count == len(x) and merged.min == x.min() and merged.max == x.max()
+    assert _rank_error(x, q, merged.quantile(q)) < 2e-3
+    assert np.isnan(TDigest().quantile(0.5))
+
+
+def test_sliding_digest_tracks_window():
+    rng = np.random.default_rng(1)
+    days = [rng.normal(day / 10, 1.0, 24) for day in range(60)]
+    q = np.array([0.5, 0.8, 0.95])
+    window = SlidingDigest()
+    for day, values in enumerate(days):
+        window.push(day, TDigest.from_values(values))
+        window.evict_before(day - 19)
+        assert len(window) == min(day + 1, 20)
+        exact = np.concatenate(days[max(0, day - 19) : day + 1])
+        assert _rank_error(exact, q, window.aggregate().quantile(q)) < 0.02
+
+
+def test_edges_are_causal_and_incremental(smard_data_dir: Path, tmp_path: Path):
+    ts, _ = run_end_to_end(smard_data_dir, tmp_path, RIMConfig())
+    rim = ts["RIM_0_100"].to_numpy()
+    edges = adaptive_edges(ts.index, rim, ADAPTIVE)
+
+    # Warm-up: fixed edges until 48h of scores exist, then one set of edges per UTC day
+    day = ts.index.floor("D")
+    first_adaptive = np.flatnonzero((edges != ADAPTIVE.regime_edges).any(axis=1))[0]
+    assert ts.index[first_adaptive] == day[first_adaptive] > day[0] + pd.Timedelta(days=1)
+    per_day = pd.DataFrame(edges, index=ts.index).groupby(day).nunique()
+    assert (per_day.to_numpy() == 1).all()
+
+    # Incremental updates in arbitrary chunks give the batch edges
+    keys = ts.index.as_unit("ns").asi8
+    state = AdaptiveRegimeEdges(ADAPTIVE)
+    chunks = [state.update(keys[lo:hi], rim[lo:hi]) for lo, hi in [(0, 7), (7, 300), (300, None)]]
+    np.testing.assert_array_equal(np.concatenate(chunks), edges)
+
+    # Edges of a day depend only on earlier days of the horizon
+    later = rim.copy()
+    later[day >= day[500]] = 100.0
+    np.testing.assert_array_equal(adaptive_edges(ts.index, later, ADAPTIVE)[:500], edges[:500])
+    d = np.flatnonzero(day == day[500])[0]
+    start = ts.index[d] - pd.Timedelta(days=10)
+    trailing = rim[(ts.index >= start) & (ts.index < ts.index[d]) & ~np.isnan(rim)]
+    q = np.asarray(ADAPTIVE.regime_quantiles)
+    assert _rank_error(trailing, q, edges[d]) < 0.01
+
+
+def test_adaptive_run_records_edges(smard_data_dir: Path, tmp_path: Path):
+    assert RIMConfig(regime_horizon_h=30 * 24).config_hash() == RIMConfig().config_hash()
+    assert ADAPTIVE.config_hash() != RIMConfig().config_hash()
+
+    ts, panel = run_end_to_end(smard_data_dir, tmp_path, ADAPTIVE)
+    edges = ts[list(REGIME_EDGE_COLUMNS)].to_numpy()
+    codes = regime_codes(ts["RIM_0_100"].to_numpy(), edges)
+
+    latest = panel["latest"]
+    valid = ts.dropna()
+    assert latest["regime_edges"] == valid[list(REGIME_EDGE_COLUMNS)].iloc[-1].tolist()
+    assert latest["regime"] == REGIME_LABELS[codes[ts.index.get_loc(valid.index[-1])]]
+    assert "Regime edges" in (tmp_path / "risk_panel.md").read_text(encoding="utf-8")
+
+    # Written timeseries reproduces the regimes; the feed classifies against the same edges
+    written = pd.read_csv(tmp_path / "rim_timeseries.csv", index_col=0)
+    np.testing.assert_allclose(written[list(REGIME_EDGE_COLUMNS)].to_numpy(), edges)
+    recs, _ = LiveFeedReader(tmp_path / FEED_FILE).read()
+    rim = ts["RIM_0_100"].to_numpy()
+    np.testing.assert_array_equal(recs["regime"], np.where(np.isnan(rim), -1, codes))
+    assert json.loads((tmp_path / "risk_panel.json").read_text())["latest"] == latest
+
+    # Batch and incremental transition detection agree on per-row edges
+    spec = TransitionSpec(hysteresis=1.0, min_dwell=2)
+    rows = ts.dropna()
+    batch = detect_transitions(rows, rows[list(REGIME_EDGE_COLUMNS)].to_numpy(), spec)
+    det = RegimeTransitionDetector(ADAPTIVE.regime_edges, spec)
+    incremental = [
+        e
+        for t, r, *row_edges in rows[["RIM_0_100", *REGIME_EDGE_COLUMNS]].itertuples()
+        if (e := det.update(t, r, edges=tuple(row_edges))) is not None
+    ]
+    assert [(e["ts"], e["to"]) for e in incremental] == [(e["ts"], e["to"]) for e in batch]
+    assert batch
+
+
+def test_calm_market_keeps_separated_edges(smard_data_dir: Path, tmp_path: Path):
+    np.testing.assert_allclose(separate_edges([40.0, 40.5, 41.0], 6.0), [40.0, 46.0, 52.0])
+    np.testing.assert_allclose(separate_edges([97.0, 98.0, 99.0], 6.0), [88.0, 94.0, 100.0])
+
+    # RIM with sigma 1: raw quantiles lie within ~2 points, closer than 2x the default band
+    idx = pd.date_range("2025-01-01", periods=60 * 24, freq="h", tz="UTC")
+    rim = 40 + np.random.default_rng(2).normal(0, 1, len(idx))
+    rim[-5 * 24 :] += 15  # a sustained move up at the end
+    edges = adaptive_edges(idx, rim, ADAPTIVE)
+    assert (np.diff(edges, axis=1) >= ADAPTIVE.regime_min_gap - 1e-9).all()
+    events = detect_transitions(pd.DataFrame({"RIM_0_100": rim}, index=idx), edges)
+    up = [e for e in events if e["onset_ts"] >= idx[-5 * 24].isoformat()]
+    assert up[0]["to"] in REGIME_LABELS[2:]
+
+    # End to end: quantiles this close used to abort the events step
+    cfg = RIMConfig(
+        regime_mode="adaptive", regime_quantiles=(0.50, 0.51, 0.52), regime_min_history_h=48
+    )
+    ts, _ = run_end_to_end(smard_data_dir, tmp_path, cfg)
+    events = detect_transitions(ts, row_edges(ts, cfg))
+    assert append_events_jsonl(events, tmp_path / "regime_events.jsonl") == len(events)
+    assert len(np.unique(regime_codes(ts["RIM_0_100"].to_numpy(), row_edges(ts, cfg)))) > 1
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from rim_engine.config import RIMConfig
+from rim_engine.io import load_xb_spread_csv
+from rim_engine.panel import load_dataset, run_end_to_end
+from rim_engine.processing import FactorGraph, compute_factors
+from rim_engine.registry import (
+    CORE_FACTORS,
+    DRIVERS,
+    FACTORS,
+    enabled_factors,
+    factor_drivers,
+    input_keys,
+)
+
+ALL_WEIGHTS = dict(w_pd=0.2, w_ld=0.15, w_res=0.15, w_imb=0.1, w_rl=0.15, w_nlr=0.1, w_xb=0.15)
+
+
+def test_registry_is_consistent():
+    for f in FACTORS.values():
+        assert all(d in DRIVERS for d, _ in f.loadings)
+    assert enabled_factors(RIMConfig().weights()) == CORE_FACTORS == ("PD", "LD", "RES", "IMB")
+    assert input_keys(CORE_FACTORS) == ("pd", "pd_neigh", "ld", "res")
+    assert input_keys(("PD", "NLR", "XB")) == ("pd", "pd_neigh", "ld", "res", "xb")
+    # Optional factors only enter the config hash once weighted
+    assert RIMConfig(w_rl=0.0).config_hash() == RIMConfig().config_hash()
+    assert RIMConfig(**ALL_WEIGHTS).config_hash() != RIMConfig().config_hash()
+
+
+def test_graph_is_lazy_and_memoized(smard_data_dir: Path):
+    cfg = RIMConfig(**ALL_WEIGHTS)
+    inputs, _ = load_dataset(smard_data_dir, cfg)
+
+    graph = FactorGraph(inputs)
+    graph.factor_outputs(RIMConfig().weights(), 24)
+    assert {name for name, _ in graph.computed} == set(factor_drivers(CORE_FACTORS))
+
+    graph.factor_outputs(cfg.weights(), 24)
+    graph.factor_outputs(cfg.weights(), 48)
+    # Every driver once, every (driver, window) z-score once, across all calls
+    assert len(graph.computed) == len(set(graph.computed))
+    assert graph.computed.count(("ld_ramp_abs", 24)) == 1
+    assert len(graph.computed) == 3 * len(factor_drivers(tuple(FACTORS)))
+
+
+def test_optional_factors_score_and_attribute(smard_data_dir: Path, tmp_path: Path):
+    cfg = RIMConfig(**ALL_WEIGHTS)
+    ts, panel = run_end_to_end(smard_data_dir, tmp_path, cfg)
+
+    assert list(panel["latest"]["factors_0_25"]) == list(FACTORS)
+    assert list(panel["ingestion_reports"]) == ["pd", "pd_neigh", "ld", "res", "rl", "xb"]
+    contrib = ts[[f"{f}_contrib" for f in FACTORS]]
+    np.testing.assert_allclose(contrib.sum(axis=1), ts["RIM_0_100"], rtol=1e-5)
+    assert set(ts["dominant_factor"].unique()) <= set(range(len(FACTORS)))
+
+    # Core factors do not change when optional factors are added; only RIM's weighting does
+    base = compute_factors(load_dataset(smard_data_dir, RIMConfig())[0], RIMConfig())
+    pd.testing.assert_frame_equal(
+        ts[list(base.factor_scores_0_25.columns)], base.factor_scores_0_25, check_freq=False
+    )
+
+
+def test_xb_spread_is_widest_single_border_spread(smard_data_dir: Path):
+    path = smard_data_dir / "de_power_data.csv"
+    xb, rep = load_xb_spread_csv(path, tz="Europe/Berlin")
+
+    raw = pd.read_csv(path, sep=";", encoding="utf-8-sig")
+    de = raw["Germany/Luxembourg [€/MWh] Calculated resolutions"]
+    zones = [f"{z} [€/MWh] Calculated resolutions" for z in ("France", "Austria")]
+    expected = raw[zones].sub(de, axis=0).abs().max(axis=1)
+    np.testing.assert_allclose(xb["xb"].to_numpy(), expected.to_numpy(), atol=1e-9)
+    # Only DE-LU neighbours count: the pre-2018 zone and Northern Italy are ignored
+    notes = " ".join(rep.notes)
+    assert "DE/AT/LU" not in notes and "Northern Italy" not in notes
+    italy = raw["Northern Italy [€/MWh] Calculated resolutions"].sub(de).abs()
+    assert (italy > expected).any()
+
+
+def test_net_load_ramp_without_res_is_load_ramp(smard_data_dir: Path):
+    inputs, _ = load_dataset(smard_data_dir, RIMConfig(**ALL_WEIGHTS))
+    graph = FactorGraph(inputs, use_res=False)
+    pd.testing.assert_series_equal(
+        graph.driver("nlr_abs"), graph.driver("ld_ramp_abs"), check_names=False
+    )
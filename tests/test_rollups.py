@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from rim_engine.config import RIMConfig
+from rim_engine.panel import run_end_to_end
+from rim_engine.rollups import RollupPyramid, rollup
+
+
+def _scores(n: int, freq: str = "15min") -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2025-03-29 20:00", periods=n, freq=freq, tz="UTC")
+    cols = ["PD_0_25", "LD_0_25", "RES_0_25", "IMB_0_25"]
+    df = pd.DataFrame(rng.uniform(0, 25, (n, 4)), index=idx, columns=cols)
+    df["RIM_0_100"] = df[cols].mean(axis=1) * 4.0
+    return df
+
+
+def test_incremental_appends_match_full_rollup(tmp_path: Path):
+    ts = _scores(500)
+    pyr = RollupPyramid(tmp_path / "rollups", base_freq="15min")
+    assert pyr.levels == ("h", "D")
+
+    # Split mid-hour and mid-day so partial buckets must be recomputed
+    pyr.append(ts.iloc[:203], config_hash="abc")
+    pyr.append(ts.iloc[150:377], config_hash="abc")
+    written = pyr.append(ts.iloc[377:], config_hash="abc")
+    assert written["base"] == 500 - 377
+
+    for level in pyr.levels:
+        got = pyr.read(level)
+        exp = rollup(ts, level)
+        exp.index = exp.index.as_unit("ns")
+        pd.testing.assert_frame_equal(got, exp, check_freq=False)
+
+    window = pyr.read("h", start="2025-03-30 00:00", end="2025-03-30 05:00")
+    assert len(window) == 6
+
+
+def test_revised_tail_replaces_stored_rows(tmp_path: Path):
+    ts = _scores(300)
+    pyr = RollupPyramid(tmp_path / "rollups", base_freq="15min")
+    pyr.append(ts.iloc[:250], config_hash="abc")
+
+    # The source revises rows 240..249 and the next run carries them plus new rows; one
+    # column is missing in a few rows, which must not drop the other columns
+    revised = ts.copy()
+    revised.iloc[240:250, :] += 1.0
+    revised.iloc[260:264, 0] = np.nan
+    written = pyr.append(revised.iloc[200:], config_hash="abc")
+    assert written["revised"] == 10 and written["base"] == 60
+
+    expected = pd.concat([ts.iloc[:200], revised.iloc[200:]])
+    base = pyr.read("base")
+    base.index = base.index.as_unit(expected.index.unit)
+    pd.testing.assert_frame_equal(base, expected, check_freq=False)
+    for level in pyr.levels:
+        exp = rollup(expected, level)
+        exp.index = exp.index.as_unit("ns")
+        pd.testing.assert_frame_equal(pyr.read(level), exp, check_freq=False)
+
+    # Re-appending unchanged rows revises nothing
+    assert pyr.append(revised.iloc[250:], config_hash="abc")["revised"] == 0
+
+
+def test_config_change_resets_pyramid(tmp_path: Path):
+    ts = _scores(200)
+    pyr = RollupPyramid(tmp_path / "rollups", base_freq="15min")
+    pyr.append(ts, config_hash="abc")
+    pyr.append(ts.iloc[:50], config_hash="other")
+    assert len(pyr.read("base")) == 50
+
+
+def test_native_15min_run_writes_rollups(make_smard_data, tmp_path: Path):
+    data_dir = make_smard_data(freq="15min", days=10)
+    cfg = RIMConfig(freq="15min")
+
+    ts, _ = run_end_to_end(data_dir, tmp_path / "out", cfg)
+
+    steps = ts.index.to_series().diff().dropna()
+    assert steps.min() == pd.Timedelta("15min")
+
+    pyr = RollupPyramid(tmp_path / "out" / "rollups", base_freq=cfg.freq)
+    hourly = pyr.read("h")
+    assert len(hourly) >= len(ts) // 4
+    np.testing.assert_allclose(
+        hourly["RIM_0_100__mean"].to_numpy(),
+        ts["RIM_0_100"].resample("h").mean().dropna().to_numpy(),
+    )
+
+    # Re-running into the same output dir reopens the existing store
+    run_end_to_end(data_dir, tmp_path / "out", cfg)
+    assert len(pyr.read("h")) == len(hourly)
@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from rim_engine.__main__ import main
+from rim_engine.panel import run_end_to_end
+from rim_engine.scheduler import build_dag, load_job_specs, run_schedule
+from rim_engine.util.errors import InvalidArgumentsError
+
+
+def _write_spec(path: Path, data_dir: Path, out_root: Path) -> Path:
+    jobs = [
+        {"name": "prod", "data_dir": str(data_dir), "out_dir": str(out_root / "prod")},
+        {
+            "name": "candidate",
+            "data_dir": str(data_dir),
+            "out_dir": str(out_root / "candidate"),
+            "config": {"w_pd": 0.40, "w_ld": 0.15},
+        },
+        {
+            "name": "edges",
+            "data_dir": str(data_dir),
+            "out_dir": str(out_root / "edges"),
+            "config": {"regime_edges": [30, 55, 80]},
+            "window": {"start": "2025-03-20"},
+        },
+        {
+            "name": "w48",
+            "data_dir": str(data_dir),
+            "out_dir": str(out_root / "w48"),
+            "config": {"zscore_window_h": 48},
+        },
+    ]
+    path.write_text(json.dumps({"jobs": jobs}), encoding="utf-8")
+    return path
+
+
+def test_dag_deduplicates_shared_nodes(smard_data_dir: Path, tmp_path: Path):
+    jobs = load_job_specs(_write_spec(tmp_path / "jobs.json", smard_data_dir, tmp_path / "out"))
+    kinds = pd.Series([k[0] for k in build_dag(jobs)]).value_counts().to_dict()
+
+    # 4 ingest + 1 drivers, 2 windows, 3 weight sets (24h), one output per job
+    assert kinds == {"ingest": 4, "drivers": 1, "zscore": 2, "aggregate": 3, "output": 4}
+
+    report = run_schedule(jobs, workers=0)
+    assert report.nodes_total == 14
+    assert report.nodes_requested == 32
+    assert [j.cache_hits for j in report.jobs.values()] == [0, 6, 7, 5]
+
+
+@pytest.mark.parametrize(("workers", "budget"), [(0, None), (2, 1)])
+def test_schedule_matches_independent_runs(
+    smard_data_dir: Path, tmp_path: Path, workers: int, budget: int | None
+):
+    jobs = load_job_specs(_write_spec(tmp_path / "jobs.json", smard_data_dir, tmp_path / "out"))
+    report = run_schedule(jobs, workers=workers, memory_budget_bytes=budget)
+
+    for job in jobs:
+        ref, _ = run_end_to_end(job.data_dir, tmp_path / "ref" / job.name, job.cfg)
+        if job.start is not None:
+            ref = ref.loc[ref.index >= job.start]
+        got = pd.read_csv(job.out_dir / "rim_timeseries.csv", index_col=0)
+        want = pd.read_csv(tmp_path / "ref" / job.name / "rim_timeseries.csv", index_col=0)
+        pd.testing.assert_frame_equal(got, want.loc[want.index.isin(got.index)])
+        assert len(got) == len(ref)
+        assert report.jobs[job.name].latest["RIM_0_100"] == float(ref["RIM_0_100"].iloc[-1])
+
+        # Quality reports carry the inputs' overlap, as in a standalone run
+        got_reports = json.loads((job.out_dir / "risk_panel.json").read_text())["ingestion_reports"]
+        ref_panel = json.loads((tmp_path / "ref" / job.name / "risk_panel.json").read_text())
+        assert got_reports == ref_panel["ingestion_reports"]
+        assert got_reports["res"]["overlap"]["window_rows"] == len(want)
+
+
+def test_invalid_job_specs(tmp_path: Path):
+    spec = tmp_path / "jobs.json"
+    spec.write_text(json.dumps({"jobs": [{"name": "a", "out_dir": "x", "config": {"w": 1}}]}))
+    with pytest.raises(InvalidArgumentsError, match="unknown config keys"):
+        load_job_specs(spec)
+
+    spec.write_text(json.dumps({"jobs": [{"name": "a", "out_dir": "x"}] * 2}))
+    with pytest.raises(InvalidArgumentsError, match="name must be unique"):
+        load_job_specs(spec)
+
+    assert main(["schedule", str(spec)]) == 2
+
+
+def test_cli_schedule(smard_data_dir: Path, tmp_path: Path, capsys):
+    spec = _write_spec(tmp_path / "jobs.json", smard_data_dir, tmp_path / "out")
+    assert main(["schedule", str(spec), "--report", str(tmp_path / "report.json")]) == 0
+
+    out = capsys.readouterr().out
+    assert "candidate:" in out and "cache_hits=6" in out
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert [j["name"] for j in report["jobs"]] == ["prod", "candidate", "edges", "w48"]
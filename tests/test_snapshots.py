@@ -0,0 +1,64 @@
+import json
+import tarfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rim_engine.__main__ import main
+from rim_engine.config import RIMConfig
+from rim_engine.panel import build_risk_panel, load_dataset, panel_to_markdown, score_inputs
+from rim_engine.snapshots import render_snapshots, snapshot_rows, write_snapshots
+
+
+@pytest.mark.parametrize("res_from", [None, "2025-03-25"])
+def test_snapshots_equal_cut_off_runs(smard_data_dir: Path, res_from: str | None):
+    cfg = RIMConfig()
+    inputs, reports = load_dataset(smard_data_dir, cfg)
+    if res_from:
+        # RES only becomes usable part-way through: early cut-offs must score it neutral
+        inputs.loc[inputs.index < pd.Timestamp(res_from, tz="UTC"), "res"] = np.nan
+
+    rows = snapshot_rows(inputs, cfg, every="1D")
+    snaps = list(render_snapshots(rows, cfg, reports, every="1D"))
+    assert len(snaps) == 41  # 40 days of UTC data span 41 local (Europe/Berlin) days
+
+    for i in (0, 1, 10, 23, 24, 25, 40):
+        label, text, md, line = snaps[i]
+        cut = pd.Timestamp(rows["latest_timestamp"].iloc[i])
+        assert label == cut.tz_convert(cfg.tz).strftime("%Y-%m-%d")
+
+        panel = build_risk_panel(score_inputs(inputs.loc[:cut], cfg), cfg, reports)
+        assert text == json.dumps(panel, indent=2)
+        assert md == panel_to_markdown(panel)
+        assert json.loads(line) == panel
+
+
+def test_snapshot_bundles_agree(smard_data_dir: Path, tmp_path: Path):
+    cfg = RIMConfig()
+    inputs, reports = load_dataset(smard_data_dir, cfg)
+    rows = snapshot_rows(inputs, cfg, every="6h")
+
+    files = write_snapshots(rows, cfg, reports, tmp_path / "files", "6h", "files")
+    jsonl = write_snapshots(rows, cfg, reports, tmp_path / "jsonl", "6h", "jsonl")
+    tar = write_snapshots(rows, cfg, reports, tmp_path / "tar", "6h", "tar")
+
+    dirs = sorted(p.name for p in files.iterdir())
+    lines = jsonl.read_text(encoding="utf-8").splitlines()
+    assert len(dirs) == len(lines) == len(rows)
+    assert dirs[0] == rows.index[0].strftime("%Y-%m-%dT%H%M")
+
+    with tarfile.open(tar) as t:
+        member = t.extractfile(f"{dirs[-1]}/risk_panel.json").read().decode("utf-8")
+    assert member == (files / dirs[-1] / "risk_panel.json").read_text(encoding="utf-8")
+    assert json.loads(member) == json.loads(lines[-1])
+
+
+def test_cli_panels(smard_data_dir: Path, tmp_path: Path):
+    out_dir = tmp_path / "out"
+    args = ["panels", "--data-dir", str(smard_data_dir), "--out-dir", str(out_dir)]
+    assert main([*args, "--every", "1d", "--format", "jsonl"]) == 0
+    assert len((out_dir / "panels" / "risk_panels.jsonl").read_text().splitlines()) == 41
+
+    assert main([*args, "--every", "fortnightly"]) == 2